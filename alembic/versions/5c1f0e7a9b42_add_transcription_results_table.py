@@ -0,0 +1,31 @@
+"""Add transcription results table
+
+Revision ID: 5c1f0e7a9b42
+Revises: 2b7e4c91d3a5
+Create Date: 2026-10-18 11:02:17.530941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1f0e7a9b42'
+down_revision: Union[str, None] = '2b7e4c91d3a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('transcription_results',
+    sa.Column('audio_sha256', sa.String(length=64), nullable=False),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('audio_sha256')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('transcription_results')
@@ -0,0 +1,39 @@
+"""Add call segments table and average score of call logs
+
+Revision ID: 9d4e2a6b7c13
+Revises: 5c1f0e7a9b42
+Create Date: 2026-10-18 14:21:48.301772
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4e2a6b7c13'
+down_revision: Union[str, None] = '5c1f0e7a9b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('call_sentiment_logs', sa.Column('average_score', sa.Float(), nullable=True))
+    op.create_table('call_segments',
+    sa.Column('call_id', sa.String(), nullable=False),
+    sa.Column('segment_index', sa.Integer(), nullable=False),
+    sa.Column('start_seconds', sa.Float(), nullable=True),
+    sa.Column('end_seconds', sa.Float(), nullable=True),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('translated_text', sa.Text(), nullable=True),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('sentiment', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['call_id'], ['call_sentiment_logs.call_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('call_id', 'segment_index')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('call_segments')
+    op.drop_column('call_sentiment_logs', 'average_score')
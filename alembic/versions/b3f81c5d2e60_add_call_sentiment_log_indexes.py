@@ -0,0 +1,31 @@
+"""Add call sentiment log indexes for keyset pagination
+
+Revision ID: b3f81c5d2e60
+Revises: 9d4e2a6b7c13
+Create Date: 2026-10-18 16:05:31.118240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f81c5d2e60'
+down_revision: Union[str, None] = '9d4e2a6b7c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_call_sentiment_logs_created_at', 'call_sentiment_logs', ['created_at', 'id'], unique=False)
+    op.create_index('ix_call_sentiment_logs_related_to_id_created_at', 'call_sentiment_logs',
+                    ['related_to_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_call_sentiment_logs_overall_sentiment_created_at', 'call_sentiment_logs',
+                    ['overall_sentiment', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_call_sentiment_logs_overall_sentiment_created_at', table_name='call_sentiment_logs')
+    op.drop_index('ix_call_sentiment_logs_related_to_id_created_at', table_name='call_sentiment_logs')
+    op.drop_index('ix_call_sentiment_logs_created_at', table_name='call_sentiment_logs')
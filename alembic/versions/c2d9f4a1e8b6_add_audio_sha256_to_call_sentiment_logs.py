@@ -0,0 +1,26 @@
+"""Add audio_sha256 to call sentiment logs
+
+Revision ID: c2d9f4a1e8b6
+Revises: 4a6c8e0f1b27
+Create Date: 2026-10-18 20:05:12.403117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d9f4a1e8b6'
+down_revision: Union[str, None] = '4a6c8e0f1b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('call_sentiment_logs', sa.Column('audio_sha256', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('call_sentiment_logs', 'audio_sha256')
@@ -0,0 +1,36 @@
+"""Add call sentiment daily rollup table
+
+Revision ID: e7a05b9c3d21
+Revises: b3f81c5d2e60
+Create Date: 2026-10-18 17:12:09.664310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a05b9c3d21'
+down_revision: Union[str, None] = 'b3f81c5d2e60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('call_sentiment_daily',
+    sa.Column('related_to_id', sa.String(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('positive_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('negative_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('neutral_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('score_sum', sa.Float(), server_default=sa.text('0'), nullable=False),
+    sa.Column('scored_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.PrimaryKeyConstraint('related_to_id', 'day')
+    )
+    # Existing logs are rolled up with `python -m app.rollups`
+
+
+def downgrade() -> None:
+    op.drop_table('call_sentiment_daily')
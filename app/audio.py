@@ -0,0 +1,297 @@
+import mmap
+import struct
+import tempfile
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+"""
+📌 Audio ingest
+
+Uploads are WAV files of any common layout (8/16/32-bit PCM or 32-bit float,
+mono or multi-channel, any sample rate). Google is configured from the file itself
+instead of assuming 16 kHz mono LINEAR16, so a 44.1 kHz or stereo call is no longer
+sent with the wrong config and transcribed as silence.
+
+✅ `parse_wav_header`: walks the RIFF chunks over a `memoryview`, nothing is copied.
+✅ `prepare_audio`: whole recordings; samples are read with `numpy.frombuffer`, downmixed
+   to mono, low-pass filtered when downsampling (so content above the new Nyquist
+   frequency does not fold back into the speech band) and resampled to the target rate.
+   A file that is already 16-bit mono at the target rate is passed through as a view of
+   the upload, without any copy.
+✅ `WavStreamDecoder`: uploads read chunk by chunk; converts each chunk to mono LINEAR16
+   at the file's own rate (Google accepts 8-48 kHz when streaming).
+
+🔹 Memory stays bounded for uploads of any length when the upload is an `mmap`
+   (see `uploads.py`): conversion works block by block into a temporary file that is
+   mapped too, and `PcmAudio.release` lets callers drop pages they are done with.
+
+🔹 Anything that is not a usable WAV file raises `AudioFormatError` (a `ValueError`),
+   which the endpoints answer with 400 before any network call is made.
+"""
+
+PCM = 1
+IEEE_FLOAT = 3
+EXTENSIBLE = 0xFFFE
+
+# (format, bits per sample) -> little-endian sample dtype
+_DTYPES = {
+    (PCM, 8): np.dtype("u1"),
+    (PCM, 16): np.dtype("<i2"),
+    (PCM, 32): np.dtype("<i4"),
+    (IEEE_FLOAT, 32): np.dtype("<f4"),
+}
+_FULL_SCALE = {"u1": 128.0, "i2": 32768.0, "i4": 2147483648.0, "f4": 1.0}
+
+MAX_CHANNELS = 8
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 192000
+MAX_STREAM_SAMPLE_RATE = 48000  # Streaming chunks are not resampled, Google's limit applies
+MAX_HEADER_BYTES = 64 * 1024  # Bytes a streamed upload may take to reach its data chunk
+UNKNOWN_SIZE = (0, 0xFFFFFFFF)  # Data sizes written by recorders that stream their output
+
+
+class AudioFormatError(ValueError):
+    """Raised when an upload is not a WAV file the pipeline can transcribe."""
+
+
+class WavFormat(NamedTuple):
+    encoding: int  # PCM or IEEE_FLOAT
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    data_offset: int  # Where the samples start in the file
+    data_size: int  # Size declared by the data chunk
+
+    @property
+    def dtype(self) -> np.dtype:
+        return _DTYPES[(self.encoding, self.bits_per_sample)]
+
+    @property
+    def block_align(self) -> int:
+        return self.channels * self.bits_per_sample // 8
+
+
+class PcmAudio(NamedTuple):
+    data: memoryview  # Mono LINEAR16 samples, without a header
+    sample_rate: int
+    source: Optional[mmap.mmap] = None  # File mapping `data` lives in, if any
+    offset: int = 0  # Where `data` starts in `source`
+
+    @property
+    def duration(self) -> float:
+        return len(self.data) / 2 / self.sample_rate
+
+    @property
+    def samples(self) -> np.ndarray:
+        return np.frombuffer(self.data, dtype=np.int16)
+
+    def slice(self, start: int, end: int) -> memoryview:
+        """LINEAR16 bytes of samples [start, end), without copying."""
+        return self.data[start * 2:end * 2]
+
+    def release(self, start: int, end: int):
+        """Drop samples [start, end) from the process' memory; they are read from disk again if needed."""
+        if self.source is not None:
+            release_pages(self.source, self.offset + start * 2, self.offset + end * 2)
+
+
+def release_pages(source: mmap.mmap, start: int, end: int):
+    """Unmap the pages of `source` inside [start, end) from this process (its data stays in the file)."""
+    start -= start % mmap.PAGESIZE
+    end = min(end, len(source))
+    if end > start:
+        source.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+
+def _parse(view: memoryview) -> Optional[WavFormat]:
+    """Return the format, or `None` if `view` ends before the data chunk starts."""
+    if len(view) < 12:
+        return None
+    riff, _, wave = struct.unpack_from("<4sI4s", view, 0)
+    if riff != b"RIFF" or wave != b"WAVE":
+        raise AudioFormatError("not a WAV file (missing RIFF/WAVE header)")
+
+    fmt = None
+    position = 12
+    while position + 8 <= len(view):
+        chunk_id, size = struct.unpack_from("<4sI", view, position)
+        body = position + 8
+        if chunk_id == b"fmt ":
+            if size < 16:
+                raise AudioFormatError("truncated fmt chunk")
+            if body + size > len(view):
+                return None
+            encoding, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", view, body)
+            if encoding == EXTENSIBLE and size >= 26:
+                encoding, = struct.unpack_from("<H", view, body + 24)  # First bytes of the sub-format GUID
+            fmt = (encoding, channels, sample_rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise AudioFormatError("data chunk before fmt chunk")
+            return _validate(WavFormat(*fmt, data_offset=body, data_size=size))
+        position = body + size + (size & 1)  # Chunks are padded to an even size
+    return None
+
+
+def _validate(fmt: WavFormat) -> WavFormat:
+    if (fmt.encoding, fmt.bits_per_sample) not in _DTYPES:
+        raise AudioFormatError(f"unsupported encoding {fmt.encoding} with {fmt.bits_per_sample} bits per sample")
+    if not 1 <= fmt.channels <= MAX_CHANNELS:
+        raise AudioFormatError(f"unsupported channel count {fmt.channels}")
+    if not MIN_SAMPLE_RATE <= fmt.sample_rate <= MAX_SAMPLE_RATE:
+        raise AudioFormatError(f"unsupported sample rate {fmt.sample_rate} Hz")
+    return fmt
+
+
+def parse_wav_header(data) -> WavFormat:
+    """Parse the header of a complete WAV file."""
+    fmt = _parse(memoryview(data).cast("B"))
+    if fmt is None:
+        raise AudioFormatError("WAV file has no data chunk")
+    return fmt
+
+
+def _to_mono(samples: np.ndarray, channels: int) -> np.ndarray:
+    """Interleaved samples of any supported dtype as mono float32, on the int16 scale."""
+    frames = samples.reshape(-1, channels)
+    # Adding columns is far faster than `mean(axis=1)` over a short, strided axis
+    mono = frames[:, 0].astype(np.float32)
+    for channel in range(1, channels):
+        mono += frames[:, channel]
+    if samples.dtype == np.uint8:
+        mono -= 128.0 * channels
+    mono *= 32768.0 / _FULL_SCALE[samples.dtype.kind + str(samples.dtype.itemsize)] / channels
+    return mono
+
+
+def _float_to_int16(samples: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(samples, out=samples), -32768, 32767, out=samples).astype(np.int16)
+
+
+CONVERT_BLOCK = 1 << 18  # Output samples computed per step, keeps temporaries small
+ANTI_ALIAS_ZEROS = 20  # Sinc zero crossings on each side of the anti-alias filter
+ANTI_ALIAS_CUTOFF = 0.86  # Filter cutoff, as a fraction of the output's Nyquist frequency
+
+
+@lru_cache(maxsize=16)
+def _anti_alias_taps(step: float) -> np.ndarray:
+    """
+    Blackman-windowed sinc low-pass for downsampling by `step` (> 1). The cutoff leaves
+    room for the transition band, which ends just below the output's Nyquist frequency.
+    """
+    half = int(np.ceil(ANTI_ALIAS_ZEROS * step))
+    cutoff = ANTI_ALIAS_CUTOFF * 0.5 / step  # Cycles per input sample
+    taps = np.sinc(2 * cutoff * np.arange(-half, half + 1)) * np.blackman(2 * half + 1)
+    return (taps / taps.sum()).astype(np.float32)
+
+
+def _output_buffer(count: int, on_disk: bool) -> Tuple[np.ndarray, Optional[mmap.mmap]]:
+    if not on_disk:
+        return np.empty(count, dtype=np.int16), None
+    with tempfile.TemporaryFile() as f:
+        f.truncate(count * 2)
+        mapping = mmap.mmap(f.fileno(), count * 2)  # Stays valid after the file is closed and deleted
+    return np.frombuffer(mapping, dtype=np.int16), mapping
+
+
+def prepare_audio(data, target_rate: int) -> PcmAudio:
+    """
+    Turn a complete WAV upload into mono LINEAR16 at `target_rate`.
+
+    Downmixing, anti-alias filtering (downsampling only) and resampling (linear
+    interpolation of the filtered signal) are done together, one block of output at a
+    time. When `data` is an `mmap`, the result is written to a mapped temporary file
+    and consumed pages are released, so memory use does not grow with the length of
+    the recording.
+
+    Raises `AudioFormatError` for malformed or empty files.
+    """
+    view = memoryview(data).cast("B")
+    fmt = parse_wav_header(view)
+    source = data if isinstance(data, mmap.mmap) else None
+
+    size = min(fmt.data_size, len(view) - fmt.data_offset)
+    frames = size // fmt.block_align
+    samples = np.frombuffer(view, dtype=fmt.dtype, count=frames * fmt.channels, offset=fmt.data_offset)
+
+    if fmt.dtype == np.int16 and fmt.channels == 1 and fmt.sample_rate == target_rate and frames:
+        return PcmAudio(memoryview(samples).cast("B"), target_rate, source, fmt.data_offset)
+
+    count = int(frames * target_rate / fmt.sample_rate)
+    if count == 0:
+        raise AudioFormatError("WAV file contains no audio")
+
+    out, mapping = _output_buffer(count, on_disk=source is not None)
+    step = fmt.sample_rate / target_rate
+    taps = _anti_alias_taps(step) if step > 1 else None
+    half = len(taps) // 2 if taps is not None else 0
+    consumed = 0  # Input bytes released so far
+    for start in range(0, count, CONVERT_BLOCK):
+        positions = np.arange(start, min(start + CONVERT_BLOCK, count)) * step
+        whole = positions.astype(np.intp)
+        first, last = max(whole[0] - half, 0), min(whole[-1] + 2 + half, frames)
+        block = _to_mono(samples[first * fmt.channels:last * fmt.channels], fmt.channels)
+        if taps is not None:  # Centered: the context read on either side is trimmed off again
+            block = np.convolve(block, taps)[half:half + len(block)]
+
+        index = whole - first
+        following = np.minimum(index + 1, len(block) - 1)
+        fraction = (positions - whole).astype(np.float32)
+        low = block[index]
+        out[start:start + len(positions)] = _float_to_int16(low + fraction * (block[following] - low))
+
+        # Earlier input is never read again, and finished output is written back to the file
+        if source is not None:
+            release_pages(source, fmt.data_offset + consumed, fmt.data_offset + first * fmt.block_align)
+            consumed = first * fmt.block_align
+        if mapping is not None:
+            release_pages(mapping, start * 2, (start + len(positions)) * 2)
+    return PcmAudio(memoryview(out).cast("B"), target_rate, mapping)
+
+
+class WavStreamDecoder:
+    """
+    🔹 Incremental variant of `prepare_audio` for uploads read chunk by chunk.
+
+    `feed` buffers until the header has been read, then returns every chunk as mono
+    LINEAR16 at the file's own rate (`format.sample_rate`), keeping partial frames for
+    the next call. Bytes after the declared data chunk (trailing metadata) are dropped.
+    """
+
+    def __init__(self):
+        self.format: Optional[WavFormat] = None
+        self._pending = bytearray()
+        self._remaining: Optional[int] = None  # Audio bytes left in the data chunk, None if unknown
+
+    def feed(self, chunk: bytes) -> bytes:
+        if self.format is None:
+            self._pending += chunk
+            fmt = _parse(memoryview(self._pending))
+            if fmt is None:
+                if len(self._pending) > MAX_HEADER_BYTES:
+                    raise AudioFormatError("WAV header not found in the first 64 KiB")
+                return b""
+            if fmt.sample_rate > MAX_STREAM_SAMPLE_RATE:
+                raise AudioFormatError(f"sample rate {fmt.sample_rate} Hz is too high for streaming")
+            self.format = fmt
+            self._remaining = None if fmt.data_size in UNKNOWN_SIZE else fmt.data_size
+            chunk = bytes(self._pending[fmt.data_offset:])
+            self._pending = bytearray()
+
+        if self._remaining is not None:
+            chunk = chunk[:self._remaining]
+            self._remaining -= len(chunk)
+
+        if self._pending:
+            chunk = bytes(self._pending) + chunk
+        usable = len(chunk) - len(chunk) % self.format.block_align
+        self._pending = bytearray(chunk[usable:])
+        if not usable:
+            return b""
+
+        samples = np.frombuffer(chunk, dtype=self.format.dtype, count=usable // self.format.dtype.itemsize)
+        if samples.dtype == np.int16 and self.format.channels == 1:
+            return chunk[:usable]
+        return _float_to_int16(_to_mono(samples, self.format.channels)).tobytes()
@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from cachetools import TLRUCache, TTLCache
+
+from . import schemas
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+"""
+📌 Authenticated-user cache
+
+Every authenticated request used to decode its JWT and load the user from Postgres,
+holding a pooled connection just to confirm the user still exists.
+
+✅ Verified tokens are cached by the SHA-256 digest of the token (the token itself is
+   never kept), each until its own `exp` claim.
+✅ User records are cached by id for `user_ttl` seconds, and dropped as soon as the
+   user is updated or deleted through the ORM in this process (see `oauth2.py`).
+✅ Both caches are bounded LRUs; `stats()` is served on `GET /metrics`.
+
+🔹 The cache is per process: a change made by another worker is seen at most
+   `user_ttl` seconds later. A size of 0 disables the corresponding cache.
+"""
+
+
+class AuthCache:
+    """
+    🔹 Verified tokens (digest -> user id, until `exp`) and user records (id -> `CurrentUser`).
+    """
+
+    def __init__(self, token_size: int, user_size: int, user_ttl: float, timer: Callable[[], float] = time.time):
+        # `exp` is a UNIX timestamp, so both caches run on wall-clock time
+        self._tokens = TLRUCache(max(token_size, 1), ttu=lambda _key, entry, _now: entry[1], timer=timer)
+        self._users = TTLCache(max(user_size, 1), user_ttl, timer=timer)
+        self._token_size = token_size
+        self._user_size = user_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def token_user_id(self, token: str) -> Optional[int]:
+        """User id of a token verified before and not expired yet, if any."""
+        with self._lock:
+            entry = self._tokens.get(self._digest(token))
+        return entry[0] if entry is not None else None
+
+    def remember_token(self, token: str, user_id: int, exp: float):
+        if self._token_size:
+            with self._lock:
+                self._tokens[self._digest(token)] = (user_id, exp)
+
+    def user(self, user_id: int) -> Optional[schemas.CurrentUser]:
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return user
+
+    def remember_user(self, user: schemas.CurrentUser):
+        if self._user_size:
+            with self._lock:
+                self._users[user.id] = user
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"tokens": len(self._tokens), "users": len(self._users), "user_hits": self.hits,
+                    "user_misses": self.misses}
@@ -1,4 +1,5 @@
 import logging
+from typing import Literal
 from pydantic_settings import BaseSettings
 
 # Configure logging for better debugging
@@ -31,6 +32,45 @@ class Settings(BaseSettings):
     - `secret_key`: Secret key used for authentication.
     - `algorithm`: Algorithm for token hashing (e.g., "HS256").
     - `access_token_expire_minutes`: Expiration time for access tokens (in minutes).
+
+    Optional tuning (defaults shown):
+    - `transcription_workers`: Background workers running transcription jobs (2).
+    - `transcription_queue_size`: Jobs allowed to wait for a worker before new ones are rejected (16).
+    - `job_spool_dir`: Directory where job audio is stored until processed (system temp dir).
+    - `io_executor_workers` / `io_executor_queue`: Threads for network & DB I/O and how many calls may wait for one (16 / 64).
+    - `audio_executor_workers` / `audio_executor_queue`: Threads for resampling and speech detection and how many calls
+      may wait for one (4 / 32).
+    - `cpu_executor_workers` / `cpu_executor_queue`: Processes for CPU-bound work and how many calls may wait for one (2 / 32).
+    - `hash_executor_workers` / `hash_executor_queue`: Processes for password hashing and how many calls may wait for one (2 / 64).
+    - `bcrypt_rounds`: bcrypt cost of new password hashes; older hashes are upgraded at login (12).
+    - `bulk_users_max`: Most records accepted by one `POST /users/bulk` request (10000).
+    - `translation_cache_size`: Translations kept in memory per process (10000).
+    - `translation_cache_ttl_seconds`: How long a cached translation stays valid (7 days).
+    - `translation_cache_path`: SQLite file shared by the workers on one host; empty keeps the cache in memory only ("").
+    - `sentiment_engine`: "translate" translates id -> en and scores in English, "indonesian" scores offline with a local lexicon ("translate").
+    - `sentiment_scorer`: "textblob" scores segments one by one, "vectorized" scores a whole call in one NumPy pass ("textblob").
+    - `audio_sample_rate`: Rate uploads are resampled to before recognition, in Hz (16000).
+    - `vad_enabled`: Send only the speech regions of a call to Google instead of the whole recording (True).
+    - `recognition_fanout`: Speech regions of one call recognized concurrently (4).
+    - `max_upload_bytes`: Largest upload accepted by the speech endpoints, larger ones get 413 (512 MiB).
+    - `speech_client_pool_size`: Long-lived Speech-to-Text clients (gRPC channels) shared by all requests (4).
+    - `speech_client_health_interval_seconds`: How often the pooled clients' channels are checked (60).
+    - `batch_concurrency`: Recordings of one `/speech/transcribe/batch` request processed at once (4).
+    - `batch_max_files`: Most recordings accepted in one batch request, zip archive members included (500).
+    - `auth_token_cache_size` / `auth_user_cache_size`: Verified tokens and user records cached per process (10000 / 10000).
+    - `auth_user_cache_ttl_seconds`: How long a cached user is trusted without checking the database (60).
+    - `auth_claims_only`: Authenticate from the token's claims alone, never querying the database (False).
+    - `refresh_token_expire_days`: How long a refresh token can be exchanged, each exchange issues a new one (30).
+    - `db_pool_size` / `db_max_overflow`: Connections kept open per engine and per process, and how many more may be
+      opened under load (5 / 10). The sync and async engines each have their own pool.
+    - `db_pool_timeout_seconds`: How long a request waits for a connection before failing (30).
+    - `db_pool_recycle_seconds`: Connections older than this are replaced before use, -1 never (-1).
+    - `db_pool_pre_ping`: Test every connection on checkout, so ones dropped while idle are replaced (False).
+    - `db_pgbouncer`: Connect through PgBouncer in transaction mode: no app-side pool, no cached prepared statements (False).
+    - `database_replica_urls`: Comma-separated `postgresql://` URLs of read replicas; empty reads from the primary ("").
+    - `replica_read_your_writes_seconds`: How long reads of a row this process wrote stay on the primary (10).
+    - `replica_health_interval_seconds`: How often replicas are pinged, and how long a failed one is skipped (10).
+    - `replica_connect_timeout_seconds`: How long to wait for a replica connection before falling back (2).
     """
     database_hostname: str
     database_port: str
@@ -40,6 +80,47 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
+    transcription_workers: int = 2
+    transcription_queue_size: int = 16
+    job_spool_dir: str = ""
+    io_executor_workers: int = 16
+    io_executor_queue: int = 64
+    audio_executor_workers: int = 4
+    audio_executor_queue: int = 32
+    cpu_executor_workers: int = 2
+    cpu_executor_queue: int = 32
+    hash_executor_workers: int = 2
+    hash_executor_queue: int = 64
+    bcrypt_rounds: int = 12
+    bulk_users_max: int = 10000
+    translation_cache_size: int = 10000
+    translation_cache_ttl_seconds: int = 7 * 24 * 3600
+    translation_cache_path: str = ""
+    sentiment_engine: Literal["translate", "indonesian"] = "translate"
+    sentiment_scorer: Literal["textblob", "vectorized"] = "textblob"
+    audio_sample_rate: int = 16000
+    vad_enabled: bool = True
+    recognition_fanout: int = 4
+    max_upload_bytes: int = 512 * 1024 * 1024
+    speech_client_pool_size: int = 4
+    speech_client_health_interval_seconds: int = 60
+    batch_concurrency: int = 4
+    batch_max_files: int = 500
+    auth_token_cache_size: int = 10000
+    auth_user_cache_size: int = 10000
+    auth_user_cache_ttl_seconds: int = 60
+    auth_claims_only: bool = False
+    refresh_token_expire_days: int = 30
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+    db_pool_recycle_seconds: int = -1
+    db_pool_pre_ping: bool = False
+    db_pgbouncer: bool = False
+    database_replica_urls: str = ""
+    replica_read_your_writes_seconds: float = 10
+    replica_health_interval_seconds: int = 10
+    replica_connect_timeout_seconds: float = 2
 
     class Config:
         """
@@ -1,8 +1,12 @@
 import logging
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from .config import settings
+from .db_pool import PoolStats, engine_options, instrument, pgbouncer_connect_args
+from .replicas import ReplicaRouter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -42,8 +46,11 @@ SQLALCHEMY_DATABASE_URL = f"postgresql://{settings.database_username}:{settings.
 """
 The `create_engine` function initializes the database connection.
 - The `SQLALCHEMY_DATABASE_URL` specifies the database type (PostgreSQL) and connection details.
+- The pool is sized and tuned by the `db_pool_*` settings (see `db_pool.py`).
 """
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+pool_stats = PoolStats("sync")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(pool_stats))
+instrument(engine, pool_stats)
 logger.info("Database engine initialized.")
 
 # ✅ Create a database session
@@ -56,6 +63,45 @@ logger.info("Database engine initialized.")
 """
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# ✅ Async engine and sessions (asyncpg), alongside the sync ones
+"""
+📌 Async endpoints use `AsyncSession`, so their queries never block the event loop
+and never occupy an `io_executor` thread. The sync engine stays for Alembic, scripts
+(`app.rollups`) and the endpoints that have not been ported.
+
+- `expire_on_commit=False`: Objects stay readable after commit; an async session cannot
+  lazily reload expired attributes.
+- `async_engine` connections belong to the app's event loop. Code that runs its own
+  loop (transcription job threads) uses `UnpooledAsyncSessionLocal`, whose connections
+  are opened and closed on the loop that uses them.
+"""
+ASYNC_SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+async_pool_stats = PoolStats("async")
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, **engine_options(async_pool_stats, is_async=True))
+instrument(async_engine.sync_engine, async_pool_stats)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+UnpooledAsyncSessionLocal = async_sessionmaker(
+    bind=create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool,
+                             connect_args=pgbouncer_connect_args() if settings.db_pgbouncer else {}),
+    autoflush=False, expire_on_commit=False
+)
+logger.info("Async database engine initialized.")
+
+# ✅ Read replicas
+"""
+📌 Read-only endpoints take their session from `get_read_db` / `get_async_read_db`, which
+`replica_router` spreads over the `database_replica_urls` (see `replicas.py`); without
+replicas they are the primary's sessions.
+"""
+replica_router = ReplicaRouter(
+    [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()],
+    primary=SessionLocal, async_primary=AsyncSessionLocal
+)
+
+def pool_metrics() -> dict:
+    return {stats.name: stats.stats() for stats in (pool_stats, async_pool_stats)}
+
 # ✅ Create a base class for ORM models
 """
 `Base` is a class from which all ORM models will inherit.
@@ -79,4 +125,29 @@ def get_db():
         yield db
     finally:
         db.close()
-        logger.info("Database session closed.")
\ No newline at end of file
+        logger.info("Database session closed.")
+
+"""
+📌 `get_async_db()` - Dependency Injection for Async Database Sessions
+
+Same contract as `get_db()`, for async endpoints:
+"""
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+"""
+📌 `get_read_db()` / `get_async_read_db()` - Sessions for read-only endpoints
+
+Run queries through `replicas.read_sync` / `replicas.read`, which fall back to the primary:
+"""
+def get_read_db():
+    db = replica_router.session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db():
+    async with replica_router.async_session() as db:
+        yield db
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+import uuid
+from typing import Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from .config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+"""
+📌 Database connection pools
+
+Heroku Postgres caps connections per database: every dyno's pools together must stay
+under it, and connections it drops while idle must not be handed out again.
+
+✅ `engine_options` turns the `db_pool_*` settings into `create_engine` /
+   `create_async_engine` arguments: size, overflow, checkout timeout, recycle, pre-ping.
+✅ `db_pgbouncer`: behind PgBouncer (transaction pooling) the app keeps no pool of its
+   own (`NullPool`) and asyncpg neither caches nor reuses prepared statement names.
+✅ `PoolStats`: connections checked out right now, and how long checkouts waited
+   (including opening a new connection) or timed out; served on `GET /metrics`.
+"""
+
+
+class PoolStats:
+    """
+    🔹 Checkout metrics of one engine's pool, fed by `instrument` and the pool class from `engine_options`.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._checked_out = 0
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+
+    def waited(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self._checkouts += 1
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+            self._timeouts += timed_out
+
+    def checkout(self):
+        with self._lock:
+            self._checked_out += 1
+
+    def checkin(self):
+        with self._lock:
+            self._checked_out -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pool": "null" if settings.db_pgbouncer else "queue",
+                "pool_size": settings.db_pool_size,
+                "max_overflow": settings.db_max_overflow,
+                "checked_out": self._checked_out,
+                "checkouts": self._checkouts,
+                "wait_ms_avg": self._wait_total / self._checkouts * 1000 if self._checkouts else 0.0,
+                "wait_ms_max": self._wait_max * 1000,
+                "timeouts": self._timeouts,
+            }
+
+
+def _timed_pool(pool_class: Type[Pool], stats: PoolStats) -> Type[Pool]:
+    """`pool_class`, recording into `stats` how long every checkout waited for a connection."""
+
+    class TimedPool(pool_class):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except exc.TimeoutError:
+                stats.waited(time.perf_counter() - start, timed_out=True)
+                logger.warning(f"Pool '{stats.name}' checkout timed out, {stats.stats()['checked_out']} connections checked out")
+                raise
+            stats.waited(time.perf_counter() - start)
+            return connection
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+def engine_options(stats: PoolStats, is_async: bool = False) -> dict:
+    """Pool arguments for `create_engine` (or `create_async_engine` with `is_async`) from the settings."""
+    options = {"pool_pre_ping": settings.db_pool_pre_ping}
+    if settings.db_pgbouncer:
+        options["poolclass"] = _timed_pool(NullPool, stats)
+        if is_async:
+            options["connect_args"] = pgbouncer_connect_args()
+        return options
+
+    options.update(
+        poolclass=_timed_pool(AsyncAdaptedQueuePool if is_async else QueuePool, stats),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+    )
+    return options
+
+
+def pgbouncer_connect_args() -> dict:
+    """asyncpg arguments for PgBouncer's transaction pooling, where prepared statements cannot be kept."""
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+def instrument(engine: Engine, stats: PoolStats):
+    """Count the connections of `engine` (the `sync_engine` of an async one) that are checked out."""
+    event.listen(engine, "checkout", lambda *args: stats.checkout())
+    event.listen(engine, "checkin", lambda *args: stats.checkin())
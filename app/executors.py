@@ -0,0 +1,128 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .config import settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+"""
+📌 Dedicated executors for blocking work
+
+The event loop must never wait on blocking calls, otherwise one slow Google request
+freezes every other request on the worker (health checks included).
+
+✅ `io_executor`: thread pool for network and database I/O
+   (Speech-to-Text, translation, sync SQLAlchemy sessions).
+✅ `cpu_executor`: process pool for CPU-bound work (sentiment scoring),
+   which would otherwise hold the GIL and stall the loop anyway.
+✅ `audio_executor`: thread pool for audio DSP (resampling, voice activity detection).
+   It is CPU-bound too, but NumPy drops the GIL in its kernels and the recordings are
+   memory-mapped: a process pool would copy every recording in and out and could not
+   release its pages. Its own pool keeps it from taking the slots of I/O calls.
+✅ `hash_executor`: process pool for bcrypt, so a burst of logins or sign-ups neither
+   stalls the loop nor queues behind (or in front of) transcription work.
+
+🔹 Each executor has its own size and a bounded backlog: once `max_workers` jobs are
+   running and `max_queue` more are waiting, `run` raises `ExecutorSaturated` so the
+   endpoint can answer 503 instead of letting latency grow without bound.
+🔹 `stats()` exposes active/queued counts; they are served on `GET /metrics`.
+"""
+
+
+class ExecutorSaturated(Exception):
+    """Raised when an executor's backlog is full."""
+
+
+class BoundedExecutor:
+    """
+    🔹 Wraps a `concurrent.futures` executor with a concurrency limit and queue-depth metrics.
+
+    The underlying executor is created lazily on first use, so importing this module
+    never spawns threads or processes.
+    """
+
+    def __init__(self, name: str, factory: Callable[[int], Executor], max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._factory = factory
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._factory(self.max_workers)
+            return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run `fn(*args, **kwargs)` on the executor without blocking the event loop."""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturated(f"Executor '{self.name}' is saturated ({self._in_flight} jobs in flight)")
+            self._in_flight += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+
+    def stats(self) -> dict:
+        # Executors run jobs in FIFO order, so anything beyond `max_workers` is waiting
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": min(self._in_flight, self.max_workers),
+                "queued": max(self._in_flight - self.max_workers, 0),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+            logger.info(f"Executor '{self.name}' shut down.")
+
+
+def _thread_pool(max_workers: int, prefix: str = "io") -> Executor:
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=prefix)
+
+
+def _process_pool(max_workers: int) -> Executor:
+    # "spawn" instead of fork: forking a process that holds gRPC channels is unsafe
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+io_executor = BoundedExecutor("io", _thread_pool, settings.io_executor_workers, settings.io_executor_queue)
+audio_executor = BoundedExecutor(
+    "audio", functools.partial(_thread_pool, prefix="audio"), settings.audio_executor_workers, settings.audio_executor_queue
+)
+cpu_executor = BoundedExecutor("cpu", _process_pool, settings.cpu_executor_workers, settings.cpu_executor_queue)
+hash_executor = BoundedExecutor("hash", _process_pool, settings.hash_executor_workers, settings.hash_executor_queue)
+
+
+def executor_stats() -> dict:
+    return {executor.name: executor.stats() for executor in (io_executor, audio_executor, cpu_executor, hash_executor)}
+
+
+def shutdown_executors():
+    for executor in (io_executor, audio_executor, cpu_executor, hash_executor):
+        executor.shutdown()
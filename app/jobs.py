@@ -0,0 +1,102 @@
+import logging
+import queue
+import threading
+from typing import Callable, List
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+"""
+📌 In-process background worker pool
+
+✅ A fixed number of worker threads pull jobs from a bounded queue.
+✅ `submit` never blocks the caller: when the queue is full it raises `JobQueueFull`,
+   so endpoints can answer 503 instead of piling up work they cannot finish.
+✅ The pool is started and stopped by the application lifespan (see `main.py`).
+
+🔹 The pool only runs callables; job state itself is persisted by the caller
+   (e.g. the `transcription_jobs` table) so any process can report on it.
+🔹 The queue dies with the process: callers recover unfinished jobs from their persisted
+   state at startup (see `speech.recover_transcription_jobs`).
+"""
+
+_STOP = object()
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class JobWorkerPool:
+    """
+    🔹 Bounded pool of worker threads running `handler(*args)` for each submitted job.
+    """
+
+    def __init__(self, name: str, handler: Callable, workers: int, queue_size: int):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def start(self):
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Worker pool '{self.name}' started with {self.workers} workers.")
+
+    def stop(self, timeout: float = 30.0):
+        """Let queued jobs finish, then stop every worker thread."""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        logger.info(f"Worker pool '{self.name}' stopped.")
+
+    def submit(self, *args):
+        try:
+            self._queue.put_nowait(args)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            raise JobQueueFull(f"Worker pool '{self.name}' queue is full ({self.queue_size} jobs)")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "queued": self._queue.qsize(),
+                "active": self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+            }
+
+    def _run(self):
+        while (args := self._queue.get()) is not _STOP:
+            with self._lock:
+                self._active += 1
+            try:
+                self.handler(*args)
+                succeeded = True
+            except Exception as e:
+                logger.error(f"Worker pool '{self.name}' job failed: {e}")
+                succeeded = False
+            with self._lock:
+                self._active -= 1
+                if succeeded:
+                    self._completed += 1
+                else:
+                    self._failed += 1
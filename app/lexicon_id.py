@@ -0,0 +1,71 @@
+import re
+
+"""
+📌 Indonesian sentiment lexicon
+
+Compact lexicon for call-centre conversations, scored on TextBlob's scale
+(-1 to +1) so both sentiment engines produce comparable numbers.
+
+✅ `LEXICON`: word -> polarity, in TextBlob's lexicon format; modifiers ("sangat")
+   are tagged "RB" and carry an intensity instead of a polarity.
+✅ `NEGATIONS`: words that flip the next sentiment word ("tidak puas").
+✅ `BOOSTERS`: words that scale the sentiment word before them ("bagus banget").
+✅ `join_phrases`: turns fixed multi-word expressions into single tokens first.
+"""
+
+_POLARITY = {
+    # Positive
+    "bagus": 0.7, "baik": 0.6, "senang": 0.8, "gembira": 0.8, "bahagia": 0.8, "puas": 0.7,
+    "mantap": 0.8, "hebat": 0.8, "keren": 0.7, "sempurna": 1.0, "luar-biasa": 1.0, "istimewa": 0.8,
+    "cepat": 0.3, "mudah": 0.4, "lancar": 0.5, "ramah": 0.6, "sopan": 0.5, "membantu": 0.5,
+    "terbantu": 0.6, "jelas": 0.3, "tepat": 0.4, "aman": 0.4, "nyaman": 0.6, "murah": 0.3,
+    "suka": 0.5, "cinta": 0.6, "setuju": 0.3, "berhasil": 0.6, "sukses": 0.6, "beres": 0.5,
+    "selesai": 0.2, "benar": 0.3, "oke": 0.3, "ok": 0.3, "siap": 0.2, "untung": 0.4,
+    "rekomendasi": 0.5, "memuaskan": 0.7, "menyenangkan": 0.7, "profesional": 0.5,
+    "terimakasih": 0.2, "makasih": 0.2, "selamat": 0.7, "semoga": 0.3, "beruntung": 0.5,
+    "tidakapa-apa": 0.3, "wajar": 0.2, "sabar": 0.3, "tanggap": 0.4, "responsif": 0.4,
+    # Negative
+    "buruk": -0.7, "jelek": -0.7, "parah": -0.8, "kecewa": -0.8, "mengecewakan": -0.8,
+    "marah": -0.8, "kesal": -0.7, "sebal": -0.6, "benci": -0.8, "sedih": -0.6, "susah": -0.4,
+    "sulit": -0.4, "lambat": -0.4, "lama": -0.2, "lelet": -0.5, "rusak": -0.6, "error": -0.5,
+    "gagal": -0.6, "salah": -0.5, "masalah": -0.4, "bermasalah": -0.5, "keluhan": -0.4,
+    "komplain": -0.4, "mahal": -0.3, "rugi": -0.6, "hilang": -0.4, "telat": -0.4,
+    "terlambat": -0.4, "batal": -0.4, "dibatalkan": -0.4, "kasar": -0.7, "tidak-sopan": -0.7,
+    "bohong": -0.7, "penipu": -0.9, "tipu": -0.8, "penipuan": -0.9, "bingung": -0.3,
+    "ribet": -0.5, "repot": -0.4, "maaf": -0.2, "mohon-maaf": -0.2, "sayang": -0.2,
+    "capek": -0.4, "lelah": -0.4, "payah": -0.7, "menyebalkan": -0.7, "mengganggu": -0.5,
+    "kacau": -0.7, "tidak-jelas": -0.4, "refund": -0.2, "cacat": -0.6, "palsu": -0.7,
+    "bahaya": -0.6, "berbahaya": -0.6, "takut": -0.5, "khawatir": -0.4, "cemas": -0.4,
+}
+
+_MODIFIERS = {
+    # Word before the sentiment word it intensifies ("sangat bagus")
+    "sangat": 1.3, "amat": 1.3, "sungguh": 1.3, "benar-benar": 1.3, "betul-betul": 1.3,
+    "paling": 1.5, "terlalu": 1.3, "begitu": 1.2, "cukup": 0.8, "agak": 0.7, "sedikit": 0.6,
+}
+
+LEXICON = {
+    **{word: {None: (p, 1.0, 1.0)} for word, p in _POLARITY.items()},
+    **{word: {"RB": (0.0, 0.0, i), None: (0.0, 0.0, i)} for word, i in _MODIFIERS.items()},
+}
+
+NEGATIONS = ("tidak", "tak", "bukan", "belum", "jangan", "gak", "nggak", "enggak", "ngga", "ga", "kurang")
+
+BOOSTERS = {"sekali": 1.3, "banget": 1.3, "bgt": 1.3, "!": 1.25}
+
+_PHRASES = {
+    "terima kasih": "terimakasih",
+    "tidak apa apa": "tidakapa-apa",
+    "tidak apa-apa": "tidakapa-apa",
+    "gak apa apa": "tidakapa-apa",
+    "gak apa-apa": "tidakapa-apa",
+    "mohon maaf": "mohon-maaf",
+    "luar biasa": "luar-biasa",
+    "tidak sopan": "tidak-sopan",
+    "tidak jelas": "tidak-jelas",
+}
+_PHRASE = re.compile(r"\b(" + "|".join(re.escape(phrase) for phrase in _PHRASES) + r")\b")
+
+
+def join_phrases(text: str) -> str:
+    return _PHRASE.sub(lambda m: _PHRASES[m.group(1)], text.lower())
@@ -1,7 +1,16 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import engine
+from . import oauth2
+from .config import settings
+from .database import async_engine, engine, pool_metrics, replica_router
+from .executors import executor_stats, io_executor, shutdown_executors
+from .recognizers import GoogleSpeechRecognizer, SpeechClientPool
+from .responses import ModelResponse
+from .uploads import MaxUploadSizeMiddleware
 from .routers import user, auth, speech
 
 """
@@ -15,8 +24,50 @@ To run the FastAPI server, use the following command:
 """
 # models.Base.metadata.create_all(bind=engine)  # Uncomment if not using Alembic
 
+"""
+Lifespan hook: everything that must live exactly as long as the app process
+(background workers, pooled clients, ...) is started before `yield` and
+shut down after it.
+"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.speech_clients = SpeechClientPool(settings.speech_client_pool_size)
+    await io_executor.run(app.state.speech_clients.start)
+    health_checks = asyncio.create_task(check_speech_clients(app.state.speech_clients))
+    replica_checks = asyncio.create_task(check_replicas())
+    speech.job_pool.start()
+    try:
+        await io_executor.run(speech.recover_transcription_jobs, GoogleSpeechRecognizer(app.state.speech_clients))
+    except Exception as e:
+        logging.error(f"Recovering transcription jobs failed: {e}")
+    yield
+    health_checks.cancel()
+    replica_checks.cancel()
+    speech.job_pool.stop()
+    app.state.speech_clients.close()
+    shutdown_executors()
+    speech.translation_cache.close()
+    await async_engine.dispose()
+    await replica_router.dispose()
+
+async def check_speech_clients(clients: SpeechClientPool):
+    while True:
+        await asyncio.sleep(settings.speech_client_health_interval_seconds)
+        try:
+            await io_executor.run(clients.check)
+        except Exception as e:
+            logging.error(f"Speech client health check failed: {e}")
+
+async def check_replicas():
+    while replica_router.urls:
+        await asyncio.sleep(settings.replica_health_interval_seconds)
+        try:
+            await replica_router.check()
+        except Exception as e:
+            logging.error(f"Replica health check failed: {e}")
+
 # Initialize FastAPI instance
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ModelResponse)
 
 # Allow all origins for CORS (adjust for production security)
 origins = ["*"] 
@@ -28,6 +79,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
         
+# Reject oversized recordings before they are read
+app.add_middleware(MaxUploadSizeMiddleware, max_bytes=settings.max_upload_bytes, prefix=speech.router.prefix)
+
 # Include routers for different app modules
 app.include_router(user.router)
 app.include_router(auth.router)
@@ -36,3 +90,17 @@ app.include_router(speech.router)
 @app.get("/")
 def root():
     return {"message": "alive"}
+
+@app.get("/metrics")
+def metrics():
+    """Saturation of the background pools and cache effectiveness."""
+    return {
+        "executors": executor_stats(),
+        "job_pools": {speech.job_pool.name: speech.job_pool.stats()},
+        "translation_cache": speech.translation_cache.stats(),
+        "speech_clients": app.state.speech_clients.stats() if hasattr(app.state, "speech_clients") else None,
+        "single_flight": {speech.transcriptions_in_flight.name: speech.transcriptions_in_flight.stats()},
+        "auth_cache": oauth2.auth_cache.stats(),
+        "database_pools": pool_metrics(),
+        "replicas": replica_router.stats(),
+    }
@@ -1,5 +1,5 @@
 import logging
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Date, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.sql.expression import text
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.orm import relationship
@@ -40,6 +40,33 @@ class User(Base):
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
 
     logger.info("User model initialized.")
+
+class RefreshToken(Base):
+    """
+    Represents a table `refresh_tokens` in the database.
+
+    One row per refresh token issued by `/login` or `/token/refresh` (see `oauth2.py`):
+    - `id`: Auto-generated primary key.
+    - `user_id`: The user the token was issued to; tokens go with the user.
+    - `family_id`: Shared by a token and every token it was rotated into, starting at a login.
+    - `token_hash`: SHA-256 of the token, the token itself is never stored.
+    - `expires_at`: When the token stops being accepted.
+    - `used_at`: When the token was exchanged; presenting it again is a reuse.
+    - `revoked_at`: When the token's family was revoked (logout or reuse).
+    - `created_at`: Timestamp of issue.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    family_id = Column(String, nullable=False, index=True)
+    token_hash = Column(String, nullable=False, unique=True)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    used_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    revoked_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
+
+    logger.info("RefreshToken model initialized.")
     
 class CallSentimentLog(Base):
     """
@@ -50,15 +77,119 @@ class CallSentimentLog(Base):
     - `related_to_id`: Foreign key linking to Salesforce-related objects (e.g., Lead, Contact, Opportunity).
     - `call_id`: Unique identifier of the call (from Salesforce).
     - `overall_sentiment`: The aggregated sentiment result (positive, negative, neutral).
+    - `average_score`: Average sentiment score of the call's segments (-1 to +1).
+    - `audio_sha256`: SHA-256 of the recording the call was logged from, to tell a retry
+      from other audio sent under the same `call_id` (unset for streamed calls).
     - `created_at`: Timestamp of log entry creation.
+
+    Indexed for `GET /speech/logs`, newest first by `(created_at, id)`, optionally filtered
+    by `related_to_id` or `overall_sentiment`.
     """
     __tablename__ = "call_sentiment_logs"
+    __table_args__ = (
+        Index("ix_call_sentiment_logs_created_at", "created_at", "id"),
+        Index("ix_call_sentiment_logs_related_to_id_created_at", "related_to_id", "created_at", "id"),
+        Index("ix_call_sentiment_logs_overall_sentiment_created_at", "overall_sentiment", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)  # Auto-incremented ID
     related_to_id = Column(String, nullable=False)  # Could be linked to Salesforce records
     call_id = Column(String, nullable=False, unique=True)  # Unique ID for the call
     overall_sentiment = Column(String, nullable=False)  # Sentiment analysis result
+    average_score = Column(Float, nullable=True)  # Not recorded for calls logged before segments were stored
+    audio_sha256 = Column(String, nullable=True)  # Unset for streamed calls and calls logged before it was recorded
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))  # Auto-timestamp
 
     logger.info("CallSentimentLog model initialized.")
-    
+
+class CallSegment(Base):
+    """
+    Represents a table `call_segments` in the database.
+
+    One row per transcribed line of a logged call, so later analysis does not need to
+    run speech recognition again:
+    - `call_id` / `segment_index`: The call (see `CallSentimentLog`) and the line's position in it, Primary Key.
+    - `start_seconds` / `end_seconds`: Offsets of the speech region the line was recognized in (unset when streamed).
+    - `text`: The transcribed (Indonesian) line.
+    - `translated_text`: English translation that was scored, unset when scored untranslated.
+    - `score` / `sentiment`: Sentiment score (-1 to +1) and its label.
+    """
+    __tablename__ = "call_segments"
+
+    call_id = Column(String, ForeignKey("call_sentiment_logs.call_id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    segment_index = Column(Integer, primary_key=True, nullable=False)
+    start_seconds = Column(Float, nullable=True)
+    end_seconds = Column(Float, nullable=True)
+    text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=True)
+    score = Column(Float, nullable=False)
+    sentiment = Column(String, nullable=False)
+
+    logger.info("CallSegment model initialized.")
+
+class CallSentimentDaily(Base):
+    """
+    Represents a table `call_sentiment_daily` in the database.
+
+    Per-record, per-day rollup of `call_sentiment_logs`, kept up to date in the same
+    transaction as every new log (see `rollups.py`) so trends never group over the logs:
+    - `related_to_id` / `day`: Salesforce record and UTC day of the calls, Primary Key.
+    - `positive_count` / `negative_count` / `neutral_count`: Calls per overall sentiment.
+    - `score_sum` / `scored_count`: Sum of the calls' average scores and how many calls had one.
+    """
+    __tablename__ = "call_sentiment_daily"
+
+    related_to_id = Column(String, primary_key=True, nullable=False)
+    day = Column(Date, primary_key=True, nullable=False)
+    positive_count = Column(Integer, nullable=False, server_default=text("0"))
+    negative_count = Column(Integer, nullable=False, server_default=text("0"))
+    neutral_count = Column(Integer, nullable=False, server_default=text("0"))
+    score_sum = Column(Float, nullable=False, server_default=text("0"))
+    scored_count = Column(Integer, nullable=False, server_default=text("0"))
+
+    logger.info("CallSentimentDaily model initialized.")
+
+class TranscriptionJob(Base):
+    """
+    Represents a table `transcription_jobs` in the database.
+
+    Tracks transcriptions requested in job mode so any worker process can report on them:
+    - `id`: Job identifier returned to the client (UUID hex).
+    - `status`: `queued`, `running`, `completed` or `failed`.
+    - `filename`: Name of the uploaded file.
+    - `related_to_id` / `call_id`: Salesforce identifiers the result is logged against.
+    - `result`: The `TranscriptionResponse` as JSON once the job completed.
+    - `error`: Failure reason if the job failed.
+    - `created_at` / `updated_at`: Timestamps of creation and last status change.
+    """
+    __tablename__ = "transcription_jobs"
+
+    id = Column(String, primary_key=True, nullable=False)
+    status = Column(String, nullable=False, server_default=text("'queued'"))
+    filename = Column(String, nullable=False)
+    related_to_id = Column(String, nullable=False)
+    call_id = Column(String, nullable=False)
+    result = Column(Text, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'), onupdate=text('now()'))
+
+    logger.info("TranscriptionJob model initialized.")
+
+class TranscriptionResult(Base):
+    """
+    Represents a table `transcription_results` in the database.
+
+    Finished transcriptions keyed by the content of the uploaded audio, so a retried
+    upload of the same recording is answered from here instead of rerunning the pipeline:
+    - `audio_sha256`: SHA-256 of the uploaded file (hex), Primary Key.
+    - `response`: The `TranscriptionResponse` as JSON.
+    - `created_at`: Timestamp of the first successful transcription.
+    """
+    __tablename__ = "transcription_results"
+
+    audio_sha256 = Column(String(64), primary_key=True, nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
+
+    logger.info("TranscriptionResult model initialized.")
@@ -1,11 +1,22 @@
+import hashlib
+import logging
+import secrets
+import uuid
 from jose import JWTError, jwt
-from datetime import datetime, timedelta
-from . import schemas, database, models
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from . import schemas, database, models, replicas
+from .auth_cache import AuthCache
 from fastapi import status, HTTPException, Depends
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from .config import settings
 
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
 """
 Defining oauth scheme for user login and access;
 """
@@ -49,24 +60,135 @@ def verify_access_token(token: str, credentials_exception):
         # decode the payload included in the JWT token
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
-        id: str = str(payload.get("user_id")) # cast the original int user id to str
-
-        if id is None:
+        # Both claims are used as integers (user key, cache expiry): a signed token without
+        # them was not issued by `create_access_token`, reject it rather than fail later
+        user_id, exp = payload.get("user_id"), payload.get("exp")
+        if not _is_int(user_id) or not _is_int(exp):
             raise credentials_exception
-        token_data = schemas.TokenData(id=id)
+        id: str = str(user_id) # cast the original int user id to str
+
+        token_data = schemas.TokenData(id=id, exp=exp)
     except JWTError:
         raise credentials_exception
     
     return token_data
 
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+"""
+Verified tokens and users are cached per process (see `auth_cache.py`), so most
+requests are authenticated without touching the database.
+"""
+auth_cache = AuthCache(
+    token_size=settings.auth_token_cache_size,
+    user_size=settings.auth_user_cache_size,
+    user_ttl=settings.auth_user_cache_ttl_seconds
+)
+
+@event.listens_for(models.User, "after_insert")
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def forget_changed_user(mapper, connection, user: models.User):
+    auth_cache.invalidate_user(user.id)
+    replicas.mark_written(("users", user.id))  # Read it back from the primary while replicas catch up
+
 """
 Create a dependency class that is used on a specific router
 """    
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_async_read_db)) -> schemas.CurrentUser:
+    """
+    Resolve the user of a bearer token.
+
+    With `auth_claims_only` the token's claims are trusted as they are and the database
+    is never queried; otherwise the user must still exist (cached for a short while).
+    """
     credentials_exception = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                           detail=f"could not validate credentials", headers={"WWW-Authenticate": "Bearer"})
     
-    token = verify_access_token(token, credentials_exception)
-    user = db.query(models.User).filter(models.User.id == token.id).first()
-     
-    return user
\ No newline at end of file
+    user_id = auth_cache.token_user_id(token)
+    if user_id is None:
+        token_data = verify_access_token(token, credentials_exception)
+        user_id = int(token_data.id)
+        auth_cache.remember_token(token, user_id, token_data.exp)
+
+    if settings.auth_claims_only:
+        return schemas.CurrentUser(id=user_id)
+
+    user = auth_cache.user(user_id)
+    if user is None:
+        user = await replicas.read(db, lambda db: load_user(db, user_id), key=("users", user_id))
+        if user is None:
+            raise credentials_exception
+        auth_cache.remember_user(user)
+    return user
+
+async def load_user(db: AsyncSession, user_id: int) -> Optional[schemas.CurrentUser]:
+    user = await db.get(models.User, user_id)
+    return schemas.CurrentUser.model_validate(user) if user else None
+
+"""
+Refresh tokens: opaque random strings handed out by `/login` next to the access token,
+exchanged at `/token/refresh` for a new access token without a bcrypt verify.
+
+✅ Only their SHA-256 is stored: a fast digest is enough for 256 random bits.
+✅ Every exchange rotates the token: the old one is marked used and a new one of the
+   same family is issued, in one transaction.
+✅ A used token presented again means it leaked (or a client raced itself): the whole
+   family is revoked, so both the thief and the client have to log in again.
+"""
+def _refresh_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+async def issue_refresh_token(db: AsyncSession, user_id: int, family_id: Optional[str] = None) -> str:
+    token = secrets.token_urlsafe(32)
+    db.add(models.RefreshToken(
+        user_id=user_id,
+        family_id=family_id or uuid.uuid4().hex,
+        token_hash=_refresh_digest(token),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days)
+    ))
+    await db.commit()
+    return token
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Optional[Tuple[int, str]]:
+    """
+    Exchange `token` for `(user_id, new refresh token)`, or None if it is unknown, expired,
+    revoked or already used (in which case its family is revoked).
+    """
+    refresh = models.RefreshToken
+    digest = _refresh_digest(token)
+
+    # Marking the token used is the only check, so two concurrent exchanges cannot both win
+    used = (await db.execute(
+        update(refresh)
+        .where(refresh.token_hash == digest, refresh.used_at.is_(None), refresh.revoked_at.is_(None),
+               refresh.expires_at > func.now())
+        .values(used_at=func.now())
+        .returning(refresh.user_id, refresh.family_id)
+        .execution_options(synchronize_session=False)
+    )).first()
+
+    if used is None:
+        reused_family = select(refresh.family_id).where(refresh.token_hash == digest, refresh.used_at.is_not(None))
+        if await _revoke_family(db, reused_family.scalar_subquery()):
+            logger.warning("Refresh token reused, revoked its family")
+        await db.commit()
+        return None
+
+    return used.user_id, await issue_refresh_token(db, used.user_id, used.family_id)
+
+async def revoke_refresh_token(db: AsyncSession, token: str):
+    """Revoke `token` and every token of its family (logout)."""
+    refresh = models.RefreshToken
+    await _revoke_family(db, select(refresh.family_id).where(refresh.token_hash == _refresh_digest(token)).scalar_subquery())
+    await db.commit()
+
+async def _revoke_family(db: AsyncSession, family_id) -> int:
+    refresh = models.RefreshToken
+    return (await db.execute(
+        update(refresh)
+        .where(refresh.family_id == family_id, refresh.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+        .execution_options(synchronize_session=False)
+    )).rowcount
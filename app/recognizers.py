@@ -0,0 +1,206 @@
+import itertools
+import logging
+import threading
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import grpc
+from fastapi import Request
+from google.cloud import speech
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+"""
+📌 Speech Recognizers
+
+✅ `SpeechRecognizer` is the interface the speech router talks to.
+✅ `GoogleSpeechRecognizer` is the production backend (Google Speech-to-Text).
+✅ Any other backend (e.g. a local fake used by the tests) only has to subclass
+   `SpeechRecognizer` and be returned from the `get_recognizer` dependency.
+
+🔹 Two ways of recognizing audio:
+- `recognize`: the whole recording at once, returns every transcribed line.
+- `streaming_recognize`: consumes audio chunk by chunk and yields each line as
+  soon as the backend marks it final.
+
+🔹 Both receive mono LINEAR16 samples without a WAV header, at `sample_rate_hertz`;
+   `audio.py` converts the uploads before they get here.
+
+🔹 Google clients are expensive to create (credentials lookup, gRPC channel, TLS
+   handshake), so they live in a `SpeechClientPool` owned by the app lifespan.
+"""
+
+LANGUAGE_CODE = "id-ID"  # Bahasa Indonesia
+SAMPLE_RATE_HERTZ = 16000
+
+
+class SpeechRecognizer:
+    """
+    🔹 Base class for speech-to-text backends.
+    """
+
+    def recognize(self, audio_bytes: bytes, sample_rate_hertz: int = SAMPLE_RATE_HERTZ) -> List[str]:
+        """Transcribe a complete recording and return its lines."""
+        raise NotImplementedError
+
+    def streaming_recognize(self, chunks: Iterable[bytes], sample_rate_hertz: int = SAMPLE_RATE_HERTZ) -> Iterator[str]:
+        """Transcribe audio chunks as they arrive, yielding each final line."""
+        raise NotImplementedError
+
+
+def channel_ready(client, timeout: float):
+    """Connect the client's gRPC channel, raising `grpc.FutureTimeoutError` if it does not get ready."""
+    grpc.channel_ready_future(client.transport.grpc_channel).result(timeout=timeout)
+
+
+class SpeechClientPool:
+    """
+    🔹 A few long-lived `SpeechClient`s shared by every request, handed out round-robin.
+
+    A client is safe to use from many threads at once; several of them spread the load
+    over several gRPC channels (one HTTP/2 connection each). The pool is:
+
+    - warmed up by `start`, which creates every client and connects its channel, so the
+      first requests do not pay for the handshakes. Failures are logged, not raised, and
+      missing clients are created on first use instead;
+    - health-checked by `check`, which replaces clients whose channel does not get ready;
+    - closed by `close`.
+    """
+
+    def __init__(self, size: int, factory: Optional[Callable] = None, probe: Callable = channel_ready,
+                 probe_timeout: float = 5.0):
+        self.size = size
+        self._factory = factory
+        self._probe = probe
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._clients: List = []
+        self._next = itertools.count()
+        self.created = 0
+        self.replaced = 0
+        self.healthy = 0
+
+    def _create(self):
+        client = (self._factory or speech.SpeechClient)()
+        self.created += 1
+        return client
+
+    def start(self):
+        with self._lock:
+            try:
+                while len(self._clients) < self.size:
+                    self._clients.append(self._create())
+            except Exception as e:
+                logger.error(f"Could not create Speech-to-Text clients, will retry on first use: {e}")
+        self.check()
+        logger.info(f"Speech client pool ready: {self.healthy}/{self.size} channels connected.")
+
+    def acquire(self):
+        """Return the next client, creating the pool's clients first if startup could not."""
+        with self._lock:
+            if len(self._clients) < self.size:
+                self._clients.append(self._create())
+                return self._clients[-1]
+            return self._clients[next(self._next) % self.size]
+
+    def check(self) -> bool:
+        """Probe every client's channel, replacing the ones that fail. Returns True if all are healthy."""
+        with self._lock:
+            clients = list(enumerate(self._clients))
+        healthy = 0
+        for i, client in clients:
+            try:
+                self._probe(client, self.probe_timeout)
+                healthy += 1
+                continue
+            except Exception as e:
+                logger.warning(f"Speech client {i} failed its health check, replacing it: {e}")
+            try:
+                replacement = self._create()
+            except Exception as e:
+                logger.error(f"Could not replace speech client {i}: {e}")
+                continue
+            with self._lock:
+                self._clients[i] = replacement
+                self.replaced += 1
+            _close_client(client)
+        self.healthy = healthy
+        return healthy == self.size
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            _close_client(client)
+        logger.info("Speech client pool closed.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "clients": len(self._clients),
+                "healthy": self.healthy,
+                "created": self.created,
+                "replaced": self.replaced,
+            }
+
+
+def _close_client(client):
+    try:
+        client.transport.close()
+    except Exception as e:
+        logger.warning(f"Error closing speech client: {e}")
+
+
+class GoogleSpeechRecognizer(SpeechRecognizer):
+    """
+    🔹 Google Speech-to-Text backend.
+
+    Uses clients from `clients` when given, otherwise creates one per call
+    (fine for scripts, too slow for the API).
+    """
+
+    def __init__(self, clients: Optional[SpeechClientPool] = None, language_code: str = LANGUAGE_CODE):
+        self.clients = clients
+        self.language_code = language_code
+
+    def _client(self):
+        return self.clients.acquire() if self.clients is not None else speech.SpeechClient()
+
+    def _config(self, sample_rate_hertz: int) -> speech.RecognitionConfig:
+        return speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate_hertz,
+            audio_channel_count=1,
+            language_code=self.language_code,
+        )
+
+    def recognize(self, audio_bytes: bytes, sample_rate_hertz: int = SAMPLE_RATE_HERTZ) -> List[str]:
+        client = self._client()
+
+        audio = speech.RecognitionAudio(content=bytes(audio_bytes))  # Protobuf needs bytes, not a memoryview
+        response = client.recognize(config=self._config(sample_rate_hertz), audio=audio)
+        logger.info(f"Speech-to-Text response: {response}")
+
+        return [result.alternatives[0].transcript for result in response.results]
+
+    def streaming_recognize(self, chunks: Iterable[bytes], sample_rate_hertz: int = SAMPLE_RATE_HERTZ) -> Iterator[str]:
+        client = self._client()
+
+        streaming_config = speech.StreamingRecognitionConfig(config=self._config(sample_rate_hertz))
+        requests = (speech.StreamingRecognizeRequest(audio_content=chunk) for chunk in chunks)
+
+        for response in client.streaming_recognize(config=streaming_config, requests=requests):
+            for result in response.results:
+                if result.is_final and result.alternatives:
+                    yield result.alternatives[0].transcript
+
+
+"""
+Dependency used by the speech router; override it with
+`app.dependency_overrides[get_recognizer]` to plug in another backend.
+Uses the client pool the lifespan stored on `app.state.speech_clients`.
+"""
+def get_recognizer(request: Request) -> SpeechRecognizer:
+    return GoogleSpeechRecognizer(getattr(request.app.state, "speech_clients", None))
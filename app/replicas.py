@@ -0,0 +1,206 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, Hashable, List, Optional, TypeVar
+
+from cachetools import TTLCache
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from .config import settings
+from .db_pool import PoolStats, engine_options, instrument
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+"""
+📌 Read replicas
+
+Read-only endpoints (user lookups, call logs, trends) can be served by streaming
+replicas of the primary, so they stop competing with the transcription inserts.
+
+✅ `ReplicaRouter` hands out read sessions: on a healthy replica (round robin), or on
+   the primary when no replica is configured or none is up. Sessions are lazy, so a
+   request that never queries (e.g. an auth cache hit) never opens a connection.
+✅ `read` / `read_sync` run a query on such a session and fall back to the primary when:
+   - the replica is unavailable: it is then skipped for `replica_health_interval_seconds`
+     (or until the health check in `main.py` sees it answer again);
+   - the key read was written by this process in the last `replica_read_your_writes_seconds`
+     (see `mark_written`), so a client always sees its own changes;
+   - the replica has no such row: it may not have replayed the insert yet.
+
+🔹 Writes always use `get_db` / `get_async_db` (the primary). Rows written by another
+   process may be read slightly stale from a replica, never missing.
+"""
+
+T = TypeVar("T")
+
+# Errors meaning "this database cannot be used right now", as opposed to a bad query
+UNAVAILABLE = (exc.OperationalError, exc.InterfaceError, OSError, asyncio.TimeoutError)
+
+_recent_writes = TTLCache(maxsize=100000, ttl=settings.replica_read_your_writes_seconds)
+_recent_writes_lock = threading.Lock()
+
+
+def mark_written(*keys: Hashable):
+    """Send reads of `keys` (e.g. `("users", 42)`) to the primary for a while."""
+    with _recent_writes_lock:
+        for key in keys:
+            _recent_writes[key] = True
+
+
+def recently_written(key: Hashable) -> bool:
+    with _recent_writes_lock:
+        return key in _recent_writes
+
+
+class ReplicaRouter:
+    """
+    🔹 Read sessions spread over the replicas at `urls`, with the primary's session factories as fallback.
+    """
+
+    def __init__(self, urls: List[str], primary: sessionmaker, async_primary: async_sessionmaker,
+                 timer: Callable[[], float] = time.monotonic):
+        self.urls = urls
+        self.primary = primary
+        self.async_primary = async_primary
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self._down_until = [0.0] * len(urls)
+        self._pool_stats = [PoolStats(f"replica{i}") for i in range(len(urls))]
+        self._sessions: List[sessionmaker] = []
+        self._async_sessions: List[async_sessionmaker] = []
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.fallbacks = 0
+
+        timeout = settings.replica_connect_timeout_seconds
+        for url, stats in zip(urls, self._pool_stats):
+            options = engine_options(stats)
+            engine = create_engine(url, **options, connect_args={"connect_timeout": max(int(timeout), 1)})
+            instrument(engine, stats)
+            self._sessions.append(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+
+            options = engine_options(stats, is_async=True)
+            options["connect_args"] = {**options.get("connect_args", {}), "timeout": timeout}
+            async_engine = create_async_engine(make_url(url).set(drivername="postgresql+asyncpg"), **options)
+            instrument(async_engine.sync_engine, stats)
+            self._async_sessions.append(async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False))
+
+    def _pick(self) -> Optional[int]:
+        """A replica that is not known to be down, in turn, or None."""
+        now = self._timer()
+        with self._lock:
+            up = [i for i, until in enumerate(self._down_until) if until <= now]
+            return up[next(self._round_robin) % len(up)] if up else None
+
+    def mark_down(self, replica: int, error: BaseException):
+        with self._lock:
+            self._down_until[replica] = self._timer() + settings.replica_health_interval_seconds
+            self.fallbacks += 1
+        logger.warning(f"Replica {replica} unavailable, reading from the primary: {error!r}")
+
+    def session(self) -> Session:
+        replica = self._pick()
+        factory = self.primary if replica is None else self._sessions[replica]
+        return factory(info={"router": self, "replica": replica})
+
+    def async_session(self) -> AsyncSession:
+        replica = self._pick()
+        factory = self.async_primary if replica is None else self._async_sessions[replica]
+        return factory(info={"router": self, "replica": replica})
+
+    def count_read(self, replica: Optional[int]):
+        with self._lock:
+            if replica is None:
+                self.primary_reads += 1
+            else:
+                self.replica_reads += 1
+
+    async def check(self):
+        """Ping every replica, marking the ones that do not answer as down and the others as up."""
+        for replica, sessions in enumerate(self._async_sessions):
+            try:
+                async with sessions() as db:
+                    await asyncio.wait_for(db.execute(text("SELECT 1")), settings.replica_connect_timeout_seconds)
+            except UNAVAILABLE as e:
+                self.mark_down(replica, e)
+            else:
+                with self._lock:
+                    self._down_until[replica] = 0.0
+
+    async def dispose(self):
+        for sessions in self._async_sessions:
+            await sessions.kw["bind"].dispose()
+        for sessions in self._sessions:
+            sessions.kw["bind"].dispose()
+
+    def stats(self) -> dict:
+        now = self._timer()
+        with self._lock:
+            return {
+                "replicas": [
+                    {"host": make_url(url).host, "up": until <= now, "pool": stats.stats()}
+                    for url, until, stats in zip(self.urls, self._down_until, self._pool_stats)
+                ],
+                "replica_reads": self.replica_reads,
+                "primary_reads": self.primary_reads,
+                "fallbacks": self.fallbacks,
+            }
+
+
+async def read(db: AsyncSession, query: Callable[[AsyncSession], Awaitable[T]], key: Optional[Hashable] = None) -> T:
+    """
+    Run `query` on the read session `db`, or on the primary (see the module docstring).
+    With a `key`, a recent write of it, or a `None` result from a replica, reads the primary.
+    """
+    router: Optional[ReplicaRouter] = db.info.get("router")
+    replica = db.info.get("replica")
+    if router is None or replica is None:  # Already on the primary
+        if router is not None:
+            router.count_read(None)
+        return await query(db)
+
+    if key is None or not recently_written(key):
+        try:
+            result = await query(db)
+        except UNAVAILABLE as e:
+            router.mark_down(replica, e)
+        else:
+            if result is not None or key is None:
+                router.count_read(replica)
+                return result
+
+    router.count_read(None)
+    async with router.async_primary() as primary:
+        return await query(primary)
+
+
+def read_sync(db: Session, query: Callable[[Session], T], key: Optional[Hashable] = None) -> T:
+    """`read` for sync sessions."""
+    router: Optional[ReplicaRouter] = db.info.get("router")
+    replica = db.info.get("replica")
+    if router is None or replica is None:
+        if router is not None:
+            router.count_read(None)
+        return query(db)
+
+    if key is None or not recently_written(key):
+        try:
+            result = query(db)
+        except UNAVAILABLE as e:
+            router.mark_down(replica, e)
+        else:
+            if result is not None or key is None:
+                router.count_read(replica)
+                return result
+
+    router.count_read(None)
+    with router.primary() as primary:
+        return query(primary)
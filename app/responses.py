@@ -0,0 +1,24 @@
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+"""
+📌 Fast JSON responses
+
+✅ `ModelResponse` is the app's default response class (see `main.py`): plain content
+   (dicts, lists, ...) is encoded with `orjson` instead of the standard `json` module.
+✅ Endpoints with large payloads return `ModelResponse(model)` directly: pydantic-core
+   renders the model straight to JSON bytes, skipping FastAPI's round trip through a
+   dict of plain values and a second encoding pass.
+
+🔹 A `Response` returned by an endpoint is not validated against its `response_model`
+   (which still documents it), so only return models of that exact schema.
+"""
+
+
+class ModelResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
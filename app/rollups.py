@@ -0,0 +1,152 @@
+import argparse
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List
+
+from sqlalchemy import Date, DateTime, and_, cast, delete, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from . import models, schemas
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+"""
+📌 Daily sentiment rollups
+
+`call_sentiment_daily` holds, per Salesforce record and UTC day, the number of calls
+per overall sentiment and the sum of their scores, so trends read one row per day
+instead of grouping over `call_sentiment_logs`.
+
+✅ `record_call_logs`: adds freshly inserted logs to their buckets with one
+   `INSERT ... SELECT ... ON CONFLICT DO UPDATE`, in the transaction that inserts them.
+✅ `rebuild_daily_rollups` / `backfill`: recompute buckets from the logs, a window of
+   days per transaction. Idempotent, so it can be rerun at any time:
+       python -m app.rollups [--batch-days 30]
+✅ `sentiment_trend`: buckets of one record by day, week or month.
+
+🔹 A rebuild that overlaps today may miss calls logged while it runs; rerun it (or
+   just today's window) if writes were not paused.
+"""
+
+COUNT_COLUMNS = ("positive_count", "negative_count", "neutral_count", "score_sum", "scored_count")
+
+
+def _rollup_select(condition):
+    """Logs matching `condition` grouped into (related_to_id, day) buckets."""
+    log = models.CallSentimentLog
+    day = cast(func.timezone("UTC", log.created_at), Date)
+    return (
+        select(
+            log.related_to_id, day,
+            func.count().filter(log.overall_sentiment == "positive"),
+            func.count().filter(log.overall_sentiment == "negative"),
+            func.count().filter(log.overall_sentiment == "neutral"),
+            func.coalesce(func.sum(log.average_score), 0.0),
+            func.count(log.average_score),
+        )
+        .where(condition)
+        .group_by(log.related_to_id, day)
+    )
+
+
+def _upsert_buckets(buckets, accumulate: bool):
+    daily = models.CallSentimentDaily
+    stmt = postgresql.insert(daily).from_select(["related_to_id", "day", *COUNT_COLUMNS], buckets)
+    if accumulate:
+        counts = {c: getattr(daily, c) + getattr(stmt.excluded, c) for c in COUNT_COLUMNS}
+    else:
+        counts = {c: getattr(stmt.excluded, c) for c in COUNT_COLUMNS}
+    return stmt.on_conflict_do_update(index_elements=["related_to_id", "day"], set_=counts)
+
+
+async def record_call_logs(db: AsyncSession, call_ids: List[str]):
+    """
+    Add the logs of `call_ids` to their daily buckets. Call it after the logs are
+    flushed and before the commit, so logs and rollups never disagree.
+    """
+    if call_ids:
+        await db.execute(_upsert_buckets(_rollup_select(models.CallSentimentLog.call_id.in_(call_ids)), accumulate=True))
+
+
+def rebuild_daily_rollups(db: Session, start: date, end: date):
+    """Recompute the buckets of days in [`start`, `end`) from the logs, in one transaction."""
+    log = models.CallSentimentLog
+    daily = models.CallSentimentDaily
+    start_at = datetime.combine(start, time.min, tzinfo=timezone.utc)
+    end_at = datetime.combine(end, time.min, tzinfo=timezone.utc)
+
+    db.execute(delete(daily).where(daily.day >= start, daily.day < end))  # Days whose logs were deleted
+    db.execute(_upsert_buckets(_rollup_select(and_(log.created_at >= start_at, log.created_at < end_at)),
+                               accumulate=False))
+    db.commit()
+
+
+def backfill(db: Session, batch_days: int = 30) -> int:
+    """Rebuild every bucket from the existing logs, `batch_days` days at a time; returns the days covered."""
+    log = models.CallSentimentLog
+    first, last = db.execute(select(func.min(log.created_at), func.max(log.created_at))).one()
+    if first is None:
+        return 0
+
+    start = first.astimezone(timezone.utc).date()
+    end = last.astimezone(timezone.utc).date() + timedelta(days=1)
+    day = start
+    while day < end:
+        window_end = min(day + timedelta(days=batch_days), end)
+        rebuild_daily_rollups(db, day, window_end)
+        logger.info(f"Rolled up call logs from {day} to {window_end}")
+        day = window_end
+    return (end - start).days
+
+
+def sentiment_trend(
+    db: Session, related_to_id: str, start: date, end: date, granularity: str = "day"
+) -> List[schemas.SentimentTrendBucket]:
+    """
+    Buckets of `related_to_id` for days in [`start`, `end`), read from the daily rollups only.
+    Weeks and months are cut to the range: a first bucket that begins before `start` (a range
+    starting mid-week) only counts days from `start` on, and is reported as starting there.
+    """
+    daily = models.CallSentimentDaily
+    bucket = cast(func.date_trunc(granularity, cast(daily.day, DateTime)), Date)
+    rows = db.execute(
+        select(
+            bucket,
+            func.sum(daily.positive_count), func.sum(daily.negative_count), func.sum(daily.neutral_count),
+            func.sum(daily.score_sum), func.sum(daily.scored_count),
+        )
+        .where(daily.related_to_id == related_to_id, daily.day >= start, daily.day < end)
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    return [
+        schemas.SentimentTrendBucket(
+            start=max(bucket_start, start), calls=positive + negative + neutral,
+            positive=positive, negative=negative, neutral=neutral,
+            average_score=score_sum / scored if scored else None,
+        )
+        for bucket_start, positive, negative, neutral, score_sum, scored in rows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the daily sentiment rollups from the call logs.")
+    parser.add_argument("--batch-days", type=int, default=30, help="days recomputed per transaction")
+    args = parser.parse_args()
+
+    from .database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        days = backfill(db, args.batch_days)
+        logger.info(f"Rebuilt the daily rollups of {days} days")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
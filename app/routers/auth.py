@@ -1,9 +1,11 @@
 import logging
 from fastapi import status, HTTPException, Depends, APIRouter  
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
-from typing import List
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from .. import database, schemas, models, utils, oauth2
+from ..executors import ExecutorSaturated, hash_executor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,7 +25,7 @@ OAuth2PasswordRequestForm sends form data:
 }
 """
 @router.post("/login", response_model=schemas.Token)
-def login(user_credentials: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
+async def login(user_credentials: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(database.get_async_db)):
     
     """
     Authenticate user and return JWT token.
@@ -31,30 +33,74 @@ def login(user_credentials: OAuth2PasswordRequestForm = Depends(), db: Session =
     Steps:
     1. Retrieve user from DB by email (username field).
     2. If the user doesn't exist, return a 403 error.
-    3. Validate the password using the utils.verify function.
-    4. If valid, generate and return an access token.
+    3. Validate the password using utils.verify_and_update (on the hashing processes).
+    4. If the stored hash has an outdated cost, replace it with the new hash.
+    5. If valid, generate and return an access token and a refresh token.
     """
 
     logger.info(f"Login attempt for user: {user_credentials.username}")
 
-    # Step 1: Query user from the database based on email (username field)
-    user = db.query(models.User).filter(
-                    models.User.email == user_credentials.username
-                    ).first()
+    try:
+        # Step 1: Query user from the database based on email (username field)
+        user = await find_user(db, user_credentials.username)
+
+        # Step 2: If user is not found, log and return an error
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail=f"Invalid Credentials"
+            )
+
+        # Step 3: Validate password, bcrypt runs on the hash process pool
+        verified, new_hash = await hash_executor.run(utils.verify_and_update, user_credentials.password, user.password)
+        if not verified:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail=f"Invalid Credentials"
+            )
+
+        # Step 4: Transparently upgrade a hash made with another bcrypt cost
+        if new_hash is not None:
+            await update_password(db, user, new_hash)
+
+        # Step 5: Generate JWT token with user ID as payload, and a refresh token to renew it
+        refresh_token = await oauth2.issue_refresh_token(db, user.id)
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
 
-    # Step 2: If user is not found, log and return an error
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail=f"Invalid Credentials"
-        )
-    
-    # Step 3: Validate password using utils.verify
-    if not utils.verify(user_credentials.password, user.password):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail=f"Invalid Credentials"
-        )
-    
-    # Step 4: Generate JWT token with user ID as payload
     access_token = oauth2.create_access_token(data = {"user_id": user.id})
 
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+async def find_user(db: AsyncSession, email: str) -> Optional[models.User]:
+    return (await db.scalars(select(models.User).where(models.User.email == email))).first()
+
+async def update_password(db: AsyncSession, user: models.User, hashed_password: str):
+    user.password = hashed_password
+    await db.commit()
+    logger.info(f"Rehashed the password of user {user.id} with the current bcrypt cost")
+
+"""
+Refresh Endpoint: Exchanges a refresh token for a new access token and a new refresh token.
+
+No password and no bcrypt: clients call it when their access token expires instead of
+logging in again. The presented refresh token can never be used again.
+"""
+@router.post("/token/refresh", response_model=schemas.Token)
+async def refresh_access_token(request: schemas.RefreshRequest, db: AsyncSession = Depends(database.get_async_db)):
+    rotated = await oauth2.rotate_refresh_token(db, request.refresh_token)
+    if rotated is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+    user_id, refresh_token = rotated
+    access_token = oauth2.create_access_token(data = {"user_id": user_id})
+
+    return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
+
+"""
+Revoke Endpoint (logout): Revokes a refresh token and every token rotated from the same login.
+
+Answers 204 whether or not the token was known, so it cannot be used to probe tokens.
+"""
+@router.post("/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_refresh_token(request: schemas.RefreshRequest, db: AsyncSession = Depends(database.get_async_db)):
+    await oauth2.revoke_refresh_token(db, request.refresh_token)
@@ -1,12 +1,37 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status, Depends, Query
+from fastapi.responses import StreamingResponse
+import asyncio
+import base64
 import logging
+import os
+import queue
+import shutil
+import tempfile
+import uuid
+import zipfile
+from datetime import date, datetime, timedelta, timezone
 from .. import models, schemas, oauth2
-from google.cloud import speech
-from textblob import TextBlob
+from .. import replicas, rollups
+from .. import sentiment as sentiment_scoring
+from ..audio import AudioFormatError, PcmAudio, WavStreamDecoder, parse_wav_header, prepare_audio
+from ..config import settings
+from ..executors import ExecutorSaturated, audio_executor, io_executor
+from ..jobs import JobQueueFull, JobWorkerPool
+from ..sentiment_engines import ScoredSegment, create_sentiment_engine
+from ..singleflight import SingleFlight
+from ..translation import TranslationCache
+from ..uploads import UPLOAD_CHUNK_SIZE, MappedUpload, UploadTooLarge, dup_upload, hash_file, map_upload, spool_stream
+from ..recognizers import SpeechRecognizer, get_recognizer
+from ..responses import ModelResponse
+from ..vad import detect_speech
 from googletrans import Translator
-from typing import List
+from typing import AsyncIterator, Awaitable, BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Row, literal_column, select, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import SessionLocal, UnpooledAsyncSessionLocal, get_async_db, get_db, get_read_db
 
 router = APIRouter(
     prefix="/speech",
@@ -14,104 +39,882 @@ router = APIRouter(
 )
 
 translator = Translator()
+translation_cache = TranslationCache(
+    maxsize=settings.translation_cache_size,
+    ttl=settings.translation_cache_ttl_seconds,
+    path=settings.translation_cache_path or None
+)
+sentiment_engine = create_sentiment_engine(
+    settings.sentiment_engine, translator, translation_cache, scorer=settings.sentiment_scorer
+)
+
+STREAM_CHUNK_SIZE = 16 * 1024  # Google accepts at most 25 KB of audio per streaming request
 
-@router.post("/transcribe", response_model=schemas.TranscriptionResponse, status_code=status.HTTP_201_CREATED)
+# Identical recordings being transcribed right now, keyed by the SHA-256 of the audio
+transcriptions_in_flight = SingleFlight("transcriptions")
+
+@router.post("/transcribe", response_model=schemas.TranscriptionResponse, status_code=status.HTTP_201_CREATED,
+             responses={status.HTTP_202_ACCEPTED: {"model": schemas.TranscriptionJobOut}})
 async def transcribe_audio(
-    file: UploadFile = File(...), db: Session = Depends(get_db), current_user : int = Depends(oauth2.get_current_user)
+    file: UploadFile = File(...), related_to_id: str = Form(...), call_id: str = Form(...),
+    db: Session = Depends(get_db), async_db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.CurrentUser = Depends(oauth2.get_current_user), recognizer: SpeechRecognizer = Depends(get_recognizer),
+    mode: str = Query("sync", pattern="^(sync|job)$")
 ):  
-    """Transcribe, analyze sentiment, store in DB, and return structured data."""
-    
-    print(f"--- current user --- : {current_user}")
-    
+    """
+    Transcribe, analyze sentiment, store in DB, and return structured data.
+
+    `related_to_id` and `call_id` identify the call in Salesforce. Each call is logged
+    once: re-posting the same audio for a logged call (a retry) answers 201 with the
+    stored result, while posting different audio under a logged `call_id` answers 409
+    and keeps the first log (as `/speech/transcribe/batch` reports it per file), before
+    anything is transcribed.
+
+    With `?mode=job` the audio is queued instead: the endpoint answers 202 with a job
+    that can be polled on `GET /speech/jobs/{id}` until its result is available.
+
+    Uploads must be WAV files; any sample rate or channel count is converted, anything
+    else is rejected with 400 before Google is called.
+
+    The same audio is only ever transcribed once: a re-upload (e.g. a CRM retry after a
+    timeout) gets the stored result, and identical recordings arriving while the first is
+    still being transcribed wait for that run instead of starting their own; each request
+    then logs its own call.
+
+    Uploads larger than `max_upload_bytes` are rejected with 413. The recording is never
+    loaded into memory as a whole: it is hashed in chunks once spooled (a separate pass
+    over the temporary file), then read from it via `mmap`.
+    """
     try:
-        audio_bytes = await file.read()
-        transcriptions = transcribe_audio_from_bytes(audio_bytes)
-
-        # Generate structured responses
-        speech_transcriptions = [
-            schemas.SpeechTranscription(
-                transcription=text,
-                sentiment=analyze_sentiment(text)
-            ) for text in transcriptions
-        ]
-
-        # Calculate overall sentiment
-        overall_sentiment = calculate_overall_sentiment([t.sentiment for t in speech_transcriptions])
-
-        # Mock Salesforce-related ID and Call ID
-        related_to_id = "SF1256"  # Replace with actual related ID from request
-        call_id = '1234asas'  # Use filename as call ID (or parse from metadata)
-
-        # Save to database
-        new_log = save_transcription_to_db(db, related_to_id, call_id, overall_sentiment.overall_sentiment)
-        print(f'new log: {new_log}')
-
-        # Construct response
-        response = schemas.TranscriptionResponse(
-            filename=file.filename,
-            transcriptions=speech_transcriptions,
-            overall_sentiment=overall_sentiment
-        )
-
-        logging.info(f"API Response: {response.model_dump_json()}")
-        return response
+        with await io_executor.run(map_upload, file.file) as upload:
+            if mode == "job":
+                parse_wav_header(upload.data)  # Reject malformed audio now rather than in the worker
+                job = await io_executor.run(
+                    enqueue_transcription_job, db, recognizer, upload.file, file.filename, related_to_id, call_id
+                )
+                return ModelResponse(job_to_schema(job), status_code=status.HTTP_202_ACCEPTED)
+
+            response = await run_transcription_pipeline(
+                async_db, recognizer, upload.data, file.filename, related_to_id, call_id, upload.sha256,
+                transcribe=lambda: transcriptions_in_flight.run(
+                    upload.sha256, lambda: transcribe_detached(recognizer, upload, file.filename)
+                )
+            )
+
+        if logging.getLogger().isEnabledFor(logging.DEBUG):  # Large calls are expensive to serialize
+            logging.debug(f"API Response: {response.model_dump_json()}")
+        return ModelResponse(response, status_code=status.HTTP_201_CREATED)
+
+    except AudioFormatError as e:
+        logging.warning(f"Rejected audio file {file.filename}: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    except CallAlreadyLogged as e:
+        logging.warning(f"Rejected transcription of {file.filename}: {e}")
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    except (JobQueueFull, ExecutorSaturated) as e:
+        logging.warning(f"Rejected transcription of {file.filename}: {e}")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
 
     except Exception as e:
         logging.error(f"Error processing file {file.filename}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+@router.get("/jobs/{id}", response_model=schemas.TranscriptionJobOut)
+def get_transcription_job(id: str, db: Session = Depends(get_db), current_user: schemas.CurrentUser = Depends(oauth2.get_current_user)):
+    """Return the status of a transcription job and, once completed, its result."""
+    job = db.query(models.TranscriptionJob).filter(models.TranscriptionJob.id == id).first()
+
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=f"transcription job with id: {id} was not found")
+    return ModelResponse(job_to_schema(job))
+
+@router.get("/logs", response_model=schemas.CallSentimentLogPage)
+def list_call_logs(
+    related_to_id: Optional[str] = None, sentiment: Optional[str] = Query(None, pattern="^(positive|negative|neutral)$"),
+    created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=500), cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db), current_user: schemas.CurrentUser = Depends(oauth2.get_current_user)
+):
+    """
+    List call sentiment logs, newest first, optionally filtered by `related_to_id`,
+    `sentiment` and a `created_at` range (`created_after` inclusive, `created_before`
+    exclusive).
+
+    Pages are keyset-paginated: follow `next_cursor` (with the same filters) rather than
+    an offset, so every page costs the same index range scan however deep it is.
+    """
+    try:
+        after = decode_log_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    logs = replicas.read_sync(
+        db, lambda db: query_call_logs(db, related_to_id, sentiment, created_after, created_before, after, limit + 1)
+    )
+    next_cursor = encode_log_cursor(logs[limit - 1]) if len(logs) > limit else None
+    return ModelResponse(schemas.CallSentimentLogPage(items=logs[:limit], next_cursor=next_cursor))
+
+@router.get("/trends", response_model=schemas.SentimentTrend)
+def get_sentiment_trend(
+    related_to_id: str, start: Optional[date] = None, end: Optional[date] = None,
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    db: Session = Depends(get_read_db), current_user: schemas.CurrentUser = Depends(oauth2.get_current_user)
+):
+    """
+    Sentiment trend of one Salesforce record: calls per sentiment and average score for
+    each day, week or month in [`start`, `end`) (UTC days, the last 30 days by default).
+    Weeks start on Monday; a range starting mid-week or mid-month gets a shorter first
+    bucket, which starts at `start` and only counts the days in range.
+
+    Served from the daily rollups, so the cost depends on the days asked for, not on how
+    many calls were logged.
+    """
+    end = end or datetime.now(timezone.utc).date() + timedelta(days=1)
+    start = start or end - timedelta(days=30)
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+
+    buckets = replicas.read_sync(db, lambda db: rollups.sentiment_trend(db, related_to_id, start, end, granularity))
+    return schemas.SentimentTrend(related_to_id=related_to_id, granularity=granularity, buckets=buckets)
+
+@router.post("/transcribe/stream", status_code=status.HTTP_200_OK)
+async def transcribe_audio_stream(
+    file: UploadFile = File(...), related_to_id: str = Form(...), call_id: str = Form(...),
+    db: AsyncSession = Depends(get_async_db), current_user: schemas.CurrentUser = Depends(oauth2.get_current_user),
+    recognizer: SpeechRecognizer = Depends(get_recognizer)
+):
+    """
+    Streaming variant of `/speech/transcribe`.
+
+    The upload is fed to the recognizer chunk by chunk and every recognized line is
+    pushed to the client as soon as it is scored, one JSON object per line (NDJSON):
+
+        {"event": "transcription", "data": <SpeechTranscription>}
+        ...
+        {"event": "overall_sentiment", "data": <OverallSentiment>}
+
+    The WAV header is read before the stream starts, so malformed audio still gets a 400.
+    Errors after the stream has started cannot change the status code anymore, so they
+    are reported as a final `{"event": "error", "detail": "..."}` line; so is a `call_id`
+    that is logged already (409 on `/speech/transcribe`), which keeps its first log.
+    """
+    decoder = WavStreamDecoder()
+    try:
+        first_pcm = await read_stream_header(file, decoder)
+    except AudioFormatError as e:
+        logging.warning(f"Rejected audio file {file.filename}: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return StreamingResponse(
+        stream_transcription(file, db, recognizer, decoder, first_pcm, related_to_id, call_id),
+        media_type="application/x-ndjson"
+    )
+
+@router.post("/transcribe/batch", response_model=schemas.BatchTranscriptionResponse)
+async def transcribe_audio_batch(
+    files: List[UploadFile] = File(...), metadata: str = Form(...), db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.CurrentUser = Depends(oauth2.get_current_user), recognizer: SpeechRecognizer = Depends(get_recognizer)
+):
+    """
+    Transcribe many call recordings in one request (e.g. the nightly CRM sync).
+
+    `files` are WAV files and/or zip archives of WAV files. `metadata` is a JSON object
+    mapping each file name (for archive members, their path inside the archive) to its
+    call: `{"call_1.wav": {"related_to_id": "SF1256", "call_id": "1234asas"}, ...}`.
+
+    Up to `batch_concurrency` recordings go through the pipeline at once, then every call
+    log is written with one bulk insert in a single transaction. A file that fails (bad
+    audio, no metadata, new audio for a call that is logged already, ...) gets its own
+    error in the results and does not affect the others; re-sending the audio of a
+    logged call completes with the stored result. Audio that was transcribed before is not run again.
+
+    The whole request counts against `max_upload_bytes`; at most `batch_max_files` files
+    (archive members included) are accepted.
+    """
+    try:
+        calls = batch_metadata.validate_json(metadata)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail=e.errors(include_url=False, include_context=False))
+
+    items: List[BatchItem] = []
+    try:
+        items = await io_executor.run(collect_batch_items, files)
+        results = await run_batch_pipeline(db, recognizer, items, calls)
+
+    except zipfile.BadZipFile as e:
+        logging.warning(f"Rejected batch with an unreadable zip archive: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid zip archive: {e}")
+
+    except UploadTooLarge as e:
+        logging.warning(f"Rejected batch: {e}")
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
+    except ExecutorSaturated as e:
+        logging.warning(f"Rejected batch of {len(items)} files: {e}")
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    except Exception as e:
+        logging.error(f"Error processing batch of {len(items)} files: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    finally:
+        for item in items:
+            if item.extracted:
+                item.file.close()
+
+    completed = sum(r.status == schemas.JobStatus.completed for r in results)
+    logging.info(f"Batch of {len(results)} files: {completed} completed, {len(results) - completed} failed")
+    return ModelResponse(
+        schemas.BatchTranscriptionResponse(completed=completed, failed=len(results) - completed, results=results)
+    )
     
 # ========================= HELPER FUNCTIONS ========================= #
+
+def transcribe_detached(
+    recognizer: SpeechRecognizer, upload: MappedUpload, filename: str
+) -> Awaitable[schemas.TranscriptionResponse]:
+    """
+    The shared run behind `transcriptions_in_flight`: recognition only, every request logs
+    its own call. It outlives the request that started it (a client going away does not
+    cancel it for the others), so it must not use that request's upload: it takes its
+    own handle on the file right away and maps it again, closed when the run is over.
+    """
+    file = dup_upload(upload.file)
+
+    async def run():
+        with file, await io_executor.run(map_upload, file, upload.sha256) as own_upload:
+            return await transcribe_recording(recognizer, own_upload.data, filename)
+    return run()
+
+async def run_transcription_pipeline(
+    db: AsyncSession, recognizer: SpeechRecognizer, audio_bytes: bytes, filename: str, related_to_id: str, call_id: str,
+    audio_sha256: str, transcribe: Optional[Callable[[], Awaitable[schemas.TranscriptionResponse]]] = None
+) -> schemas.TranscriptionResponse:
+    """
+    Recognize, score and persist one recording, returning the API response.
+
+    A `call_id` that is logged with other audio raises `CallAlreadyLogged` before anything
+    runs (and again at the insert, for a log written meanwhile). Audio that was transcribed
+    before (same `audio_sha256`) is answered from the `transcription_results` table without
+    running anything; the call is still logged. `transcribe` replaces the recognition of
+    `audio_bytes` (the endpoint shares it between identical uploads).
+    Every blocking stage runs on a dedicated executor so the event loop stays free.
+    Raises `AudioFormatError` before recognition if the audio cannot be used.
+    """
+    await check_call_not_logged(db, call_id, audio_sha256)
+    stored = await find_transcription_result(db, audio_sha256)
+    if stored is not None:
+        logging.info(f"Audio {audio_sha256[:12]} was already transcribed, returning the stored result")
+        response = stored
+    else:
+        await db.commit()  # Hand the connection back while the recording is transcribed
+        response = await (transcribe() if transcribe is not None else transcribe_recording(recognizer, audio_bytes, filename))
+
+    # Save to database, together with the result for later uploads of the same audio
+    result = models.TranscriptionResult(audio_sha256=audio_sha256, response=response.model_dump_json())
+    saved = await save_transcription_to_db(
+        db, related_to_id, call_id, response.overall_sentiment, response.transcriptions, result
+    )
+    if not saved.inserted and saved.audio_sha256 != audio_sha256:
+        raise CallAlreadyLogged(call_id)  # The stored log describes other audio, this response was never logged
+    logging.info(f"Call sentiment log: {saved.id}" + ("" if saved.inserted else " (retry of the logged audio)"))
+
+    return response
+
+class CallAlreadyLogged(Exception):
+    """Raised when a transcription of new audio is saved under a `call_id` that is logged already."""
+
+    def __init__(self, call_id: str):
+        super().__init__(f"call_id {call_id} is already logged")
+
+async def check_call_not_logged(db: AsyncSession, call_id: str, audio_sha256: str):
+    """Raise `CallAlreadyLogged` if `call_id` is logged from audio other than `audio_sha256`."""
+    logged = await find_logged_audio(db, {call_id})
+    if call_id in logged and logged[call_id] != audio_sha256:
+        raise CallAlreadyLogged(call_id)
+
+async def find_logged_audio(db: AsyncSession, call_ids: Set[str]) -> Dict[str, Optional[str]]:
+    """The `audio_sha256` of the calls among `call_ids` that are logged already, in one query."""
+    if not call_ids:
+        return {}
+    log = models.CallSentimentLog
+    return dict((await db.execute(select(log.call_id, log.audio_sha256).where(log.call_id.in_(call_ids)))).all())
+
+async def transcribe_recording(
+    recognizer: SpeechRecognizer, audio_bytes: bytes, filename: str
+) -> schemas.TranscriptionResponse:
+    """
+    Convert, recognize and score one recording, without touching the database.
+    Raises `AudioFormatError` before recognition if the audio cannot be used.
+    """
+    audio = await audio_executor.run(prepare_audio, audio_bytes, settings.audio_sample_rate)
+    lines = await recognize_speech(recognizer, audio)
+
+    # Generate structured responses
+    scored = await score_segments([line.text for line in lines])
+    speech_transcriptions = [
+        schemas.SpeechTranscription(
+            transcription=line.text,
+            sentiment=segment.sentiment,
+            translated_text=segment.translated_text,
+            start=line.start,
+            end=line.end
+        ) for line, segment in zip(lines, scored)
+    ]
+
+    # Calculate overall sentiment
+    overall_sentiment = calculate_overall_sentiment([t.sentiment for t in speech_transcriptions])
+
+    # Construct response
+    return schemas.TranscriptionResponse(
+        filename=filename,
+        transcriptions=speech_transcriptions,
+        overall_sentiment=overall_sentiment
+    )
+
+class RecognizedLine(NamedTuple):
+    text: str
+    start: float  # Offsets of the speech region the line was recognized in, in seconds
+    end: float
+
+async def recognize_speech(recognizer: SpeechRecognizer, audio: PcmAudio) -> List[RecognizedLine]:
+    """
+    Recognize only the speech regions of a call, at most `recognition_fanout` at a time,
+    and return their lines in time order. Silence is never sent, and long calls stay
+    within the limit of synchronous recognition since regions are capped in length.
+    """
+    if not settings.vad_enabled:
+        lines = await io_executor.run(recognizer.recognize, audio.data, audio.sample_rate)
+        return [RecognizedLine(text, 0.0, audio.duration) for text in lines]
+
+    regions = await audio_executor.run(detect_speech, audio.samples, audio.sample_rate, release=audio.release)
+    fanout = asyncio.Semaphore(settings.recognition_fanout)
+
+    async def recognize_region(region) -> List[RecognizedLine]:
+        async with fanout:
+            lines = await io_executor.run(recognizer.recognize, audio.slice(*region), audio.sample_rate)
+        audio.release(*region)
+        start, end = region.start / audio.sample_rate, region.end / audio.sample_rate
+        return [RecognizedLine(text, start, end) for text in lines]
+
+    results = await asyncio.gather(*(recognize_region(region) for region in regions))
+    logging.info(f"Recognized {len(regions)} speech regions, "
+                 f"{sum(r.seconds(audio.sample_rate) for r in regions):.1f}s of {audio.duration:.1f}s of audio")
+    return [line for lines in results for line in lines]
+
+# ========================= JOB MODE ========================= #
+
+def _job_audio_path(job_id: str) -> str:
+    spool_dir = settings.job_spool_dir or os.path.join(tempfile.gettempdir(), "transcription_jobs")
+    os.makedirs(spool_dir, exist_ok=True)
+    return os.path.join(spool_dir, f"{job_id}.audio")
+
+def enqueue_transcription_job(
+    db: Session, recognizer: SpeechRecognizer, audio_file: BinaryIO, filename: str, related_to_id: str, call_id: str
+) -> models.TranscriptionJob:
+    """Copy the spooled upload to the job spool, record a queued job and hand it to the worker pool."""
+    job = models.TranscriptionJob(
+        id=uuid.uuid4().hex,
+        status=schemas.JobStatus.queued.value,
+        filename=filename,
+        related_to_id=related_to_id,
+        call_id=call_id
+    )
+    audio_path = _job_audio_path(job.id)
+    audio_file.seek(0)
+    with open(audio_path, "wb") as f:
+        shutil.copyfileobj(audio_file, f, UPLOAD_CHUNK_SIZE)
+
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    try:
+        job_pool.submit(job.id, recognizer)
+    except JobQueueFull:
+        db.delete(job)
+        db.commit()
+        os.remove(audio_path)
+        raise
+
+    return job
+
+def process_transcription_job(job_id: str, recognizer: SpeechRecognizer):
+    """Worker entry point: run the pipeline for a queued job and record the outcome."""
+    db = SessionLocal()
+    audio_path = _job_audio_path(job_id)
+    try:
+        job = db.query(models.TranscriptionJob).filter(models.TranscriptionJob.id == job_id).first()
+        job.status = schemas.JobStatus.running.value
+        db.commit()
+
+        try:
+            with open(audio_path, "rb") as f, map_upload(f) as upload:
+                # Job workers are plain threads, so each job drives the async pipeline on its own loop
+                async def run_pipeline():
+                    async with UnpooledAsyncSessionLocal() as async_db:
+                        return await run_transcription_pipeline(
+                            async_db, recognizer, upload.data, job.filename, job.related_to_id, job.call_id, upload.sha256
+                        )
+                response = asyncio.run(run_pipeline())
+            job.status = schemas.JobStatus.completed.value
+            job.result = response.model_dump_json()
+        except Exception as e:
+            logging.error(f"Transcription job {job_id} failed: {e}")
+            db.rollback()
+            job.status = schemas.JobStatus.failed.value
+            job.error = str(e)
+        db.commit()
+    finally:
+        db.close()
+        if os.path.exists(audio_path):
+            os.remove(audio_path)
+
+JOB_LOST_ERROR = "The server restarted before the job ran and its audio is gone, upload the recording again"
+
+def recover_transcription_jobs(recognizer: SpeechRecognizer):
+    """
+    Startup hook: the worker pool's queue only lives in memory, so jobs a previous run of
+    the process left `queued` or `running` would stay that way forever. Those whose audio
+    is still in the job spool are queued again (rerunning the pipeline for a call is safe),
+    the others, or any the queue has no room for, are marked failed.
+    """
+    db = SessionLocal()
+    try:
+        jobs = (db.query(models.TranscriptionJob)
+                .filter(models.TranscriptionJob.status.in_([schemas.JobStatus.queued.value, schemas.JobStatus.running.value]))
+                .order_by(models.TranscriptionJob.created_at)
+                .all())
+        for job in jobs:
+            audio_path = _job_audio_path(job.id)
+            if not os.path.exists(audio_path):
+                job.status, job.error = schemas.JobStatus.failed.value, JOB_LOST_ERROR
+                continue
+            try:
+                job.status = schemas.JobStatus.queued.value
+                db.commit()  # Before a worker can pick it up
+                job_pool.submit(job.id, recognizer)
+            except JobQueueFull as e:
+                job.status, job.error = schemas.JobStatus.failed.value, str(e)
+                os.remove(audio_path)
+        db.commit()
+        if jobs:
+            logging.info(f"Recovered {len(jobs)} unfinished transcription jobs, "
+                         f"{sum(job.status == schemas.JobStatus.queued.value for job in jobs)} queued again")
+    finally:
+        db.close()
+
+def job_to_schema(job: models.TranscriptionJob) -> schemas.TranscriptionJobOut:
+    return schemas.TranscriptionJobOut(
+        id=job.id,
+        status=job.status,
+        filename=job.filename,
+        created_at=job.created_at,
+        result=schemas.TranscriptionResponse.model_validate_json(job.result) if job.result else None,
+        error=job.error
+    )
+
+job_pool = JobWorkerPool(
+    "transcription",
+    handler=process_transcription_job,
+    workers=settings.transcription_workers,
+    queue_size=settings.transcription_queue_size
+)
+
+# ========================= BATCH MODE ========================= #
+
+batch_metadata = TypeAdapter(Dict[str, schemas.CallMetadata])
+
+ZIP_CONTENT_TYPES = {"application/zip", "application/x-zip-compressed"}
+ZIP_EXPANSION_LIMIT = 4  # Archives may extract to this many times `max_upload_bytes`, no more (zip bombs)
+
+class BatchItem(NamedTuple):
+    filename: str
+    file: BinaryIO
+    extracted: bool  # Temporary file holding an archive member, closed by the endpoint
+
+def collect_batch_items(files: List[UploadFile]) -> List[BatchItem]:
+    """
+    Blocking: list the recordings of a batch upload in order, extracting zip archives
+    member by member into temporary files.
+    """
+    items: List[BatchItem] = []
+    budget = settings.max_upload_bytes * ZIP_EXPANSION_LIMIT
+    try:
+        for upload in files:
+            if not _is_zip(upload):
+                items.append(BatchItem(upload.filename, upload.file, extracted=False))
+                continue
+
+            # Opened on the file under the spool: before Python 3.11 `SpooledTemporaryFile` has no
+            # `seekable()`, which `ZipFile` needs
+            with dup_upload(upload.file) as archive_file, zipfile.ZipFile(archive_file) as archive:
+                for member in archive.infolist():
+                    if member.is_dir() or member.filename.startswith("__MACOSX/"):
+                        continue
+                    _check_batch_size(len(items) + 1)
+                    with archive.open(member) as stream:
+                        extracted = spool_stream(stream, budget)
+                    items.append(BatchItem(member.filename, extracted, extracted=True))
+                    budget -= os.fstat(extracted.fileno()).st_size
+    except BaseException:
+        for item in items:
+            if item.extracted:
+                item.file.close()
+        raise
+
+    _check_batch_size(len(items))
+    return items
+
+def _is_zip(upload: UploadFile) -> bool:
+    return upload.content_type in ZIP_CONTENT_TYPES or (upload.filename or "").lower().endswith(".zip")
+
+def _check_batch_size(count: int):
+    if count > settings.batch_max_files:
+        raise UploadTooLarge(f"Batch has more than {settings.batch_max_files} files")
+
+async def run_batch_pipeline(
+    db: AsyncSession, recognizer: SpeechRecognizer, items: List[BatchItem], calls: Dict[str, schemas.CallMetadata]
+) -> List[schemas.BatchItemResult]:
+    """
+    Transcribe every recording of a batch, at most `batch_concurrency` at a time, and log
+    the calls in one bulk insert. Returns one result per item, in order.
+
+    Stored results and calls logged already are looked up for the whole batch in one query
+    each, so a call logged with other audio fails without being transcribed, and a recording
+    that appears several times in the batch is only transcribed once.
+    """
+    results = [
+        schemas.BatchItemResult(filename=item.filename, status=schemas.JobStatus.failed, **calls[item.filename].model_dump())
+        if item.filename in calls else
+        schemas.BatchItemResult(filename=item.filename, status=schemas.JobStatus.failed, error="No metadata for this file")
+        for item in items
+    ]
+    call_counts: Dict[str, int] = {}
+    for result in results:
+        if result.call_id is not None:
+            call_counts[result.call_id] = call_counts.get(result.call_id, 0) + 1
+    for result in results:
+        if result.call_id is not None and call_counts[result.call_id] > 1:
+            result.error = f"call_id {result.call_id} appears more than once in the batch"
+    todo = [i for i, result in enumerate(results) if result.error is None]
+
+    concurrency = asyncio.Semaphore(settings.batch_concurrency)
+
+    async def hash_item(item: BatchItem) -> str:
+        async with concurrency:
+            return (await io_executor.run(hash_file, item.file))[1]
+
+    async def transcribe_item(item: BatchItem, audio_sha256: str) -> schemas.TranscriptionResponse:
+        async with concurrency:
+            with await io_executor.run(map_upload, item.file, audio_sha256) as upload:
+                return await transcribe_recording(recognizer, upload.data, item.filename)
+
+    hashes = dict(zip(todo, await asyncio.gather(*(hash_item(items[i]) for i in todo))))
+    logged = await find_logged_audio(db, {results[i].call_id for i in todo})
+    for i in list(todo):
+        if results[i].call_id in logged and logged[results[i].call_id] != hashes[i]:
+            results[i].error = str(CallAlreadyLogged(results[i].call_id))
+            todo.remove(i)
+    stored = await find_transcription_results(db, {hashes[i] for i in todo})
+
+    runs: Dict[str, asyncio.Future] = {}
+    for i in todo:
+        if hashes[i] not in stored and hashes[i] not in runs:
+            runs[hashes[i]] = asyncio.ensure_future(transcribe_item(items[i], hashes[i]))
+    outcomes = dict(zip(runs, await asyncio.gather(*runs.values(), return_exceptions=True)))
+
+    logs = []
+    for i in todo:
+        outcome = stored.get(hashes[i]) or outcomes[hashes[i]]
+        if isinstance(outcome, BaseException):
+            logging.warning(f"Batch file {items[i].filename} failed: {outcome!r}")
+            results[i].error = str(outcome) or type(outcome).__name__
+            continue
+        results[i].result = outcome
+        logs.append({"related_to_id": results[i].related_to_id, "call_id": results[i].call_id,
+                     "overall_sentiment": outcome.overall_sentiment.overall_sentiment,
+                     "average_score": outcome.overall_sentiment.average_score, "audio_sha256": hashes[i]})
+
+    new_results = {audio_sha256: response.model_dump_json()
+                   for audio_sha256, response in outcomes.items() if not isinstance(response, BaseException)}
+    segments = {results[i].call_id: segment_rows(results[i].call_id, results[i].result.transcriptions)
+                for i in todo if results[i].result is not None}
+    saved = await save_batch_to_db(db, logs, segments, new_results)
+
+    for i in todo:
+        if results[i].result is None:
+            continue
+        log = saved[results[i].call_id]
+        if log.inserted or log.audio_sha256 == hashes[i]:  # A retried batch finds its calls logged already
+            results[i].status = schemas.JobStatus.completed
+        else:
+            results[i].result = None
+            results[i].error = str(CallAlreadyLogged(results[i].call_id))
+    return results
+
+async def find_transcription_results(db: AsyncSession, hashes: Set[str]) -> Dict[str, schemas.TranscriptionResponse]:
+    """Return the stored responses among `hashes`, in one query."""
+    if not hashes:
+        return {}
+    rows = await db.scalars(select(models.TranscriptionResult).where(models.TranscriptionResult.audio_sha256.in_(hashes)))
+    return {row.audio_sha256: schemas.TranscriptionResponse.model_validate_json(row.response) for row in rows}
+
+async def save_batch_to_db(
+    db: AsyncSession, logs: List[dict], segments: Dict[str, List[dict]], results: Dict[str, str]
+) -> Dict[str, Row]:
+    """
+    Bulk insert the call logs, their segments (by call_id) and the transcription results
+    (JSON by audio hash) of a batch in one transaction. Calls that were logged before
+    keep their log and segments, and a result is only stored with a log that was
+    inserted for its audio. Returns every call's log by call_id, as `save_transcription_to_db` does.
+    """
+    saved: Dict[str, Row] = {}
+    if logs:
+        log = models.CallSentimentLog
+        stmt = postgresql.insert(log)
+        stmt = (stmt.on_conflict_do_update(index_elements=["call_id"], set_={"call_id": stmt.excluded.call_id})
+                .returning(log.call_id, log.audio_sha256, literal_column("xmax = 0").label("inserted")))
+        saved = {row.call_id: row for row in await db.execute(stmt, logs)}
+    inserted = [call_id for call_id, row in saved.items() if row.inserted]
+    await insert_call_segments(db, [row for call_id in inserted for row in segments.get(call_id, ())])
+    await rollups.record_call_logs(db, inserted)
+    logged_audio = {saved[call_id].audio_sha256 for call_id in inserted}
+    new_results = [{"audio_sha256": audio_sha256, "response": response}
+                   for audio_sha256, response in results.items() if audio_sha256 in logged_audio]
+    if new_results:
+        await db.execute(postgresql.insert(models.TranscriptionResult).on_conflict_do_nothing(), new_results)
+    await db.commit()
+    return saved
+
+# ========================= LOG QUERIES ========================= #
+
+def query_call_logs(
+    db: Session, related_to_id: Optional[str] = None, sentiment: Optional[str] = None,
+    created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
+    after: Optional[Tuple[datetime, int]] = None, limit: int = 50
+) -> List[models.CallSentimentLog]:
+    """
+    Up to `limit` call logs matching the filters, ordered by `(created_at, id)` descending
+    and starting strictly after the `after` key. Served by the `(related_to_id | overall_sentiment,
+    created_at, id)` indexes.
+    """
+    log = models.CallSentimentLog
+    query = db.query(log)
+    if related_to_id is not None:
+        query = query.filter(log.related_to_id == related_to_id)
+    if sentiment is not None:
+        query = query.filter(log.overall_sentiment == sentiment)
+    if created_after is not None:
+        query = query.filter(log.created_at >= created_after)
+    if created_before is not None:
+        query = query.filter(log.created_at < created_before)
+    if after is not None:
+        query = query.filter(tuple_(log.created_at, log.id) < tuple_(*after))
+    return query.order_by(log.created_at.desc(), log.id.desc()).limit(limit).all()
+
+def encode_log_cursor(log: models.CallSentimentLog) -> str:
+    """Opaque cursor for the page after `log`."""
+    return base64.urlsafe_b64encode(f"{log.created_at.isoformat()}|{log.id}".encode()).decode()
+
+def decode_log_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of `encode_log_cursor`; raises `ValueError` for anything it did not produce."""
+    created_at, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")  # All errors are `ValueError`s
+    return datetime.fromisoformat(created_at), int(id)
+
+# ========================= ANALYSIS HELPERS ========================= #
     
-def analyze_sentiment(text: str):
-    """Analyze sentiment of text using TextBlob."""
+async def analyze_sentiments(texts: List[str]) -> List[schemas.SentimentAnalysis]:
+    """
+    Analyze sentiment of every segment of a call with the configured `SentimentEngine`.
+
+    A segment that cannot be translated or scored is scored neutral on its own.
+    """
+    return await sentiment_engine.analyze(texts)
+
+async def analyze_sentiment(text: str) -> schemas.SentimentAnalysis:
+    """Analyze sentiment of a single segment."""
+    return (await analyze_sentiments([text]))[0]
+
+async def score_segments(texts: List[str]) -> List[ScoredSegment]:
+    """Like `analyze_sentiments`, also returning the English text each segment was scored on."""
+    return await sentiment_engine.score(texts)
+
+async def read_stream_header(file: UploadFile, decoder: WavStreamDecoder) -> bytes:
+    """Read the upload until `decoder` knows the audio format, returning the first samples."""
+    while decoder.format is None:
+        chunk = await file.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            raise AudioFormatError("WAV file has no data chunk")
+        pcm = decoder.feed(chunk)
+    return pcm
+
+async def stream_transcription(
+    file: UploadFile, db: AsyncSession, recognizer: SpeechRecognizer, decoder: WavStreamDecoder, first_pcm: bytes,
+    related_to_id: str, call_id: str
+) -> AsyncIterator[str]:
+    """
+    Bridge the async upload and the blocking streaming recognizer.
+
+    The recognizer runs in a worker thread and pulls chunks from `audio_chunks`, while
+    this coroutine decodes the rest of the upload into that queue and yields NDJSON lines
+    for every transcript the recognizer pushes back through `results`.
+    """
+    loop = asyncio.get_running_loop()
+    audio_chunks: queue.Queue = queue.Queue()
+    results: asyncio.Queue = asyncio.Queue()
+    end_of_stream = object()
+
+    def chunk_iterator() -> Iterator[bytes]:
+        while (chunk := audio_chunks.get()) is not None:
+            yield chunk
+
+    def run_recognizer():
+        try:
+            for text in recognizer.streaming_recognize(chunk_iterator(), decoder.format.sample_rate):
+                loop.call_soon_threadsafe(results.put_nowait, text)
+        except Exception as e:
+            loop.call_soon_threadsafe(results.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(results.put_nowait, end_of_stream)
+
+    def put_pcm(pcm: bytes):
+        # Decoding 8-bit audio doubles its size, keep every request under Google's limit
+        for start in range(0, len(pcm), STREAM_CHUNK_SIZE):
+            audio_chunks.put_nowait(pcm[start:start + STREAM_CHUNK_SIZE])
+
+    async def feed_upload():
+        try:
+            put_pcm(first_pcm)
+            while chunk := await file.read(STREAM_CHUNK_SIZE):
+                put_pcm(decoder.feed(chunk))
+        finally:
+            audio_chunks.put_nowait(None)  # Tell the recognizer the upload is complete
+
+    async def recognize_in_background():
+        try:
+            await io_executor.run(run_recognizer)
+        except ExecutorSaturated as e:  # The recognizer never started, so report for it
+            results.put_nowait(e)
+            results.put_nowait(end_of_stream)
+
+    feeder = asyncio.create_task(feed_upload())
+    recognition = asyncio.create_task(recognize_in_background())
+
+    transcriptions: List[schemas.SpeechTranscription] = []
     try:
-        translated_text = translator.translate(text, src="id", dest="en").text  # Translate to English
-        blob = TextBlob(translated_text)
-        sentiment_score = blob.sentiment.polarity  # Score from -1 (negative) to +1 (positive)
+        while (item := await results.get()) is not end_of_stream:
+            if isinstance(item, Exception):
+                raise item
+
+            segment, = await score_segments([item])
+            transcription = schemas.SpeechTranscription(
+                transcription=item,
+                sentiment=segment.sentiment,
+                translated_text=segment.translated_text
+            )
+            transcriptions.append(transcription)
+            yield _ndjson_event("transcription", transcription)
+
+        overall_sentiment = calculate_overall_sentiment([t.sentiment for t in transcriptions])
+
+        saved = await save_transcription_to_db(db, related_to_id, call_id, overall_sentiment, transcriptions)
+        if not saved.inserted:
+            raise CallAlreadyLogged(call_id)
+
+        yield _ndjson_event("overall_sentiment", overall_sentiment)
 
-        sentiment = "positive" if sentiment_score > 0 else "negative" if sentiment_score < 0 else "neutral"
-        return schemas.SentimentAnalysis(sentiment=sentiment, score=sentiment_score)
     except Exception as e:
-        logging.error(f"Sentiment analysis error: {e}")
-        return schemas.SentimentAnalysis(sentiment="neutral", score=0.0)
-
-def transcribe_audio_from_bytes(audio_bytes: bytes) -> List[str]:
-    """Transcribe speech from an audio file using Google Speech-to-Text API."""
-    client = speech.SpeechClient()
-
-    audio = speech.RecognitionAudio(content=audio_bytes)
-    config = speech.RecognitionConfig(
-        encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-        sample_rate_hertz=16000,
-        language_code="id-ID"  # Bahasa Indonesia
-    )
+        logging.error(f"Error streaming file {file.filename}: {e}")
+        yield schemas.StreamError(detail=str(e)).model_dump_json() + "\n"
 
-    response = client.recognize(config=config, audio=audio)
-    logging.info(f"Speech-to-Text response: {response}")
+    finally:
+        feeder.cancel()
+        audio_chunks.put_nowait(None)  # Unblock the recognizer if we stopped early
+        await asyncio.gather(feeder, recognition, return_exceptions=True)
 
-    return [result.alternatives[0].transcript for result in response.results]
+def _ndjson_event(event: str, data) -> str:
+    return schemas.StreamEvent(event=event, data=data).model_dump_json() + "\n"
 
 def calculate_overall_sentiment(sentiments: List[schemas.SentimentAnalysis]) -> schemas.OverallSentiment:
     total_score = sum(s.score for s in sentiments)
     avg_score = total_score / len(sentiments) if sentiments else 0  # Avoid division by zero
 
-    overall_sentiment = "positive" if avg_score > 0 else "negative" if avg_score < 0 else "neutral"
+    overall_sentiment = sentiment_scoring.sentiment_label(avg_score)
     
     return schemas.OverallSentiment(overall_sentiment=overall_sentiment, average_score=avg_score)
 
-def save_transcription_to_db(
-    db: Session, related_to_id: str, call_id: str, overall_sentiment: str
+async def find_transcription_result(db: AsyncSession, audio_sha256: str) -> Optional[schemas.TranscriptionResponse]:
+    """Return the stored response for previously transcribed audio, if any."""
+    result = await db.get(models.TranscriptionResult, audio_sha256)
+    return schemas.TranscriptionResponse.model_validate_json(result.response) if result else None
+
+async def save_transcription_to_db(
+    db: AsyncSession, related_to_id: str, call_id: str, overall_sentiment: schemas.OverallSentiment,
+    transcriptions: List[schemas.SpeechTranscription] = (), result: Optional[models.TranscriptionResult] = None
 ):
     """
-    Saves transcription sentiment results to the database.
+    Saves transcription sentiment results and every transcribed segment to the database,
+    and the full result if given, keyed by its audio (same transaction, so a stored result
+    always has its call log).
+
+    The log is written with one `INSERT ... ON CONFLICT (call_id) DO UPDATE ... RETURNING`
+    round trip. A call that is already logged (a retry, or a concurrent request for the
+    same call) keeps its first log, segments and rollup, and the result is not stored.
+    Returns the log's `id`, `created_at` and `audio_sha256`, and whether this call
+    `inserted` it: callers compare `audio_sha256` to tell a retry from other audio.
     """
-    new_log = models.CallSentimentLog(
+    log = models.CallSentimentLog
+    stmt = postgresql.insert(log).values(
         related_to_id=related_to_id,
         call_id=call_id,
-        overall_sentiment=overall_sentiment
+        overall_sentiment=overall_sentiment.overall_sentiment,
+        average_score=overall_sentiment.average_score,
+        audio_sha256=result.audio_sha256 if result is not None else None
     )
-    
-    db.add(new_log)
-    db.commit()
-    db.refresh(new_log)
-    return new_log
\ No newline at end of file
+    # A no-op update rather than DO NOTHING: the existing row is locked and returned
+    stmt = stmt.on_conflict_do_update(index_elements=["call_id"], set_={"call_id": stmt.excluded.call_id})
+    saved = (await db.execute(stmt.returning(
+        log.id, log.created_at, log.audio_sha256, literal_column("xmax = 0").label("inserted")
+    ))).one()
+
+    if saved.inserted:
+        await insert_call_segments(db, segment_rows(call_id, transcriptions))
+        await rollups.record_call_logs(db, [call_id])
+    if saved.inserted and result is not None:
+        await db.execute(postgresql.insert(models.TranscriptionResult)
+                         .values(audio_sha256=result.audio_sha256, response=result.response)
+                         .on_conflict_do_nothing())
+    await db.commit()
+    return saved
+
+def segment_rows(call_id: str, transcriptions: List[schemas.SpeechTranscription]) -> List[dict]:
+    """`call_segments` rows for the transcribed lines of a call."""
+    return [
+        {"call_id": call_id, "segment_index": index, "start_seconds": t.start, "end_seconds": t.end,
+         "text": t.transcription, "translated_text": t.translated_text,
+         "score": t.sentiment.score, "sentiment": t.sentiment.sentiment}
+        for index, t in enumerate(transcriptions)
+    ]
+
+SEGMENT_COLUMNS = ("call_id", "segment_index", "start_seconds", "end_seconds", "text", "translated_text", "score", "sentiment")
+
+async def insert_call_segments(db: AsyncSession, rows: List[dict]):
+    """
+    Write segment rows in the current transaction with a single binary `COPY ... FROM STDIN`:
+    one round trip per call whatever its length, and about half the server time of
+    multi-row INSERTs (see benchmarks/bench_segment_insert.py).
+
+    The COPY goes straight through the asyncpg connection, so the session must already
+    have run a statement in this transaction (the call log insert does).
+    """
+    if not rows:
+        return
+    connection = await (await db.connection()).get_raw_connection()
+    await connection.driver_connection.copy_records_to_table(
+        "call_segments", columns=SEGMENT_COLUMNS, records=[tuple(row[c] for c in SEGMENT_COLUMNS) for row in rows]
+    )
\ No newline at end of file
@@ -1,7 +1,16 @@
-from fastapi import status, HTTPException, Depends, APIRouter  
-from sqlalchemy.orm import Session
-from .. import models, schemas, utils
-from ..database import get_db
+import asyncio
+import logging
+from typing import Any, Dict, List, Tuple
+from fastapi import status, HTTPException, Depends, APIRouter, Request
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import Row
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models, replicas, schemas, utils
+from ..config import settings
+from ..database import get_async_db, get_async_read_db
+from ..responses import ModelResponse
+from ..executors import ExecutorSaturated, hash_executor
 
 router = APIRouter(
     prefix="/users",
@@ -11,24 +20,134 @@ router = APIRouter(
 """-------------------- User Creation section --------------------"""
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=schemas.UserOut)
-async def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)) -> dict:
-    # hash the password from user.password
-    hashed_password = utils.hash(user.password)
-    user.password = hashed_password
+async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)) -> dict:
+    try:
+        # hash the password from user.password (bcrypt is CPU-bound, keep it off the event loop)
+        hashed_password = await hash_executor.run(utils.hash, user.password)
+        user.password = hashed_password
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
 
-    print(user)
+    return await save_user(db, user)
+
+async def save_user(db: AsyncSession, user: schemas.UserCreate) -> models.User:
     new_user = models.User(
        **user.model_dump() # ** as the operator to unpack the dictionary in ordered manner
     )
     db.add(new_user) # add to the db
-    db.commit() # commit the changes
-    db.refresh(new_user) # return the committed changes back to the Var
+    await db.commit() # commit the changes
+    await db.refresh(new_user) # return the committed changes back to the Var
 
     return new_user
 
+"""-------------------- Bulk provisioning section --------------------"""
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+INSERT_CHUNK_ROWS = 1000  # Rows per INSERT statement, all in one transaction
+
+bulk_records = TypeAdapter(List[Any])
+bulk_users = TypeAdapter(List[schemas.UserCreate])
+
+@router.post("/bulk", response_model=schemas.BulkUserResponse)
+async def create_users(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create many users at once, e.g. a whole call-centre team.
+
+    The body is a JSON list of `UserCreate` records, or one record per line with
+    `Content-Type: application/x-ndjson`. Passwords are hashed in parallel on every
+    hashing process, then all users are inserted in one transaction; an email that is
+    already registered is reported as a `conflict` and does not fail the others.
+
+    At most `bulk_users_max` records are accepted; any invalid record rejects the
+    whole request with 422 before anything is hashed.
+    """
+    users = await read_bulk_users(request)
+
+    try:
+        # One chunk of passwords per hashing process, bcrypt dominates the request
+        size = -(-len(users) // hash_executor.max_workers) or 1
+        chunks = [[user.password for user in users[i:i + size]] for i in range(0, len(users), size)]
+        hashed_chunks = await asyncio.gather(*(hash_executor.run(utils.hash_many, chunk) for chunk in chunks))
+        hashed = [password for chunk in hashed_chunks for password in chunk]
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    created = await save_users(db, [(user.email, password) for user, password in zip(users, hashed)])
+
+    results = []
+    for user in users:
+        row = created.pop(user.email, None)  # A repeated email is created once, then conflicts
+        if row is None:
+            results.append(schemas.BulkUserResult(email=user.email, status="conflict"))
+        else:
+            results.append(schemas.BulkUserResult(email=user.email, status="created", id=row.id, created_at=row.created_at))
+    n_created = sum(result.status == "created" for result in results)
+    logging.info(f"Bulk provisioned {n_created} users, {len(results) - n_created} conflicts")
+
+    return ModelResponse(schemas.BulkUserResponse(created=n_created, conflicts=len(results) - n_created, results=results))
+
+async def read_bulk_users(request: Request) -> List[schemas.UserCreate]:
+    """
+    Parse the body as NDJSON (streamed line by line) or as a JSON list, 422 on invalid records.
+    413 as soon as there are more than `bulk_users_max` records, before the rest is validated
+    (or, for NDJSON, even read).
+    """
+    try:
+        if request.headers.get("content-type", "").split(";")[0].strip() != NDJSON_MEDIA_TYPE:
+            records = bulk_records.validate_json(await request.body())
+            check_bulk_size(len(records))
+            return bulk_users.validate_python(records)
+
+        users, line_no, pending = [], 0, b""
+        async for chunk in request.stream():
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                line_no += 1
+                if line.strip():
+                    check_bulk_size(len(users) + 1)
+                    users.append(parse_ndjson_line(line, line_no))
+        if pending.strip():
+            check_bulk_size(len(users) + 1)
+            users.append(parse_ndjson_line(pending, line_no + 1))
+        return users
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail=e.errors(include_url=False, include_context=False))
+
+def check_bulk_size(count: int):
+    if count > settings.bulk_users_max:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"At most {settings.bulk_users_max} users per request")
+
+def parse_ndjson_line(line: bytes, line_no: int) -> schemas.UserCreate:
+    try:
+        return schemas.UserCreate.model_validate_json(line)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail=[{**error, "loc": ["line", line_no, *error["loc"]]}
+                                    for error in e.errors(include_url=False, include_context=False)])
+
+async def save_users(db: AsyncSession, users: List[Tuple[str, str]]) -> Dict[str, Row]:
+    """
+    Insert `(email, hashed password)` pairs with multi-row `INSERT ... ON CONFLICT (email)
+    DO NOTHING RETURNING`, in one transaction; returns the created rows by email.
+    """
+    created = {}
+    for i in range(0, len(users), INSERT_CHUNK_ROWS):
+        stmt = (
+            postgresql.insert(models.User)
+            .values([{"email": email, "password": password} for email, password in users[i:i + INSERT_CHUNK_ROWS]])
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(models.User.id, models.User.email, models.User.created_at)
+        )
+        created.update((row.email, row) for row in await db.execute(stmt))
+    await db.commit()
+    replicas.mark_written(*(("users", row.id) for row in created.values()))
+    return created
+
 @router.get("/{id}", response_model=schemas.UserOut)
-def get_user(id: int, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.id == id).first()
+async def get_user(id: int, db: AsyncSession = Depends(get_async_read_db)):
+    user = await replicas.read(db, lambda db: db.get(models.User, id), key=("users", id))
 
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, 
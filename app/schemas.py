@@ -1,7 +1,8 @@
 import logging
 from pydantic import BaseModel, EmailStr, Field, ValidationError
-from datetime import datetime
-from typing import Annotated, List, Optional
+from datetime import date, datetime
+from enum import Enum
+from typing import Annotated, List, Literal, Optional, Union
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -31,6 +32,17 @@ class UserCreate(BaseModel):
 
     def log_data(self):
         logger.info(f"User Registration - Email: {self.email}")
+
+class BulkUserResult(BaseModel):
+    email: EmailStr
+    status: Literal["created", "conflict"]  # `conflict`: the email is already registered (or repeated in the request)
+    id: Optional[int] = None  # Set if created
+    created_at: Optional[datetime] = None
+
+class BulkUserResponse(BaseModel):
+    created: int
+    conflicts: int
+    results: List[BulkUserResult]  # One entry per record, in request order
         
 class UserLogin(BaseModel):
     email: EmailStr
@@ -39,9 +51,23 @@ class UserLogin(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None  # Exchanged at POST /token/refresh for a new access token
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
     
 class TokenData(BaseModel):
     id: Optional[str] = None  # ID might be missing if token is invalid
+    exp: Optional[int] = None  # Expiration as a UNIX timestamp
+
+class CurrentUser(BaseModel):
+    id: int
+    email: Optional[EmailStr] = None  # Unset in claims-only mode, the database is not queried
+    created_at: Optional[datetime] = None
+
+    class Config:
+        """Enable ORM compatibility."""
+        from_attributes = True
       
 class SentimentAnalysis(BaseModel):
     sentiment: str = Field(..., example="positive")  # Can be positive, negative, or neutral
@@ -50,6 +76,9 @@ class SentimentAnalysis(BaseModel):
 class SpeechTranscription(BaseModel):
     transcription: str = Field(..., example="Halo selamat sore")  # The transcribed text
     sentiment: SentimentAnalysis  # Link transcription with sentiment
+    translated_text: Optional[str] = Field(None, example="Good afternoon")  # English text that was scored, if translated
+    start: Optional[float] = Field(None, example=0.42)  # Offsets of the speech region in seconds, unset when streamed
+    end: Optional[float] = Field(None, example=3.6)
 
 class OverallSentiment(BaseModel):
     overall_sentiment: str = Field(..., example="positive")  # Overall sentiment classification
@@ -58,4 +87,72 @@ class OverallSentiment(BaseModel):
 class TranscriptionResponse(BaseModel):
     filename: str = Field(..., example="test.wav")  # Name of the uploaded file
     transcriptions: List[SpeechTranscription]  # List of transcribed lines with sentiment
-    overall_sentiment: OverallSentiment  # Aggregated sentiment of the call
\ No newline at end of file
+    overall_sentiment: OverallSentiment  # Aggregated sentiment of the call
+
+class StreamEvent(BaseModel):
+    event: str = Field(..., example="transcription")  # "transcription" or "overall_sentiment"
+    data: Union[SpeechTranscription, OverallSentiment]  # Payload matching the event type
+
+class StreamError(BaseModel):
+    event: str = "error"
+    detail: str  # Reason the stream was aborted
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+class TranscriptionJobOut(BaseModel):
+    id: str = Field(..., example="3f1c9a3e0c7d4f0f9b0e6f8d2a1b4c5d")  # Job ID to poll
+    status: JobStatus
+    filename: str
+    created_at: datetime
+    result: Optional[TranscriptionResponse] = None  # Set once the job completed
+    error: Optional[str] = None  # Set if the job failed
+
+class CallMetadata(BaseModel):
+    related_to_id: str = Field(..., example="SF1256")  # Salesforce record the call belongs to
+    call_id: str = Field(..., example="1234asas")  # Unique ID of the call
+
+class BatchItemResult(BaseModel):
+    filename: str  # Uploaded file, or member name inside an uploaded zip archive
+    related_to_id: Optional[str] = None  # From the batch metadata, unset if the file had none
+    call_id: Optional[str] = None
+    status: JobStatus  # `completed` or `failed`
+    result: Optional[TranscriptionResponse] = None  # Set if the file was transcribed
+    error: Optional[str] = None  # Set if the file failed, the other files are not affected
+
+class BatchTranscriptionResponse(BaseModel):
+    completed: int
+    failed: int
+    results: List[BatchItemResult]  # One entry per file, in upload order
+
+class CallSentimentLogOut(BaseModel):
+    id: int
+    related_to_id: str
+    call_id: str
+    overall_sentiment: str
+    average_score: Optional[float] = None  # Unset for calls logged before segments were stored
+    created_at: datetime
+
+    class Config:
+        """Enable ORM compatibility."""
+        from_attributes = True
+
+class CallSentimentLogPage(BaseModel):
+    items: List[CallSentimentLogOut]  # Newest first
+    next_cursor: Optional[str] = None  # Pass as `cursor` to get the next page, unset on the last page
+
+class SentimentTrendBucket(BaseModel):
+    start: date  # First day of the bucket (UTC), or the range's start when it begins mid-week/month
+    calls: int
+    positive: int
+    negative: int
+    neutral: int
+    average_score: Optional[float] = None  # Mean of the calls' average scores, unset if none had one
+
+class SentimentTrend(BaseModel):
+    related_to_id: str
+    granularity: str  # "day", "week" or "month"
+    buckets: List[SentimentTrendBucket]  # Oldest first, buckets without calls are left out
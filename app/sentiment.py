@@ -0,0 +1,180 @@
+import re
+from typing import List, Optional, Sequence
+
+import numpy as np
+from textblob import TextBlob
+from textblob.en import sentiment as textblob_lexicon
+
+from . import lexicon_id
+
+"""
+📌 Sentiment scoring
+
+Pure, CPU-bound functions with no app state, so they can run inside the
+process pool (`executors.cpu_executor`) as well as inline.
+
+✅ `polarity`: TextBlob, one string at a time.
+✅ `batch_polarity`: `BatchPolarityScorer`, every segment of one or many calls in
+   a single pass of NumPy array operations over TextBlob's own lexicon.
+✅ `batch_polarity_id`: the same scorer over the Indonesian lexicon in `lexicon_id.py`,
+   for scoring untranslated transcripts offline.
+"""
+
+def polarity(text: str) -> float:
+    """Score English text from -1 (negative) to +1 (positive) using TextBlob."""
+    return TextBlob(text).sentiment.polarity
+
+def sentiment_label(score: float) -> str:
+    return "positive" if score > 0 else "negative" if score < 0 else "neutral"
+
+
+_TOKEN = re.compile(r"\w+(?:-\w+)*|[^\w\s]")
+_NEGATIONS = ("no", "not", "n't", "never")
+_BOOSTERS = {"!": 1.25}
+
+
+class BatchPolarityScorer:
+    """
+    🔹 Vectorized re-implementation of TextBlob's pattern analyzer.
+
+    The lexicon is compiled once into arrays (polarity, intensity, is-modifier,
+    is-negation) indexed by word id. Scoring a batch then only needs one Python pass
+    to tokenise and look up ids; TextBlob's rules are applied to all tokens at once:
+
+    - a known word scores its lexicon polarity;
+    - a known word after a modifier ("very good") merges into the modifier's
+      assessment and is scaled by the modifier's intensity;
+    - a negation before a word ("not good") turns the assessment into -0.5 x polarity;
+    - each booster after a word ("!", x1.25) scales the preceding assessment;
+    - a segment's polarity is the mean over its assessments.
+
+    Unknown words of one character keep both the modifier and the negation in effect,
+    two-character ones only the modifier ("very ok good"), exactly as in TextBlob.
+    Emoticons and the "(!)" irony marker are not scored.
+
+    Any lexicon in TextBlob's format (`{word: {pos: (polarity, subjectivity, intensity)}}`,
+    modifiers tagged "RB") can be compiled, with its own negations and boosters.
+    """
+
+    UNKNOWN = 0  # Unknown word of three characters or more
+    SMALL = 1  # Unknown word of two characters
+
+    def __init__(self, lexicon=textblob_lexicon, negations=_NEGATIONS, boosters=_BOOSTERS):
+        if isinstance(lexicon, type(textblob_lexicon)) and dict.__len__(lexicon) == 0:
+            lexicon.load()
+
+        words = [word for word in lexicon if " " not in word]
+        extra = [word for word in (*negations, *boosters) if word not in lexicon]
+        self.vocab = {word: i for i, word in enumerate(words + extra, start=2)}
+
+        size = len(self.vocab) + 2
+        self.polarity = np.zeros(size)
+        self.intensity = np.ones(size)
+        self.known = np.zeros(size, dtype=bool)
+        self.modifier = np.zeros(size, dtype=bool)
+        self.adverb = np.zeros(size, dtype=bool)  # Modifier ending in -ly, may absorb a following negation
+        self.negation = np.zeros(size, dtype=bool)
+        self.booster = np.ones(size)
+        for word in words:
+            i = self.vocab[word]
+            p, _, intensity = lexicon[word][None]
+            self.polarity[i] = p
+            self.intensity[i] = intensity
+            self.known[i] = True
+            self.modifier[i] = "RB" in lexicon[word]
+            self.adverb[i] = self.modifier[i] and word.endswith("ly")
+        for word in negations:
+            self.negation[self.vocab[word]] = True
+        for word, factor in boosters.items():
+            self.booster[self.vocab[word]] = factor
+
+    def _token_ids(self, texts: Sequence[str]):
+        ids: List[int] = []
+        segments: List[int] = []
+        for n, text in enumerate(texts):
+            for token in _TOKEN.findall(text.lower()):
+                i = self.vocab.get(token)
+                if i is None:
+                    if len(token.strip("'")) <= 1:
+                        continue  # Transparent to every rule, as in TextBlob
+                    i = self.SMALL if len(token) == 2 else self.UNKNOWN
+                ids.append(i)
+                segments.append(n)
+        return np.array(ids, dtype=np.intp), np.array(segments, dtype=np.intp)
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """Return the polarity (-1 to +1) of every text, in order."""
+        ids, segments = self._token_ids(texts)
+        if not len(ids):
+            return np.zeros(len(texts))
+
+        positions = np.arange(len(ids))
+
+        def last_before(mask):
+            """Index of the closest earlier token of the same segment where `mask` holds, else -1."""
+            last = np.maximum.accumulate(np.where(mask, positions, -1))
+            found = np.concatenate(([-1], last[:-1]))
+            found[segments[found] != segments] = -1
+            return found
+
+        def at(values, index):
+            """`values[index]`, False/0 where index is -1."""
+            return np.where(index >= 0, values[index], np.zeros(1, dtype=values.dtype))
+
+        known = self.known[ids]
+        booster = self.booster[ids]
+        boosting = booster != 1.0  # Boosters never break a modifier or negation, like "!" in TextBlob
+        negation = self.negation[ids] & ~known
+
+        # "really not good": a negation right after an -ly modifier negates that modifier instead
+        context = last_before(~boosting & (ids != self.SMALL))
+        absorbed = negation & at(self.adverb[ids], context)
+
+        # Modifiers reach across boosters, two-letter words and absorbed negations
+        modifier_index = last_before(~boosting & (ids != self.SMALL) & ~absorbed)
+        modified = known & at(known & self.modifier[ids], modifier_index)
+
+        # Negations only reach across boosters
+        negated = known & at(negation & ~absorbed, last_before(~boosting))
+        intensity = np.where(negated, 1.0 / self.intensity[ids], self.intensity[ids])
+
+        polarity = self.polarity[ids]
+        value = np.where(modified, np.clip(polarity * at(intensity, modifier_index), -1.0, 1.0), polarity)
+
+        # A modifier and the words it modifies form one assessment, scored by its last word
+        chain = np.maximum(np.cumsum(known & ~modified) - 1, 0)
+        chain_negated = np.bincount(chain[known], weights=negated[known], minlength=chain[-1] + 1) > 0
+        chain_negated[chain[context[absorbed]]] = True
+        merged = np.zeros(len(ids), dtype=bool)
+        merged[modifier_index[modified]] = True
+        assessed = known & ~merged
+
+        # Each booster scales the assessment of the latest known word before it
+        boosts = np.ones(len(ids))
+        boosted = last_before(known)[boosting]
+        np.multiply.at(boosts, boosted[boosted >= 0], booster[boosting][boosted >= 0])
+        value = np.clip(value * boosts, -1.0, 1.0)
+
+        value = np.where(chain_negated[chain], value * -0.5, value)
+
+        totals = np.bincount(segments[assessed], weights=value[assessed], minlength=len(texts))
+        counts = np.bincount(segments[assessed], minlength=len(texts))
+        return totals / np.maximum(counts, 1)
+
+
+_batch_scorer: Optional[BatchPolarityScorer] = None
+_batch_scorer_id: Optional[BatchPolarityScorer] = None
+
+def batch_polarity(texts: Sequence[str]) -> List[float]:
+    """Score many English texts at once with the vectorized scorer."""
+    global _batch_scorer
+    if _batch_scorer is None:  # Built once per process, on first use
+        _batch_scorer = BatchPolarityScorer()
+    return _batch_scorer.score(texts).tolist()
+
+def batch_polarity_id(texts: Sequence[str]) -> List[float]:
+    """Score many Indonesian texts at once, without translating them."""
+    global _batch_scorer_id
+    if _batch_scorer_id is None:
+        _batch_scorer_id = BatchPolarityScorer(lexicon_id.LEXICON, lexicon_id.NEGATIONS, lexicon_id.BOOSTERS)
+    return _batch_scorer_id.score([lexicon_id.join_phrases(text) for text in texts]).tolist()
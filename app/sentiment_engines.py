@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from typing import List, NamedTuple, Optional
+
+from . import schemas
+from . import sentiment as sentiment_scoring
+from .executors import ExecutorSaturated, cpu_executor
+from .translation import TranslationCache, translate_segments
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+"""
+📌 Sentiment engines
+
+`analyze_sentiments` in the speech router delegates to one `SentimentEngine`,
+chosen with the `sentiment_engine` setting:
+
+✅ "translate": `TranslationSentimentEngine`, translates id -> en and scores with
+   TextBlob (per segment, or vectorized when `sentiment_scorer` = "vectorized").
+✅ "indonesian": `IndonesianSentimentEngine`, scores the Indonesian transcript directly
+   with a local lexicon; no network round trip, works fully offline.
+"""
+
+
+class ScoredSegment(NamedTuple):
+    translated_text: Optional[str]  # English text that was scored, None if not translated
+    sentiment: schemas.SentimentAnalysis
+
+
+def _neutral() -> schemas.SentimentAnalysis:
+    return schemas.SentimentAnalysis(sentiment="neutral", score=0.0)
+
+
+def _analysis(score: float) -> schemas.SentimentAnalysis:
+    return schemas.SentimentAnalysis(sentiment=sentiment_scoring.sentiment_label(score), score=score)
+
+
+class SentimentEngine:
+    """
+    🔹 Base class for sentiment engines.
+
+    `score` rates every segment of a call; a segment that cannot be scored comes back
+    neutral without affecting the others. `ExecutorSaturated` is the only error raised.
+    """
+
+    name = ""
+
+    async def score(self, texts: List[str]) -> List[ScoredSegment]:
+        raise NotImplementedError
+
+    async def analyze(self, texts: List[str]) -> List[schemas.SentimentAnalysis]:
+        return [segment.sentiment for segment in await self.score(texts)]
+
+
+class TranslationSentimentEngine(SentimentEngine):
+    """
+    🔹 Translates segments to English (cached, deduplicated and batched), then scores them.
+    """
+
+    name = "translate"
+
+    def __init__(self, translator, cache: Optional[TranslationCache] = None, scorer: str = "textblob"):
+        self.translator = translator
+        self.cache = cache
+        self.scorer = scorer
+
+    async def score(self, texts: List[str]) -> List[ScoredSegment]:
+        translations = await translate_segments(self.translator, texts, src="id", dest="en", cache=self.cache)
+        if self.scorer == "vectorized":
+            sentiments = await self._score_batch(translations)
+        else:
+            sentiments = await asyncio.gather(*(self._score_one(text) for text in translations))
+        return [ScoredSegment(text, sentiment) for text, sentiment in zip(translations, sentiments)]
+
+    async def _score_batch(self, translations: List[Optional[str]]) -> List[schemas.SentimentAnalysis]:
+        """Score every translated segment in one call to the vectorized scorer."""
+        translated = [text for text in translations if text is not None]
+        try:
+            scores = iter(await cpu_executor.run(sentiment_scoring.batch_polarity, translated))
+        except ExecutorSaturated:
+            raise
+        except Exception as e:
+            logger.error(f"Batch sentiment scoring error, scoring segments one by one: {e}")
+            return await asyncio.gather(*(self._score_one(text) for text in translations))
+
+        return [_analysis(next(scores)) if text is not None else _neutral() for text in translations]
+
+    async def _score_one(self, translated_text: Optional[str]) -> schemas.SentimentAnalysis:
+        if translated_text is None:
+            return _neutral()
+        try:
+            # Score from -1 (negative) to +1 (positive)
+            return _analysis(await cpu_executor.run(sentiment_scoring.polarity, translated_text))
+        except ExecutorSaturated:
+            raise
+        except Exception as e:
+            logger.error(f"Sentiment analysis error: {e}")
+            return _neutral()
+
+
+class IndonesianSentimentEngine(SentimentEngine):
+    """
+    🔹 Scores Indonesian segments directly with the lexicon in `lexicon_id.py`.
+    """
+
+    name = "indonesian"
+
+    async def score(self, texts: List[str]) -> List[ScoredSegment]:
+        try:
+            scores = await cpu_executor.run(sentiment_scoring.batch_polarity_id, texts)
+        except ExecutorSaturated:
+            raise
+        except Exception as e:
+            logger.error(f"Indonesian sentiment scoring error: {e}")
+            return [ScoredSegment(None, _neutral()) for _ in texts]
+
+        return [ScoredSegment(None, _analysis(score)) for score in scores]
+
+
+def create_sentiment_engine(
+    name: str, translator=None, cache: Optional[TranslationCache] = None, scorer: str = "textblob"
+) -> SentimentEngine:
+    if name == IndonesianSentimentEngine.name:
+        return IndonesianSentimentEngine()
+    return TranslationSentimentEngine(translator, cache, scorer)
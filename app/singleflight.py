@@ -0,0 +1,42 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+"""
+📌 Single-flight coalescing
+
+When several requests need the result of the same expensive operation at the same
+time (e.g. a client retrying an upload that is still being transcribed), only the
+first one runs it; the others wait for that run and get the same result or error.
+
+🔹 Scope is one event loop in one process; results are not kept once the run is over,
+   so callers persist them (e.g. the `transcription_results` table) for later requests.
+"""
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    🔹 Runs at most one `fn()` per key at a time and shares its outcome with every caller.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.runs = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._in_flight.get(key)
+        if future is None:
+            self.runs += 1
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # A caller that goes away (client disconnect) must not cancel the run for the others
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._in_flight), "runs": self.runs, "coalesced": self.coalesced}
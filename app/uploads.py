@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from typing import BinaryIO, Optional, Tuple, Union
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+"""
+📌 Memory-bounded uploads
+
+Call recordings can be hundreds of megabytes; holding each one in memory (and copying
+it again for Google) lets a few concurrent uploads exhaust a dyno's memory quota.
+
+✅ `MaxUploadSizeMiddleware`: rejects oversized uploads with 413, straight from
+   `Content-Length` before the body is read, and again while the body streams in
+   (chunked uploads, or a `Content-Length` that lies).
+✅ `map_upload`: Starlette already spools uploads to a temporary file; this moves the
+   file to disk if it is still in memory, hashes it and maps it read-only with `mmap`.
+   The pipeline reads samples straight from the page cache and releases pages once it
+   is done with them (see `audio.PcmAudio.release`).
+   The SHA-256 is not computed while the body streams in: Starlette's multipart parser
+   does the spooling, so `hash_file` makes a second sequential pass over the spooled
+   file in fixed-size chunks (mostly from the page cache the spooling just filled).
+✅ `spool_stream`: copies content that is not an upload yet (zip archive members) to a
+   temporary file in chunks, with a size limit.
+"""
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """Raised when spooled content exceeds its size limit."""
+
+
+class MaxUploadSizeMiddleware:
+    """
+    🔹 Pure ASGI middleware limiting request bodies under `prefix` to `max_bytes`.
+    """
+
+    def __init__(self, app, max_bytes: int, prefix: str = "/"):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+
+    def _too_large(self) -> str:
+        return f"Upload exceeds the maximum size of {self.max_bytes} bytes"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            return await self.app(scope, receive, send)
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            logger.warning(f"Rejected {scope['path']} upload of {int(content_length)} bytes")
+            response = JSONResponse({"detail": self._too_large()}, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised while the endpoint parses the form, answered by FastAPI's exception handling
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=self._too_large())
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class MappedUpload:
+    """
+    🔹 A spooled upload mapped into memory: `data` (an `mmap`, or `b""` when empty), its
+    `size` and `sha256`. Use it as a context manager, or call `close`.
+    """
+
+    def __init__(self, file: BinaryIO, data: Union[mmap.mmap, bytes], size: int, sha256: str):
+        self.file = file
+        self.data = data
+        self.size = size
+        self.sha256 = sha256
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                pass  # A view of the audio is still alive somewhere, the mapping goes with it
+
+    def __enter__(self) -> "MappedUpload":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def hash_file(file: BinaryIO) -> Tuple[int, str]:
+    """Blocking: size and SHA-256 (hex) of `file`, read in fixed-size chunks."""
+    file.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := file.read(UPLOAD_CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+    return size, digest.hexdigest()
+
+
+def dup_upload(file: BinaryIO) -> BinaryIO:
+    """
+    A second handle on the (already spooled to disk) `file`, with its own file descriptor:
+    it stays readable after `file` is closed, until the new handle is closed in turn.
+    """
+    return os.fdopen(os.dup(file.fileno()), "rb")
+
+
+def map_upload(file: BinaryIO, sha256: Optional[str] = None) -> MappedUpload:
+    """
+    Blocking: make sure `file` is on disk, hash it in one extra pass over the file
+    (unless `sha256` is already known) and map it read-only.
+    Accepts Starlette's `SpooledTemporaryFile` as well as any regular file opened in binary mode.
+    """
+    rollover = getattr(file, "rollover", None)
+    if rollover is not None:
+        rollover()
+
+    if sha256 is None:
+        size, sha256 = hash_file(file)
+    else:
+        size = os.fstat(file.fileno()).st_size
+
+    data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+    return MappedUpload(file, data, size, sha256)
+
+
+def spool_stream(stream: BinaryIO, limit: int) -> BinaryIO:
+    """
+    Blocking: copy `stream` (e.g. a zip archive member) into a temporary file, in chunks.
+    Raises `UploadTooLarge` past `limit` bytes, whatever size the stream claims to have.
+    """
+    spooled = tempfile.TemporaryFile()
+    size = 0
+    try:
+        while chunk := stream.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                raise UploadTooLarge(f"File exceeds the maximum size of {limit} bytes")
+            spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled
@@ -1,17 +1,25 @@
+from typing import List, Optional, Tuple
+
 from passlib.context import CryptContext
 
+from .config import settings
+
 """
 PassLib is a great Python package to handle password hashes.
 
 It supports many secure hashing algorithms and utilities to work with them.
 
-The recommended algorithm is "Bcrypt".
+The recommended algorithm is "Bcrypt". Its cost comes from `settings.bcrypt_rounds`;
+these functions are CPU-bound, call them through `executors.hash_executor`.
 """
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 
 def hash(password: str):
     return pwd_context.hash(password)
 
+def hash_many(passwords: List[str]) -> List[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
 """
 verifying what user input against the registered hashed password.
 
@@ -20,3 +28,11 @@ therefore verify is used to compare the two params if they are a match!
 """
 def verify(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
+
+"""
+verify, and when the stored hash was made with another cost (passlib's `needs_update`),
+also return a new hash of the password to store in its place.
+"""
+def verify_and_update(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
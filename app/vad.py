@@ -0,0 +1,112 @@
+from typing import Callable, List, NamedTuple, Optional
+
+import numpy as np
+
+"""
+📌 Voice activity detection
+
+Splits a call into the regions that contain speech, so silence is never sent to
+Google (it is billed like speech) and each region can be recognized on its own,
+concurrently, and within the 1-minute limit of synchronous `recognize`.
+
+✅ Energy-based: the signal is cut into 30 ms frames and a frame is speech when its
+   RMS level is well above the call's noise floor (a low percentile of all frames).
+   Music on hold is loud too and is kept; only silence and line noise are dropped.
+✅ Short pauses inside a sentence do not split it, short clicks are dropped, and each
+   region is padded so word onsets and endings are not clipped.
+✅ Regions longer than `max_region_seconds` are cut at their quietest frame.
+
+🔹 Works on mono int16 samples as produced by `audio.prepare_audio`, entirely in NumPy,
+   reading them block by block so a long call never needs a full-length float copy.
+"""
+
+FRAME_MS = 30
+SPEECH_MARGIN_DB = 12.0  # How far above the noise floor a frame must be to count as speech
+SPEECH_RANGE_DB = 25.0  # Quiet syllables are this far below loud ones, even in calls with no pauses
+MIN_SPEECH_DBFS = -50.0  # Frames quieter than this are never speech, however quiet the call is
+NOISE_PERCENTILE = 10
+MIN_SILENCE_MS = 800  # Shorter pauses (between words, breaths) stay inside the region
+MIN_SPEECH_MS = 150  # Shorter bursts are treated as noise
+PADDING_MS = 200
+MAX_REGION_SECONDS = 50.0  # Synchronous recognize rejects audio longer than 60 s
+
+
+class Region(NamedTuple):
+    start: int  # First sample
+    end: int  # One past the last sample
+
+    def seconds(self, sample_rate: int) -> float:
+        return (self.end - self.start) / sample_rate
+
+
+LEVEL_BLOCK = 1 << 20  # Samples converted to float at a time
+
+
+def frame_levels(
+    samples: np.ndarray, frame: int, release: Optional[Callable[[int, int], None]] = None
+) -> np.ndarray:
+    """RMS level of every complete frame, in dB relative to full scale.
+
+    `release(start, end)` is called for every block of samples once it has been read.
+    """
+    count = len(samples) // frame
+    rms = np.empty(count, dtype=np.float32)
+    block = max(LEVEL_BLOCK // frame, 1)
+    for start in range(0, count, block):
+        end = min(start + block, count)
+        frames = samples[start * frame:end * frame].reshape(-1, frame).astype(np.float32)
+        rms[start:end] = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame)
+        if release is not None:
+            release(start * frame, end * frame)
+    return 20 * np.log10(np.maximum(rms, 1.0) / 32768.0)
+
+
+def _runs(mask: np.ndarray) -> np.ndarray:
+    """(start, end) frame indices of every run of True values."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+    return edges.reshape(-1, 2)
+
+
+def detect_speech(
+    samples: np.ndarray, sample_rate: int, max_region_seconds: float = MAX_REGION_SECONDS,
+    release: Optional[Callable[[int, int], None]] = None
+) -> List[Region]:
+    """Return the speech regions of mono int16 `samples`, in time order (see `frame_levels` for `release`)."""
+    frame = sample_rate * FRAME_MS // 1000
+    if len(samples) < frame:
+        return []
+
+    levels = frame_levels(samples, frame, release)
+    noise_floor, loud = np.percentile(levels, [NOISE_PERCENTILE, 95])
+    threshold = max(min(noise_floor + SPEECH_MARGIN_DB, loud - SPEECH_RANGE_DB), MIN_SPEECH_DBFS)
+    speech = levels > threshold
+
+    # Close pauses shorter than MIN_SILENCE_MS, then drop bursts shorter than MIN_SPEECH_MS
+    for start, end in _runs(~speech):
+        if start > 0 and end < len(speech) and end - start < MIN_SILENCE_MS // FRAME_MS:
+            speech[start:end] = True
+    runs = [(s, e) for s, e in _runs(speech) if e - s >= -(-MIN_SPEECH_MS // FRAME_MS)]
+
+    padding = PADDING_MS // FRAME_MS
+    max_frames = int(max_region_seconds * 1000 // FRAME_MS)
+    regions: List[Region] = []
+    for start, end in runs:
+        start, end = max(start - padding, 0), min(end + padding, len(levels))
+        if regions and start * frame <= regions[-1].end:  # Padding made two regions touch
+            start = regions.pop().start // frame
+        for s, e in _split(levels, start, end, max_frames):
+            regions.append(Region(int(s) * frame, min(int(e) * frame, len(samples))))
+    if regions and regions[-1].end == len(levels) * frame:
+        regions[-1] = Region(regions[-1].start, len(samples))  # Keep the partial last frame
+    return regions
+
+
+def _split(levels: np.ndarray, start: int, end: int, max_frames: int):
+    """Cut [start, end) at its quietest frames until every piece fits in `max_frames`."""
+    while end - start > max_frames:
+        # Look for the cut in the second half of the allowed length, so pieces stay long
+        low, high = start + max_frames // 2, start + max_frames
+        cut = low + int(np.argmin(levels[low:high]))
+        yield start, cut
+        start = cut
+    yield start, end
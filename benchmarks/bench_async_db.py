@@ -0,0 +1,100 @@
+"""
+Benchmark: requests per second of a database-bound endpoint, sync vs async sessions.
+
+Creates a user in the app database, then sends `--requests` lookups of it, `--concurrency`
+at a time, straight through the ASGI app (no sockets), to three versions of `GET /users/{id}`:
+
+- sync: a plain `def` endpoint with `get_db`, run on Starlette's threadpool (before);
+- io_executor: an `async def` endpoint running the sync query on `io_executor`;
+- async: the app's endpoint, `AsyncSession` from `get_async_db` (asyncpg).
+
+`--concurrency` defaults to the engines' pool limit (5 + 10 overflow): beyond it the
+sync endpoint's threads all wait for a connection while the teardowns that would return
+one wait for a thread, until the pool times out.
+
+The user is deleted at the end.
+
+Run from the repository root (the app settings must be available in the environment):
+    python -m benchmarks.bench_async_db [--requests 5000] [--concurrency 15]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.database import SessionLocal, async_engine, get_db
+from app.executors import io_executor, shutdown_executors
+from app.routers import user as user_router
+
+app = FastAPI()
+app.include_router(user_router.router)
+
+
+def find_user(db: Session, id: int):
+    return db.query(models.User).filter(models.User.id == id).first()
+
+
+@app.get("/sync/users/{id}", response_model=schemas.UserOut)
+def get_user_sync(id: int, db: Session = Depends(get_db)):
+    return find_user(db, id)
+
+
+@app.get("/io/users/{id}", response_model=schemas.UserOut)
+async def get_user_io_executor(id: int, db: Session = Depends(get_db)):
+    return await io_executor.run(find_user, db, id)
+
+
+async def throughput(path: str, requests: int, concurrency: int) -> float:
+    pending = iter(range(concurrency))
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        async def worker():
+            for _ in pending:
+                response = await client.get(path)
+                assert response.status_code == 200, response.text
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))  # Open the pooled connections
+        pending = iter(range(requests))
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+async def run(paths, requests: int, concurrency: int):
+    rates = [(name, await throughput(path, requests, concurrency)) for name, path in paths]
+    await async_engine.dispose()
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=15)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user = models.User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", password="not-a-real-hash")
+    db.add(user)
+    db.commit()
+
+    paths = (("sync", f"/sync/users/{user.id}"), ("io_executor", f"/io/users/{user.id}"), ("async", f"/users/{user.id}"))
+    try:
+        print(f"{args.requests} requests, {args.concurrency} concurrent\n")
+        print(f"{'session':>12} | {'req/s':>8} | {'speedup':>7}")
+        rates = asyncio.run(run(paths, args.requests, args.concurrency))
+        for name, rate in rates:
+            print(f"{name:>12} | {rate:>8.0f} | {rate / rates[0][1]:>6.1f}x")
+    finally:
+        shutdown_executors()
+        db.delete(user)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: provisioning users through `POST /users/bulk` vs one `POST /users/` each.
+
+Sends `--users` new users straight through the ASGI app (no sockets), first one request
+per user, `--concurrency` at a time, then as a single bulk request (JSON list), and
+reports the time and users per second of each. Both paths hash with the bcrypt cost
+from the settings (`BCRYPT_ROUNDS`), which dominates at the default cost: lower it to
+compare the per-request overhead. The users are deleted at the end.
+
+Run from the repository root (the app settings must be available in the environment):
+    python -m benchmarks.bench_bulk_users [--users 10000] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.executors import shutdown_executors
+from app.main import app
+
+
+async def single(records, concurrency: int) -> float:
+    pending = iter(records)
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        async def worker():
+            for record in pending:
+                response = await client.post("/users/", json=record)
+                assert response.status_code == 201, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+
+async def bulk(records) -> float:
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        response = await client.post("/users/bulk", json=records)
+        assert response.status_code == 200 and response.json()["created"] == len(records), response.text
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    records = lambda path: [{"email": f"{prefix}-{path}-{i}@example.com", "password": f"password-{i}"}
+                            for i in range(args.users)]
+    try:
+        print(f"{args.users} users, bcrypt cost {settings.bcrypt_rounds}, "
+              f"{settings.hash_executor_workers} hashing processes\n")
+        print(f"{'path':>16} | {'seconds':>8} | {'users/s':>8}")
+        for name, run in (
+            (f"single (x{args.concurrency})", lambda: single(records("single"), args.concurrency)),
+            ("bulk", lambda: bulk(records("bulk"))),
+        ):
+            seconds = asyncio.run(run())
+            print(f"{name:>16} | {seconds:>8.2f} | {args.users / seconds:>8.0f}")
+    finally:
+        shutdown_executors()
+        with SessionLocal() as db:
+            db.execute(delete(models.User).where(models.User.email.startswith(prefix)))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: OFFSET vs keyset pagination of `GET /speech/logs` on a million call logs.
+
+Seeds `call_sentiment_logs` with `--rows` rows (10 Salesforce records, three labels,
+one call per second) inside a transaction that is rolled back at the end, then
+reads pages of 50 at increasing depths, unfiltered and filtered by `related_to_id`
+and by sentiment, and reports the median query latency of each:
+
+- OFFSET: `ORDER BY created_at DESC, id DESC LIMIT 50 OFFSET depth * 50`;
+- keyset: `speech.query_call_logs` starting after the last row of the previous page.
+
+Needs the app database with its migrations applied (the indexes come from them).
+
+Run from the repository root (the app settings must be available in the environment):
+    python -m benchmarks.bench_log_pagination [--rows 1000000] [--repeats 5]
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import engine
+from app.routers import speech
+
+PAGE = 50
+DEPTHS = (1, 10, 100, 1000, 5000, 10000)
+FILTERS = {"none": {}, "related_to_id": {"related_to_id": "SF7"}, "sentiment": {"sentiment": "negative"}}
+
+SEED = """
+INSERT INTO call_sentiment_logs (related_to_id, call_id, overall_sentiment, average_score, created_at)
+SELECT 'SF' || (g % 10), 'bench-' || g, (ARRAY['positive', 'negative', 'neutral'])[g % 3 + 1], 0,
+       now() - g * interval '1 second'
+FROM generate_series(1, :rows) AS g
+"""
+
+
+def offset_page(db: Session, depth: int, related_to_id=None, sentiment=None):
+    log = models.CallSentimentLog
+    query = db.query(log)
+    if related_to_id is not None:
+        query = query.filter(log.related_to_id == related_to_id)
+    if sentiment is not None:
+        query = query.filter(log.overall_sentiment == sentiment)
+    return query.order_by(log.created_at.desc(), log.id.desc()).offset(depth * PAGE).limit(PAGE).all()
+
+
+def timed(fn, repeats: int) -> float:
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection)
+        try:
+            start = time.perf_counter()
+            connection.execute(text(SEED), {"rows": args.rows})
+            connection.execute(text("ANALYZE call_sentiment_logs"))
+            print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s\n")
+
+            print(f"{'filter':>13} {'page':>6} | {'OFFSET (ms)':>11} | {'keyset (ms)':>11}")
+            for name, filters in FILTERS.items():
+                for depth in DEPTHS:
+                    previous = offset_page(db, depth - 1, **filters)
+                    if len(previous) < PAGE:
+                        break  # Fewer matching rows than this depth
+                    last = previous[-1]
+                    expected = offset_page(db, depth, **filters)
+                    after = (last.created_at, last.id)
+                    assert speech.query_call_logs(db, **filters, after=after, limit=PAGE) == expected
+
+                    offset_ms = timed(lambda: offset_page(db, depth, **filters), args.repeats)
+                    keyset_ms = timed(lambda: speech.query_call_logs(db, **filters, after=after, limit=PAGE), args.repeats)
+                    print(f"{name:>13} {depth + 1:>6} | {offset_ms:>11.2f} | {keyset_ms:>11.2f}")
+        finally:
+            db.close()
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: logins per second per core.
+
+Creates a user in the app database (password hashed with `settings.bcrypt_rounds`),
+then sends `--logins` requests to `POST /login`, `--concurrency` at a time, straight
+through the ASGI app (no sockets), once per hash pool size from 1 process up to the
+machine's cores. Reports logins per second, and per second per hashing process.
+
+The user is deleted at the end.
+
+Run from the repository root (the app settings must be available in the environment):
+    python -m benchmarks.bench_login_hashing [--logins 200] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+import httpx
+
+from app import models, utils
+from app.config import settings
+from app.database import SessionLocal
+from app.executors import BoundedExecutor, _process_pool
+from app.main import app
+from app.routers import auth
+
+PASSWORD = "password123"
+
+
+async def throughput(email: str, logins: int, concurrency: int) -> float:
+    form = {"username": email, "password": PASSWORD}
+    pending = iter(range(concurrency))
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        async def worker():
+            for _ in pending:
+                response = await client.post("/login", data=form)
+                assert response.status_code == 200, response.text
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))  # Start the hashing processes
+        pending = iter(range(logins))
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return logins / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user = models.User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", password=utils.hash(PASSWORD))
+    db.add(user)
+    db.commit()
+
+    try:
+        print(f"bcrypt cost {settings.bcrypt_rounds}, {args.logins} logins, {args.concurrency} concurrent\n")
+        print(f"{'processes':>9} | {'logins/s':>8} | {'per process':>11}")
+        for workers in range(1, (os.cpu_count() or 1) + 1):
+            auth.hash_executor = BoundedExecutor("hash", _process_pool, workers, args.concurrency)
+            try:
+                rate = asyncio.run(throughput(user.email, args.logins, args.concurrency))
+            finally:
+                auth.hash_executor.shutdown()
+            print(f"{workers:>9} | {rate:>8.1f} | {rate / workers:>11.1f}")
+    finally:
+        db.delete(user)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: serializing a 500-segment `TranscriptionResponse`, before and after.
+
+Reports the median time to turn the response of a long call into the HTTP body:
+
+- before: the INFO log's `model_dump_json()`, then FastAPI's `serialize_response`
+  (model -> dict of plain values) and `JSONResponse` (standard `json` module);
+- orjson default: `serialize_response` and `ORJSONResponse`, no log;
+- after: `responses.ModelResponse` returned by the endpoint, rendered by pydantic-core.
+
+Run from the repository root:
+    python -m benchmarks.bench_response_serialization [--segments 500] [--repeats 200]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app import schemas
+from app.responses import ModelResponse
+
+
+def transcription_response(segments: int) -> schemas.TranscriptionResponse:
+    return schemas.TranscriptionResponse(
+        filename="call.wav",
+        transcriptions=[
+            schemas.SpeechTranscription(
+                transcription=f"halo selamat sore, saya ingin menanyakan tagihan bulan ini nomor {i}",
+                translated_text=f"good afternoon, I would like to ask about this month's bill number {i}",
+                sentiment=schemas.SentimentAnalysis(sentiment="neutral", score=0.0125 * (i % 7)),
+                start=i * 3.2, end=i * 3.2 + 2.9
+            ) for i in range(segments)
+        ],
+        overall_sentiment=schemas.OverallSentiment(overall_sentiment="positive", average_score=0.0375)
+    )
+
+
+def timed(fn, repeats: int) -> float:
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--segments", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    response = transcription_response(args.segments)
+    field = create_response_field("Response_transcribe", schemas.TranscriptionResponse, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def fastapi_content():
+        return loop.run_until_complete(serialize_response(field=field, response_content=response))
+
+    def before():
+        response.model_dump_json()  # logging.info(f"API Response: {response.model_dump_json()}")
+        return JSONResponse(fastapi_content()).body
+
+    def orjson_default():
+        return ORJSONResponse(fastapi_content()).body
+
+    def after():
+        return ModelResponse(response).body
+
+    assert orjson_default() == after(), "ModelResponse must produce the same body as FastAPI"
+
+    print(f"{args.segments} segments, {len(after()) / 1024:.0f} KiB body\n")
+    baseline = timed(before, args.repeats)
+    print(f"{'path':>32} | {'median (ms)':>11} | {'speedup':>7}")
+    for name, fn in (("before (log + json)", before), ("orjson default", orjson_default), ("after (ModelResponse)", after)):
+        latency = timed(fn, args.repeats)
+        print(f"{name:>32} | {latency:>11.2f} | {baseline / latency:>6.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
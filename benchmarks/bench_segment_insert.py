@@ -0,0 +1,116 @@
+"""
+Benchmark: writing the segments of one call, ORM `add` vs multi-row INSERT vs COPY.
+
+For calls of 10, 100 and 1000 segments, each write path logs the call and its
+segments in one transaction (as `save_transcription_to_db` does) and reports the
+median latency and the statements sent to PostgreSQL:
+
+- ORM add: one `CallSegment` object per segment, `db.add_all` + commit;
+- multi-row INSERT: a Core `insert()` executed with every row (batched into multi-row VALUES);
+- COPY: `speech.insert_call_segments`, binary `COPY call_segments FROM STDIN` on the session's
+  asyncpg connection.
+
+All paths run on the app's async engine, as the endpoints do.
+
+`--rtt` adds a simulated network round trip to every statement, as against a managed
+database in another host (0 measures the local server only).
+
+Needs the app database with its migrations applied; rows are written under
+`bench-` call ids and deleted afterwards.
+
+Run from the repository root (the app settings must be available in the environment):
+    python -m benchmarks.bench_segment_insert [--rtt 0.001] [--repeats 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import delete, event, insert
+
+from app import models, schemas
+from app.database import AsyncSessionLocal, async_engine
+from app.routers import speech
+
+SIZES = (10, 100, 1000)
+
+
+def transcriptions(count: int):
+    return [
+        schemas.SpeechTranscription(
+            transcription=f"halo selamat sore, ini baris nomor {i} dari panggilan",
+            translated_text=f"hello good afternoon, this is line number {i} of the call",
+            sentiment=schemas.SentimentAnalysis(sentiment="positive", score=0.25),
+            start=i * 3.0, end=i * 3.0 + 2.5
+        ) for i in range(count)
+    ]
+
+
+async def orm_add(db, rows):
+    db.add_all([models.CallSegment(**row) for row in rows])
+
+
+async def multi_row_insert(db, rows):
+    await db.execute(insert(models.CallSegment), rows)
+
+
+async def copy(db, rows):
+    await speech.insert_call_segments(db, rows)
+
+
+async def write_call(db, call_id: str, count: int, write_segments):
+    lines = transcriptions(count)
+    overall = speech.calculate_overall_sentiment([t.sentiment for t in lines])
+    db.add(models.CallSentimentLog(related_to_id="SF1256", call_id=call_id, overall_sentiment=overall.overall_sentiment,
+                                   average_score=overall.average_score))
+    await db.flush()
+    await write_segments(db, speech.segment_rows(call_id, lines))
+    await db.commit()
+
+
+async def run(args):
+    statements = 0
+
+    def round_trip(*_):
+        nonlocal statements
+        statements += 1
+        time.sleep(args.rtt)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", round_trip)
+    paths = {"ORM add": orm_add, "multi-row INSERT": multi_row_insert, "COPY": copy}
+
+    print(f"simulated round trip: {args.rtt * 1000:.1f} ms\n")
+    print(f"{'segments':>8} | " + " | ".join(f"{name + ': ms, statements':>33}" for name in paths))
+    db = AsyncSessionLocal()
+    try:
+        for count in SIZES:
+            cells = []
+            for name, write_segments in paths.items():
+                latencies = []
+                for n in range(args.repeats):
+                    statements = 0
+                    start = time.perf_counter()
+                    if write_segments is copy:
+                        round_trip()  # COPY bypasses SQLAlchemy's cursor events, count it by hand
+                    await write_call(db, f"bench-{name}-{count}-{n}", count, write_segments)
+                    latencies.append(time.perf_counter() - start)
+                cells.append(f"{statistics.median(latencies) * 1000:>20.1f} {statements:>7}")
+            print(f"{count:>8} | " + " | ".join(f"{cell:>33}" for cell in cells))
+    finally:
+        await db.rollback()
+        await db.execute(delete(models.CallSentimentLog).where(models.CallSentimentLog.call_id.like("bench-%")))
+        await db.commit()
+        await db.close()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt", type=float, default=0.001, help="simulated round trip per statement, in seconds")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
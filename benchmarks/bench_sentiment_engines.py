@@ -0,0 +1,76 @@
+"""
+Benchmark: translate + TextBlob engine vs the offline Indonesian engine.
+
+Transcribes `test.wav` with Google Speech-to-Text (credentials required), or reads
+one transcript line per row from `--transcript`, then scores the call with both
+engines. Reports per-call latency and how often the two engines agree on the label,
+per segment and for the call overall. The translate engine needs network access;
+its translation cache is disabled so every call pays the real round trip.
+
+Run from the repository root (the app settings must be available in the environment):
+    python -m benchmarks.bench_sentiment_engines [--transcript lines.txt] [--calls 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+from googletrans import Translator
+
+from app.audio import prepare_audio
+from app.recognizers import GoogleSpeechRecognizer
+from app.routers.speech import calculate_overall_sentiment
+from app.sentiment_engines import IndonesianSentimentEngine, TranslationSentimentEngine
+
+TEST_WAV = Path(__file__).resolve().parent.parent / "test.wav"
+
+
+async def timed_calls(engine, transcript, calls):
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        sentiments = await engine.analyze(transcript)
+        latencies.append(time.perf_counter() - start)
+    return sentiments, latencies
+
+
+async def run(transcript, calls):
+    engines = [TranslationSentimentEngine(Translator()), IndonesianSentimentEngine()]
+    await engines[1].analyze(["pemanasan"])  # Spawn the scoring process before timing
+
+    results = {}
+    for engine in engines:
+        results[engine.name] = await timed_calls(engine, transcript, calls)
+
+    print(f"{'engine':>10} | {'median (s)':>10} | {'max (s)':>8} | overall")
+    for name, (sentiments, latencies) in results.items():
+        overall = calculate_overall_sentiment(sentiments)
+        print(f"{name:>10} | {statistics.median(latencies):>10.3f} | {max(latencies):>8.3f} | "
+              f"{overall.overall_sentiment} ({overall.average_score:+.3f})")
+
+    translate, indonesian = results["translate"][0], results["indonesian"][0]
+    agreement = sum(a.sentiment == b.sentiment for a, b in zip(translate, indonesian)) / max(len(transcript), 1)
+    print(f"\nsegment label agreement: {agreement:.0%} over {len(transcript)} segments")
+    for text, a, b in zip(transcript, translate, indonesian):
+        marker = " " if a.sentiment == b.sentiment else "*"
+        print(f" {marker} {a.sentiment:>8} {b.sentiment:>8}  {text}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transcript", type=Path, help="file with one transcript segment per line")
+    parser.add_argument("--calls", type=int, default=5, help="times each engine scores the call")
+    args = parser.parse_args()
+
+    if args.transcript:
+        transcript = [line.strip() for line in args.transcript.read_text().splitlines() if line.strip()]
+    else:
+        audio = prepare_audio(TEST_WAV.read_bytes(), 16000)
+        transcript = GoogleSpeechRecognizer().recognize(audio.data, audio.sample_rate)
+
+    asyncio.run(run(transcript, args.calls))
+
+
+if __name__ == "__main__":
+    main()
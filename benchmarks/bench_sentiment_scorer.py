@@ -0,0 +1,48 @@
+"""
+Benchmark: per-segment TextBlob vs the vectorized batch scorer, in segments per second.
+
+Scores the same English segments both ways, for batches the size of one call up to
+many calls scored together, and reports the largest difference between the two.
+
+Run from the repository root (the app settings must be available in the environment):
+    python -m benchmarks.bench_sentiment_scorer
+"""
+import time
+
+import numpy as np
+
+from app.sentiment import BatchPolarityScorer, polarity
+
+SEGMENTS = [
+    "Hello good afternoon", "Thank you very much", "Is there anything I can help you with?",
+    "I am not happy with the service", "My order has not arrived yet", "Sorry for the inconvenience",
+    "The product is very good!", "This is really bad", "I want a refund, this is terrible",
+    "Okay sir, please wait a moment", "The delivery was fast and the packaging was nice",
+    "I am very disappointed", "Not bad at all", "It's not a good experience", "Great, thanks!",
+]
+
+
+def main():
+    scorer = BatchPolarityScorer()  # Lexicon compilation is a one-off cost per process
+    polarity("warm up")
+
+    print(f"{'segments':>8} | {'textblob seg/s':>14} | {'vectorized seg/s':>16} | {'speed-up':>8} | {'max diff':>8}")
+    for size in (40, 1_000, 10_000):
+        texts = [SEGMENTS[i % len(SEGMENTS)] for i in range(size)]
+
+        start = time.perf_counter()
+        expected = np.array([polarity(text) for text in texts])
+        textblob_rate = size / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        scores = scorer.score(texts)
+        vectorized_rate = size / (time.perf_counter() - start)
+
+        print(
+            f"{size:>8} | {textblob_rate:>14,.0f} | {vectorized_rate:>16,.0f} | "
+            f"{vectorized_rate / textblob_rate:>7.1f}x | {np.abs(scores - expected).max():>8.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
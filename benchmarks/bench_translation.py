@@ -0,0 +1,86 @@
+"""
+Benchmark: per-segment vs batched translation of a call transcript.
+
+Simulates the translation endpoint with a fixed round-trip time, so the numbers
+show how round trips and latency scale with the number of segments. Pass
+`--live` to hit the real googletrans endpoint instead (network required).
+
+Run from the repository root (the app settings must be available in the environment):
+    python -m benchmarks.bench_translation [--rtt 0.15] [--live]
+"""
+import argparse
+import asyncio
+import time
+
+from app.translation import translate_segments
+
+PHRASES = [
+    "halo selamat sore", "terima kasih", "ada yang bisa saya bantu", "baik pak",
+    "mohon ditunggu sebentar", "saya kurang puas dengan layanannya", "pesanan saya belum sampai",
+    "maaf atas ketidaknyamanannya", "apakah ada lagi", "sampai jumpa",
+]
+
+
+class SimulatedTranslation:
+    def __init__(self, text):
+        self.text = text
+
+
+class SimulatedTranslator:
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def translate(self, text, src, dest):
+        self.round_trips += 1
+        time.sleep(self.rtt)
+        return SimulatedTranslation(text)
+
+
+class CountingTranslator:
+    def __init__(self):
+        from googletrans import Translator
+        self.translator = Translator()
+        self.round_trips = 0
+
+    def translate(self, text, src, dest):
+        self.round_trips += 1
+        return self.translator.translate(text, src=src, dest=dest)
+
+
+def transcript(segments: int):
+    # Realistic mix: a handful of distinct phrases repeated throughout the call
+    return [PHRASES[i % len(PHRASES)] if i % 3 else f"{PHRASES[i % len(PHRASES)]} nomor {i}" for i in range(segments)]
+
+
+def per_segment(translator, texts):
+    return [translator.translate(text, src="id", dest="en").text for text in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt", type=float, default=0.15, help="simulated round-trip time in seconds")
+    parser.add_argument("--live", action="store_true", help="use the real translation endpoint")
+    args = parser.parse_args()
+
+    make_translator = CountingTranslator if args.live else lambda: SimulatedTranslator(args.rtt)
+
+    print(f"{'segments':>8} | {'per-segment RT':>14} {'latency (s)':>11} | {'batched RT':>10} {'latency (s)':>11}")
+    for segments in (1, 10, 40, 100, 400):
+        texts = transcript(segments)
+
+        translator = make_translator()
+        start = time.perf_counter()
+        per_segment(translator, texts)
+        sequential = (translator.round_trips, time.perf_counter() - start)
+
+        translator = make_translator()
+        start = time.perf_counter()
+        asyncio.run(translate_segments(translator, texts))
+        batched = (translator.round_trips, time.perf_counter() - start)
+
+        print(f"{segments:>8} | {sequential[0]:>14} {sequential[1]:>11.3f} | {batched[0]:>10} {batched[1]:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
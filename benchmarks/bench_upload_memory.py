@@ -0,0 +1,96 @@
+"""
+Benchmark: peak RSS of audio ingest against upload size, in memory vs spooled + mmap.
+
+For recordings from 5 minutes to an hour (16 kHz mono, passed through, and 44.1 kHz
+stereo, converted), a fresh process runs the ingest path of `/speech/transcribe`
+(load, convert, VAD, recognize every region with a recognizer that copies its audio
+like the Google client does) and reports how much its peak RSS grew:
+
+- in memory: the upload is read into `bytes`, as `await file.read()` did;
+- mmap: the spooled upload is mapped with `uploads.map_upload`.
+
+Run from the repository root (the app settings must be available in the environment):
+    python -m benchmarks.bench_upload_memory
+"""
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+TEST_WAV = Path(__file__).resolve().parent.parent / "test.wav"
+MINUTES = (5, 15, 30, 60)
+LAYOUTS = {"16 kHz mono": (16000, 1), "44.1 kHz stereo": (44100, 2)}
+
+
+def write_call(path: str, minutes: int, sample_rate: int, channels: int):
+    """test.wav resampled to `sample_rate`, repeated with pauses until `minutes` long, written block by block."""
+    from app.audio import prepare_audio
+    from tests.test_audio import make_wav
+
+    speech = prepare_audio(TEST_WAV.read_bytes(), sample_rate).samples
+    pause = np.random.default_rng(0).normal(0, 30, 5 * sample_rate).astype(np.int16)
+    unit = np.repeat(np.concatenate([speech, pause])[:, None], channels, axis=1)
+    frames = minutes * 60 * sample_rate
+    header = make_wav(unit[:1], sample_rate)[:-unit.itemsize * channels]
+    header = header[:-8] + b"data" + (frames * channels * 2).to_bytes(4, "little")
+    with open(path, "wb") as f:
+        f.write(header)
+        for start in range(0, frames, len(unit)):
+            f.write(unit[:min(len(unit), frames - start)].tobytes())
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(mode: str, path: str):
+    from app.audio import prepare_audio
+    from app.recognizers import SpeechRecognizer
+    from app.routers import speech
+    from app.uploads import map_upload
+
+    class CopyingRecognizer(SpeechRecognizer):
+        def recognize(self, audio_bytes, sample_rate_hertz=16000):
+            bytes(audio_bytes)  # The Google client copies the audio into its request
+            return ["..."]
+
+    baseline = peak_rss_mb()
+    with open(path, "rb") as f:
+        if mode == "memory":
+            audio = prepare_audio(f.read(), 16000)
+            asyncio.run(speech.recognize_speech(CopyingRecognizer(), audio))
+        else:
+            with map_upload(f) as upload:
+                audio = prepare_audio(upload.data, 16000)
+                asyncio.run(speech.recognize_speech(CopyingRecognizer(), audio))
+    print(peak_rss_mb() - baseline)
+
+
+def measure(mode: str, path: str) -> float:
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_upload_memory", "--child", mode, path],
+                            check=True, capture_output=True, text=True).stdout
+    return float(output.split()[-1])
+
+
+def main():
+    print(f"{'layout':>15} {'minutes':>7} {'upload (MB)':>11} | {'in memory (MB)':>14} | {'mmap (MB)':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for layout, (sample_rate, channels) in LAYOUTS.items():
+            for minutes in MINUTES:
+                path = os.path.join(directory, "call.wav")
+                write_call(path, minutes, sample_rate, channels)
+                size = os.path.getsize(path) / 2 ** 20
+                print(f"{layout:>15} {minutes:>7} {size:>11.0f} | "
+                      f"{measure('memory', path):>14.0f} | {measure('mmap', path):>9.0f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(*sys.argv[2:4])
+    else:
+        main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: whole-recording recognition vs VAD regions recognized concurrently.
+
+For `test.wav` and a synthetic long call (test.wav repeated with pauses of line
+noise in between), reports the audio seconds sent to the recognizer and the wall
+clock latency, with one `recognize` call for the whole recording and with VAD.
+
+The recognizer is simulated by default: a fixed round trip plus a processing time
+proportional to the audio sent, and calls over the 60 s synchronous limit are
+rejected as Google does. Pass `--live` to use Google Speech-to-Text (credentials
+required).
+
+Run from the repository root (the app settings must be available in the environment):
+    python -m benchmarks.bench_vad [--rtt 0.2] [--rtf 0.05] [--repeats 15] [--live]
+"""
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.audio import PcmAudio, prepare_audio
+from app.recognizers import GoogleSpeechRecognizer, SpeechRecognizer
+from app.routers import speech
+
+TEST_WAV = Path(__file__).resolve().parent.parent / "test.wav"
+SYNC_LIMIT_SECONDS = 60
+
+
+class SimulatedRecognizer(SpeechRecognizer):
+    def __init__(self, rtt: float, rtf: float):
+        self.rtt = rtt
+        self.rtf = rtf
+
+    def recognize(self, audio_bytes, sample_rate_hertz=16000):
+        seconds = len(audio_bytes) / 2 / sample_rate_hertz
+        if seconds > SYNC_LIMIT_SECONDS:
+            raise ValueError(f"{seconds:.0f}s of audio is over the synchronous recognize limit")
+        time.sleep(self.rtt + seconds * self.rtf)
+        return ["..."]
+
+
+class MeteredRecognizer(SpeechRecognizer):
+    """Counts the audio seconds passed to the wrapped recognizer."""
+
+    def __init__(self, recognizer: SpeechRecognizer):
+        self.recognizer = recognizer
+        self.seconds = 0.0
+        self.calls = 0
+
+    def recognize(self, audio_bytes, sample_rate_hertz=16000):
+        self.seconds += len(audio_bytes) / 2 / sample_rate_hertz
+        self.calls += 1
+        return self.recognizer.recognize(audio_bytes, sample_rate_hertz)
+
+
+def long_call(audio: PcmAudio, repeats: int, pause_seconds: float = 8.0) -> PcmAudio:
+    rng = np.random.default_rng(0)
+    pause = rng.normal(0, 30, int(pause_seconds * audio.sample_rate)).astype(np.int16)
+    samples = np.concatenate([part for _ in range(repeats) for part in (audio.samples, pause)])
+    return PcmAudio(memoryview(samples).cast("B"), audio.sample_rate)
+
+
+def measure(recognizer: SpeechRecognizer, audio: PcmAudio, vad: bool) -> str:
+    speech.settings.vad_enabled = vad
+    metered = MeteredRecognizer(recognizer)
+    start = time.perf_counter()
+    try:
+        asyncio.run(speech.recognize_speech(metered, audio))
+        latency = f"{time.perf_counter() - start:>11.2f}"
+    except Exception:
+        latency = f"{'rejected':>11}"
+    return f"{metered.calls:>5} {metered.seconds:>9.1f} {latency}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt", type=float, default=0.2, help="simulated round-trip time in seconds")
+    parser.add_argument("--rtf", type=float, default=0.05, help="simulated processing seconds per audio second")
+    parser.add_argument("--repeats", type=int, default=15, help="times test.wav is repeated in the long call")
+    parser.add_argument("--live", action="store_true", help="use Google Speech-to-Text")
+    args = parser.parse_args()
+
+    recognizer = GoogleSpeechRecognizer() if args.live else SimulatedRecognizer(args.rtt, args.rtf)
+    audio = prepare_audio(TEST_WAV.read_bytes(), speech.settings.audio_sample_rate)
+
+    print(f"fan-out: {speech.settings.recognition_fanout} regions per call\n")
+    print(f"{'recording':>19} {'length (s)':>10} | {'whole recording: calls, sent (s), latency (s)':>45} | "
+          f"{'VAD: calls, sent (s), latency (s)':>33}")
+    for name, recording in (("test.wav", audio), ("synthetic long call", long_call(audio, args.repeats))):
+        whole = measure(recognizer, recording, vad=False)
+        regions = measure(recognizer, recording, vad=True)
+        print(f"{name:>19} {recording.duration:>10.1f} | {whole:>45} | {regions:>33}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,17 @@ https://stackoverflow.com/questions/34466027/what-is-conftest-py-for-in-pytest
 
 Fixtures are a potential and common use of conftest.py. The fixtures that you will define will be shared among all tests in your test suite
 """
+import asyncio
 from fastapi.testclient import TestClient
 from app.main import app
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db, get_async_read_db, get_db, get_read_db
 from app.database import Base
+from app.routers import speech
 import pytest
 from alembic import command
 
@@ -21,6 +25,15 @@ SQLALCHEMY_DATABASE_URL = f"postgresql://{settings.database_username}:{settings.
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+"""
+The same database through asyncpg, for the endpoints using `get_async_db`.
+
+TestClient runs every request on a new event loop, so connections must not be pooled.
+"""
+async_engine = create_async_engine(SQLALCHEMY_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+                                   poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 """
 pytest Fixture Scope Levels
 Fixture scopes in Pytest control the lifetime of fixtures. They define how often a fixture gets created and destroyed.
@@ -43,13 +56,56 @@ def session():
         db.close()
 
 @pytest.fixture()
-def client(session):
+def async_sessions(session):
+    """Factory of `AsyncSession`s on the test database (tables are reset by `session`)."""
+    return TestingAsyncSessionLocal
+
+@pytest.fixture()
+def run_with_async_db(async_sessions):
+    """Run `fn(db)` to completion on a new event loop, with its own `AsyncSession`."""
+    def run(fn):
+        async def main():
+            async with async_sessions() as db:
+                return await fn(db)
+        return asyncio.run(main())
+    return run
+
+@pytest.fixture(params=["psycopg2", "asyncpg"])
+def on_engine(request, session, async_sessions):
+    """
+    Run `fn(db)`, sync ORM code, on a `Session` of either engine: psycopg2 as the sync
+    endpoints, Alembic and the CLIs use it, or asyncpg through `AsyncSession.run_sync`.
+    Tests seed and read back through it so every path is checked against both engines.
+    """
+    if request.param == "psycopg2":
+        def run(fn):
+            with TestingSessionLocal() as db:
+                return fn(db)
+    else:
+        def run(fn):
+            async def main():
+                async with async_sessions() as db:
+                    return await db.run_sync(fn)
+            return asyncio.run(main())
+    return run
+
+@pytest.fixture()
+def client(session, monkeypatch):
+    # Job workers (and the job recovery at startup) open their own sessions
+    monkeypatch.setattr(speech, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(speech, "UnpooledAsyncSessionLocal", TestingAsyncSessionLocal)
     def override_get_db():
         try:
             yield session # yield a database connection from the yield db on session class
         finally:
             session.close()
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     yield TestClient(app) # Create a TestClient by passing your FastAPI application (app) to it.
     
 @pytest.fixture
@@ -58,7 +114,7 @@ def test_user(client):
         "email": "adnan.zahry3@gmail.com",
         "password": "password123"
     }
-    res = client.post("/user/", json=user_data)
+    res = client.post("/users/", json=user_data)
     
     assert res.status_code == 201
     print(res.json())
@@ -0,0 +1,92 @@
+import struct
+
+import numpy as np
+import pytest
+from app.audio import AudioFormatError, WavStreamDecoder, parse_wav_header, prepare_audio
+
+
+def make_wav(samples: np.ndarray, sample_rate: int, encoding: int = 1) -> bytes:
+    """Build a WAV file from (frames, channels) samples, with a LIST chunk before the data."""
+    channels = samples.shape[1]
+    bits = samples.dtype.itemsize * 8
+    data = samples.astype(samples.dtype.newbyteorder("<")).tobytes()
+    fmt = struct.pack("<HHIIHH", encoding, channels, sample_rate,
+                      sample_rate * channels * bits // 8, channels * bits // 8, bits)
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+    body += b"LIST" + struct.pack("<I", 3) + b"abc\x00"  # Odd-sized chunk, padded
+    body += b"data" + struct.pack("<I", len(data)) + data
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def tone(frequency: float, sample_rate: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return np.sin(2 * np.pi * frequency * t) * 10000
+
+
+def dominant_frequency(pcm: np.ndarray, sample_rate: int) -> float:
+    spectrum = np.abs(np.fft.rfft(pcm))
+    return np.fft.rfftfreq(len(pcm), 1 / sample_rate)[spectrum.argmax()]
+
+
+def test_mono_16k_passes_through_without_copy():
+    samples = tone(440, 16000).astype(np.int16)[:, None]
+    wav = make_wav(samples, 16000)
+
+    audio = prepare_audio(wav, 16000)
+
+    assert audio.sample_rate == 16000
+    assert np.shares_memory(np.frombuffer(audio.data, np.int16), np.frombuffer(wav, np.uint8))
+    assert np.array_equal(np.frombuffer(audio.data, np.int16), samples[:, 0])
+
+
+@pytest.mark.parametrize("dtype, encoding, scale", [
+    (np.int16, 1, 1.0),
+    (np.int32, 1, 65536.0),
+    (np.float32, 3, 1 / 32768),
+])
+def test_stereo_44k_is_downmixed_and_resampled(dtype, encoding, scale):
+    left, right = tone(440, 44100), tone(440, 44100) * 0.5
+    samples = (np.stack([left, right], axis=1) * scale).astype(dtype)
+
+    audio = prepare_audio(make_wav(samples, 44100, encoding), 16000)
+    pcm = np.frombuffer(audio.data, np.int16)
+
+    assert audio.sample_rate == 16000
+    assert audio.duration == pytest.approx(1.0, abs=1e-3)
+    assert dominant_frequency(pcm, 16000) == pytest.approx(440, abs=2)
+    assert np.abs(pcm).max() == pytest.approx(7500, rel=0.01)  # Mean of both channels
+
+
+@pytest.mark.parametrize("sample_rate", [44100, 48000])
+def test_downsampling_filters_out_content_above_new_nyquist(sample_rate):
+    # 11 kHz would fold back to 5 kHz at 16 kHz without the anti-alias filter
+    speech, hiss = (prepare_audio(make_wav(tone(frequency, sample_rate).astype(np.int16)[:, None], sample_rate), 16000)
+                    for frequency in (1000, 11000))
+    rms = lambda audio: np.sqrt(np.mean(np.frombuffer(audio.data, np.int16)[1000:-1000].astype(np.float64) ** 2))
+
+    assert rms(speech) == pytest.approx(10000 / np.sqrt(2), rel=0.01)
+    assert rms(hiss) < rms(speech) / 1000  # More than 60 dB down
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"", "no data chunk"),
+    (b"ID3\x03" + bytes(100), "not a WAV file"),
+    (b"RIFF" + struct.pack("<I", 4) + b"WAVE", "no data chunk"),
+    (make_wav(np.zeros((10, 1), np.int16), 16000)[:-20].replace(b"fmt ", b"junk"), "data chunk before fmt"),
+    (make_wav(np.zeros((10, 1), np.int16), 4000), "sample rate"),
+    (make_wav(np.zeros((0, 1), np.int16), 16000), "no audio"),
+])
+def test_malformed_audio_is_rejected(data, message):
+    with pytest.raises(AudioFormatError, match=message):
+        prepare_audio(data, 16000)
+
+
+def test_stream_decoder_matches_whole_file():
+    samples = np.stack([tone(300, 22050), tone(500, 22050)], axis=1).astype(np.int16)
+    wav = make_wav(samples, 22050)
+
+    decoder = WavStreamDecoder()
+    pcm = b"".join(decoder.feed(wav[i:i + 1001]) for i in range(0, len(wav), 1001))
+
+    assert decoder.format == parse_wav_header(wav)
+    assert pcm == prepare_audio(wav, 22050).data.tobytes()
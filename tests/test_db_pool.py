@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.db_pool import PoolStats, engine_options, instrument
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+
+def test_pool_reports_checkouts_and_timeouts(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 1)
+    monkeypatch.setattr(settings, "db_max_overflow", 0)
+    monkeypatch.setattr(settings, "db_pool_timeout_seconds", 0.1)
+    stats = PoolStats("test")
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(stats))
+    instrument(engine, stats)
+    try:
+        with engine.connect():
+            assert stats.stats()["checked_out"] == 1
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        report = stats.stats()
+        assert (report["checked_out"], report["checkouts"], report["timeouts"]) == (0, 2, 1)
+        assert report["wait_ms_max"] >= 100
+    finally:
+        engine.dispose()
+
+
+def test_pgbouncer_mode_keeps_no_pool_or_statements(monkeypatch):
+    monkeypatch.setattr(settings, "db_pgbouncer", True)
+    stats = PoolStats("test")
+    options = engine_options(stats, is_async=True)
+    assert issubclass(options["poolclass"], NullPool)
+    engine = create_async_engine(SQLALCHEMY_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1), **options)
+
+    async def query_twice():
+        for _ in range(2):
+            async with engine.connect() as connection:
+                assert (await connection.execute(text("SELECT 1"))).scalar() == 1
+        await engine.dispose()
+
+    asyncio.run(query_twice())
+    assert stats.stats()["checkouts"] == 2
+
+
+def test_metrics_expose_pools(client):
+    pools = client.get("/metrics").json()["database_pools"]
+    assert set(pools) == {"sync", "async"}
+    assert pools["sync"]["pool_size"] == settings.db_pool_size
@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+
+from app import models, rollups, schemas, utils
+from app.routers import speech
+
+"""
+The user, auth and speech save paths run on asyncpg (`get_async_db`), the rest of the
+app on psycopg2. Each test runs once per engine (`on_engine`): the data the ported
+paths read is seeded through it, and what they write is read back through it, with the
+sync endpoints' own queries and the rollups CLI running on asyncpg as well.
+"""
+
+
+def test_users_and_auth_across_engines(client, on_engine):
+    def seed(db):
+        user = models.User(email="seeded@example.com", password=utils.hash("password123"))
+        db.add(user)
+        db.commit()
+        return user.id
+    seeded_id = on_engine(seed)
+
+    assert client.get(f"/users/{seeded_id}").json()["email"] == "seeded@example.com"
+    token = schemas.Token(**client.post("/login", data={"username": "seeded@example.com", "password": "password123"}).json())
+    res = client.get("/speech/logs", headers={"Authorization": f"Bearer {token.access_token}"})
+    assert res.status_code == 200  # get_current_user loaded the seeded user
+    assert client.post("/token/refresh", json={"refresh_token": token.refresh_token}).status_code == 200
+
+    created = client.post("/users/", json={"email": "created@example.com", "password": "password123"}).json()
+    bulk = client.post("/users/bulk", json=[{"email": "bulk@example.com", "password": "password123"}]).json()
+    stored = on_engine(lambda db: {user.id: (user.email, utils.verify("password123", user.password))
+                                   for user in db.query(models.User)})
+    assert stored == {seeded_id: ("seeded@example.com", True), created["id"]: ("created@example.com", True),
+                      bulk["results"][0]["id"]: ("bulk@example.com", True)}
+    assert on_engine(lambda db: db.query(models.RefreshToken).filter(models.RefreshToken.used_at.isnot(None)).count()) == 1
+
+
+def test_speech_save_path_across_engines(on_engine, run_with_async_db):
+    sentiment = schemas.SentimentAnalysis(sentiment="positive", score=0.5)
+    transcriptions = [schemas.SpeechTranscription(transcription=f"baris {i}", sentiment=sentiment, start=i, end=i + 1)
+                      for i in range(3)]
+    saved = run_with_async_db(lambda db: speech.save_transcription_to_db(
+        db, "SF1256", "call-engines", speech.calculate_overall_sentiment([sentiment]), transcriptions
+    ))
+
+    def read_back(db):
+        segments = db.query(models.CallSegment).order_by(models.CallSegment.segment_index).all()
+        daily = db.query(models.CallSentimentDaily).one()
+        logs = speech.query_call_logs(db, related_to_id="SF1256")  # The sync endpoints' query
+        return [(s.text, s.start_seconds) for s in segments], (daily.positive_count, daily.scored_count), [log.id for log in logs]
+
+    recorded = on_engine(read_back)
+    assert recorded == ([(f"baris {i}", i) for i in range(3)], (1, 1), [saved.id])
+
+    # The rollups CLI rebuilds the same bucket the save path recorded
+    today = date.today()
+    on_engine(lambda db: rollups.rebuild_daily_rollups(db, today - timedelta(days=1), today + timedelta(days=2)))
+    assert on_engine(read_back) == recorded
@@ -0,0 +1,100 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app import models, oauth2, schemas
+from app.auth_cache import AuthCache
+from app.config import settings
+
+
+@pytest.fixture
+def user(session):
+    oauth2.auth_cache.clear()  # The test database is recreated, so ids are reused between tests
+    new_user = models.User(email="agent@example.com", password="not-a-real-hash")
+    session.add(new_user)
+    session.commit()
+    yield new_user
+    oauth2.auth_cache.clear()
+
+
+@pytest.fixture
+def queries(async_sessions):
+    """Statements run through the async sessions."""
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    engine = async_sessions.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", listener)
+    yield statements
+    event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.fixture
+def current_user(run_with_async_db):
+    return lambda token: run_with_async_db(lambda db: oauth2.get_current_user(token=token, db=db))
+
+
+def test_cached_user_skips_database(user, queries, current_user):
+    token = oauth2.create_access_token({"user_id": user.id})
+
+    assert current_user(token) == schemas.CurrentUser(id=user.id, email=user.email, created_at=user.created_at)
+    statements = len(queries)
+    assert statements > 0
+
+    assert current_user(token).email == user.email
+    assert len(queries) == statements
+
+
+def test_updated_user_is_reloaded(user, session, current_user):
+    token = oauth2.create_access_token({"user_id": user.id})
+    current_user(token)
+
+    user.email = "renamed@example.com"
+    session.commit()
+    assert current_user(token).email == "renamed@example.com"
+
+
+def test_deleted_user_is_rejected(user, session, current_user):
+    token = oauth2.create_access_token({"user_id": user.id})
+    current_user(token)
+
+    session.delete(user)
+    session.commit()
+    with pytest.raises(HTTPException) as exc:
+        current_user(token)
+    assert exc.value.status_code == 401
+
+
+def test_claims_only_skips_database(user, queries, current_user, monkeypatch):
+    monkeypatch.setattr(settings, "auth_claims_only", True)
+    token = oauth2.create_access_token({"user_id": 4242})  # No such user, the claims are trusted
+
+    assert current_user(token) == schemas.CurrentUser(id=4242)
+    assert queries == []
+
+
+@pytest.mark.parametrize("claims", [{"user_id": 7}, {"user_id": "seven", "exp": 2 ** 40}, {"user_id": 7, "exp": "later"}])
+def test_token_without_integer_claims_is_rejected(client, claims):
+    token = oauth2.jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm)  # Validly signed
+
+    res = client.get("/speech/logs", headers={"Authorization": f"Bearer {token}"})
+    assert res.status_code == 401
+
+
+def test_cached_token_expires_with_its_claim():
+    now = [1000.0]
+    cache = AuthCache(token_size=10, user_size=10, user_ttl=60, timer=lambda: now[0])
+    cache.remember_token("token", 7, exp=1030)
+
+    now[0] = 1029
+    assert cache.token_user_id("token") == 7
+    now[0] = 1030
+    assert cache.token_user_id("token") is None
+
+
+def test_disabled_cache_keeps_nothing():
+    cache = AuthCache(token_size=0, user_size=0, user_ttl=60)
+    cache.remember_token("token", 7, exp=2 ** 40)
+    cache.remember_user(schemas.CurrentUser(id=7))
+
+    assert cache.token_user_id("token") is None
+    assert cache.user(7) is None
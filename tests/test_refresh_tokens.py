@@ -0,0 +1,63 @@
+from jose import jwt
+
+from app import models, schemas
+from app.config import settings
+
+
+def login(client, test_user) -> schemas.Token:
+    res = client.post("/login", data={"username": test_user['email'], "password": test_user['password']})
+    assert res.status_code == 200
+    return schemas.Token(**res.json())
+
+
+def refresh(client, refresh_token):
+    return client.post("/token/refresh", json={"refresh_token": refresh_token})
+
+
+def test_refresh_rotates_token(test_user, client, session):
+    tokens = login(client, test_user)
+    assert tokens.refresh_token
+
+    res = refresh(client, tokens.refresh_token)
+    assert res.status_code == 200
+    rotated = schemas.Token(**res.json())
+    payload = jwt.decode(rotated.access_token, settings.secret_key, algorithms=[settings.algorithm])
+    assert payload["user_id"] == test_user['id']
+    assert rotated.refresh_token != tokens.refresh_token
+
+    assert refresh(client, rotated.refresh_token).status_code == 200
+    # Only digests are stored, all three tokens belong to the login's family
+    rows = session.query(models.RefreshToken).all()
+    assert len(rows) == 3 and len({row.family_id for row in rows}) == 1
+    assert tokens.refresh_token not in {row.token_hash for row in rows}
+
+
+def test_reused_token_revokes_family(test_user, client):
+    tokens = login(client, test_user)
+    rotated = schemas.Token(**refresh(client, tokens.refresh_token).json())
+
+    res = refresh(client, tokens.refresh_token)
+    assert res.status_code == 401
+    # The token rotated before the reuse is revoked with the rest of its family
+    assert refresh(client, rotated.refresh_token).status_code == 401
+
+
+def test_reuse_leaves_other_logins_alone(test_user, client):
+    first = login(client, test_user)
+    second = login(client, test_user)
+    refresh(client, first.refresh_token)
+    refresh(client, first.refresh_token)
+
+    assert refresh(client, second.refresh_token).status_code == 200
+
+
+def test_revoked_token_is_rejected(test_user, client):
+    tokens = login(client, test_user)
+
+    assert client.post("/token/revoke", json={"refresh_token": tokens.refresh_token}).status_code == 204
+    assert refresh(client, tokens.refresh_token).status_code == 401
+
+
+def test_unknown_token_is_rejected(client):
+    assert refresh(client, "not-a-token").status_code == 401
+    assert client.post("/token/revoke", json={"refresh_token": "not-a-token"}).status_code == 204
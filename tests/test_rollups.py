@@ -0,0 +1,76 @@
+from datetime import date, datetime, timedelta, timezone
+
+from app import models, oauth2, rollups, schemas
+from app.main import app
+from app.routers import speech
+
+
+def log_calls(session, related_to_id, *calls):
+    """Insert logs directly, with explicit timestamps, bypassing the rollups."""
+    session.add_all([
+        models.CallSentimentLog(related_to_id=related_to_id, call_id=f"{related_to_id}-{n}", overall_sentiment=sentiment,
+                                average_score=score, created_at=created_at)
+        for n, (created_at, sentiment, score) in enumerate(calls)
+    ])
+    session.commit()
+
+
+def buckets(session):
+    return {(r.related_to_id, r.day): (r.positive_count, r.negative_count, r.neutral_count, r.score_sum, r.scored_count)
+            for r in session.query(models.CallSentimentDaily)}
+
+
+def test_logs_roll_up_in_the_same_transaction(session, run_with_async_db):
+    for n, score in enumerate((0.5, -0.25, 0.75)):
+        overall = schemas.OverallSentiment(overall_sentiment="positive" if score > 0 else "negative", average_score=score)
+        run_with_async_db(lambda db: speech.save_transcription_to_db(db, "SF1", f"call-{n}", overall))
+
+    today = datetime.now(timezone.utc).date()
+    assert buckets(session) == {("SF1", today): (2, 1, 0, 1.0, 3)}
+
+
+def test_backfill_rebuilds_from_logs(session):
+    day = datetime(2026, 9, 30, 22, tzinfo=timezone.utc)
+    log_calls(session, "SF1",
+              (day, "positive", 0.5), (day + timedelta(hours=1), "neutral", None),  # Logged before scores were stored
+              (day + timedelta(hours=3), "negative", -0.5), (day + timedelta(days=40), "positive", 0.25))
+    log_calls(session, "SF2", (day, "neutral", 0.0))
+    session.add(models.CallSentimentDaily(related_to_id="SF3", day=date(2026, 10, 2), positive_count=5))  # Stale
+    session.commit()
+
+    assert rollups.backfill(session, batch_days=7) == 41  # Sep 30 to Nov 9
+    expected = {
+        ("SF1", date(2026, 9, 30)): (1, 0, 1, 0.5, 1),
+        ("SF1", date(2026, 10, 1)): (0, 1, 0, -0.5, 1),
+        ("SF1", date(2026, 11, 9)): (1, 0, 0, 0.25, 1),
+        ("SF2", date(2026, 9, 30)): (0, 0, 1, 0.0, 1),
+    }
+    assert buckets(session) == expected
+    rollups.backfill(session, batch_days=30)  # Idempotent
+    assert buckets(session) == expected
+
+
+def test_trend_endpoint(client, session):
+    day = datetime(2026, 10, 5, 12, tzinfo=timezone.utc)
+    log_calls(session, "SF1", *[(day + timedelta(days=n // 2), ("positive", "negative")[n % 2], (0.5, -0.1)[n % 2])
+                                for n in range(20)])
+    rollups.backfill(session)
+    app.dependency_overrides[oauth2.get_current_user] = lambda: 1
+    try:
+        daily = client.get("/speech/trends", params={"related_to_id": "SF1", "start": "2026-10-06", "end": "2026-10-08"})
+        monthly = client.get("/speech/trends", params={"related_to_id": "SF1", "start": "2026-10-01", "end": "2026-11-01",
+                                                       "granularity": "month"})
+        weekly = client.get("/speech/trends", params={"related_to_id": "SF1", "start": "2026-10-07", "end": "2026-11-01",
+                                                      "granularity": "week"})  # From a Wednesday
+        invalid = client.get("/speech/trends", params={"related_to_id": "SF1", "start": "2026-10-08", "end": "2026-10-08"})
+    finally:
+        app.dependency_overrides.pop(oauth2.get_current_user)
+
+    assert [(b["start"], b["calls"], b["positive"], b["negative"]) for b in daily.json()["buckets"]] == [
+        ("2026-10-06", 2, 1, 1), ("2026-10-07", 2, 1, 1)]
+    assert daily.json()["buckets"][0]["average_score"] == 0.2
+    month, = monthly.json()["buckets"]
+    assert (month["start"], month["calls"], month["neutral"]) == ("2026-10-01", 20, 0)
+    # The first week only has Wednesday to Sunday, and says so
+    assert [(b["start"], b["calls"]) for b in weekly.json()["buckets"]] == [("2026-10-07", 10), ("2026-10-12", 6)]
+    assert invalid.status_code == 400
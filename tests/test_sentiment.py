@@ -0,0 +1,58 @@
+import asyncio
+import random
+
+import pytest
+from app.sentiment import BatchPolarityScorer, batch_polarity, polarity
+from app.sentiment_engines import IndonesianSentimentEngine
+from textblob.en import sentiment as textblob_lexicon
+
+TOLERANCE = 0.05  # Largest accepted difference from TextBlob on a single segment
+
+"""
+Typical English renderings of translated call-centre segments.
+"""
+SEGMENTS = [
+    "Hello good afternoon", "Thank you very much", "Is there anything I can help you with?",
+    "I am not happy with the service", "My order has not arrived yet", "Sorry for the inconvenience",
+    "The product is very good!", "This is really bad", "I want a refund, this is terrible",
+    "Okay sir, please wait a moment", "The delivery was fast and the packaging was nice",
+    "I am very disappointed", "Not bad at all", "It's not a good experience", "Great, thanks!",
+    "The agent was rude and unhelpful", "Everything is fine now", "I never got my money back",
+    "The app keeps crashing, it is so annoying", "Perfect, that solves my problem",
+    "I am extremely satisfied with the quick response", "We apologize, the system is down",
+    "This is the worst customer service ever", "Wonderful! Have a nice day", "I'm not sure",
+    "The price is too expensive", "It's broken again", "Very very good", "not very good", "",
+]
+
+def test_batch_scorer_matches_textblob():
+    scores = batch_polarity(SEGMENTS)
+
+    for text, score in zip(SEGMENTS, scores):
+        assert score == pytest.approx(polarity(text), abs=TOLERANCE), text
+
+def test_batch_scorer_parity_on_random_segments():
+    rng = random.Random(1)
+    lexicon_words = [word for word in textblob_lexicon if " " not in word]
+    filler = "the a is it was i you we to of and , . ! not never no very really so too this my order".split()
+    segments = [
+        " ".join(rng.choice(lexicon_words if rng.random() < 0.35 else filler) for _ in range(rng.randint(1, 14)))
+        for _ in range(500)
+    ]
+
+    scores = BatchPolarityScorer().score(segments)
+    within_tolerance = sum(abs(score - polarity(text)) <= TOLERANCE for text, score in zip(segments, scores))
+
+    assert within_tolerance / len(segments) >= 0.98
+
+def test_indonesian_engine_scores_offline():
+    sentiments = asyncio.run(IndonesianSentimentEngine().analyze([
+        "halo selamat sore",
+        "pelayanannya bagus banget",
+        "saya tidak puas dengan layanannya",
+        "sangat mengecewakan",
+        "nomor pesanan saya",
+    ]))
+
+    assert [s.sentiment for s in sentiments] == ["positive", "positive", "negative", "negative", "neutral"]
+    assert sentiments[1].score > 0.7  # "banget" boosts "bagus"
+    assert sentiments[2].score == pytest.approx(-0.35)  # "tidak" turns "puas" into -0.5 x 0.7
@@ -0,0 +1,547 @@
+import asyncio
+import io
+import json
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import grpc
+import httpx
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import event
+from app import main, models, oauth2, recognizers, schemas
+from app.audio import parse_wav_header, prepare_audio
+from app.main import app
+from app.recognizers import SpeechRecognizer, get_recognizer
+from app.sentiment_engines import ScoredSegment
+from app.uploads import map_upload
+from app.routers import speech
+from app.vad import detect_speech
+
+TEST_WAV = Path(__file__).resolve().parent.parent / "test.wav"
+CALL = {"related_to_id": "SF1256", "call_id": "1234asas"}
+
+"""
+Local fake backend: turns every `bytes_per_line` bytes of received audio into one
+transcript line, so the streaming path can be exercised without Google credentials.
+"""
+class FakeRecognizer(SpeechRecognizer):
+    lines = ["halo selamat sore", "terima kasih", "sampai jumpa"]
+
+    def __init__(self, bytes_per_line: int = 256 * 1024):
+        self.bytes_per_line = bytes_per_line
+        self.received = 0
+        self.calls = []
+
+    def recognize(self, audio_bytes, sample_rate_hertz=16000):
+        self.calls.append(len(audio_bytes))
+        self.received = len(audio_bytes)
+        return [self.lines[i % len(self.lines)] for i in range(-(-len(audio_bytes) // self.bytes_per_line))]
+
+    def streaming_recognize(self, chunks, sample_rate_hertz=16000):
+        buffered = 0
+        emitted = 0
+        for chunk in chunks:
+            self.received += len(chunk)
+            buffered += len(chunk)
+            while buffered >= self.bytes_per_line:
+                buffered -= self.bytes_per_line
+                yield self.lines[emitted % len(self.lines)]
+                emitted += 1
+        if buffered:
+            yield self.lines[emitted % len(self.lines)]
+
+class FakeChannel:
+    """Stands in for a gRPC channel: counts connections and is always ready."""
+    opened = 0
+
+    def __init__(self):
+        FakeChannel.opened += 1
+        self.closed = False
+
+    def subscribe(self, callback, try_to_connect=False):
+        callback(grpc.ChannelConnectivity.READY)
+
+    def unsubscribe(self, callback):
+        pass
+
+class FakeSpeechClient:
+    """Replaces `speech.SpeechClient` so no test ever talks to Google."""
+    def __init__(self):
+        self.channel = FakeChannel()
+        self.transport = SimpleNamespace(grpc_channel=self.channel, close=self.close)
+        self.requests = 0
+
+    def recognize(self, config, audio):
+        assert not self.channel.closed
+        self.requests += 1
+        return SimpleNamespace(results=[SimpleNamespace(alternatives=[SimpleNamespace(transcript="halo selamat sore")])])
+
+    def close(self):
+        self.channel.closed = True
+
+@pytest.fixture(autouse=True)
+def fake_speech_client(monkeypatch):
+    monkeypatch.setattr(recognizers.speech, "SpeechClient", FakeSpeechClient)
+    FakeChannel.opened = 0
+
+@pytest.fixture
+def fake_recognizer(client, async_sessions, monkeypatch):
+    recognizer = FakeRecognizer()
+    app.dependency_overrides[get_recognizer] = lambda: recognizer
+    app.dependency_overrides[oauth2.get_current_user] = lambda: 1
+    async def fake_score_segments(texts):
+        return [ScoredSegment(f"en: {text}", schemas.SentimentAnalysis(sentiment="positive", score=0.5)) for text in texts]
+    monkeypatch.setattr(speech, "score_segments", fake_score_segments)
+    yield recognizer
+    app.dependency_overrides.pop(get_recognizer)
+    app.dependency_overrides.pop(oauth2.get_current_user)
+
+def test_transcribe_stream(client, fake_recognizer):
+    with open(TEST_WAV, "rb") as f:
+        res = client.post("/speech/transcribe/stream", data=CALL, files={"file": ("test.wav", f, "audio/wav")})
+
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "application/x-ndjson"
+
+    events = [json.loads(line) for line in res.text.splitlines()]
+    assert fake_recognizer.received == parse_wav_header(TEST_WAV.read_bytes()).data_size  # Samples only, no header
+    assert [e["event"] for e in events] == ["transcription"] * 3 + ["overall_sentiment"]
+    assert schemas.SpeechTranscription(**events[0]["data"]).transcription == "halo selamat sore"
+    assert schemas.OverallSentiment(**events[-1]["data"]).overall_sentiment == "positive"
+
+def test_transcribe_job(client, fake_recognizer):
+    with client:  # Runs the lifespan, which starts the worker pool
+        with open(TEST_WAV, "rb") as f:
+            res = client.post("/speech/transcribe?mode=job", data=CALL, files={"file": ("test.wav", f, "audio/wav")})
+        assert res.status_code == 202
+        job = schemas.TranscriptionJobOut(**res.json())
+        assert job.status in (schemas.JobStatus.queued, schemas.JobStatus.running)
+
+        deadline = time.monotonic() + 10
+        while job.status not in (schemas.JobStatus.completed, schemas.JobStatus.failed) and time.monotonic() < deadline:
+            time.sleep(0.05)
+            job = schemas.TranscriptionJobOut(**client.get(f"/speech/jobs/{job.id}").json())
+
+    # Every speech region is recognized on its own, one fake line per started 256 KiB
+    audio = prepare_audio(TEST_WAV.read_bytes(), 16000)
+    regions = detect_speech(audio.samples, audio.sample_rate)
+    expected_lines = sum(-(-len(audio.slice(*region)) // fake_recognizer.bytes_per_line) for region in regions)
+
+    assert job.status == schemas.JobStatus.completed
+    assert job.result.filename == "test.wav"
+    assert len(job.result.transcriptions) == expected_lines
+
+def test_unfinished_jobs_recovered_at_startup(client, session, fake_recognizer, monkeypatch, tmp_path):
+    monkeypatch.setattr(speech.settings, "job_spool_dir", str(tmp_path))
+    monkeypatch.setattr(main, "GoogleSpeechRecognizer", lambda clients: fake_recognizer)
+    # Left behind by a previous run of the process, whose queue died with it
+    for n, status in enumerate(["queued", "running", "running"]):
+        session.add(models.TranscriptionJob(id=f"job-{n}", status=status, filename="test.wav",
+                                            related_to_id="SF1256", call_id=f"call-{n}"))
+        if n < 2:
+            (tmp_path / f"job-{n}.audio").write_bytes(TEST_WAV.read_bytes())
+    session.commit()
+
+    with client:
+        deadline = time.monotonic() + 10
+        jobs = []
+        while time.monotonic() < deadline:
+            jobs = [schemas.TranscriptionJobOut(**client.get(f"/speech/jobs/job-{n}").json()) for n in range(3)]
+            if all(job.status in (schemas.JobStatus.completed, schemas.JobStatus.failed) for job in jobs):
+                break
+            time.sleep(0.05)
+
+    assert [job.status for job in jobs] == [schemas.JobStatus.completed] * 2 + [schemas.JobStatus.failed]
+    assert jobs[2].error == speech.JOB_LOST_ERROR
+    assert session.query(models.CallSentimentLog).count() == 2
+
+class SlowRecognizer(FakeRecognizer):
+    """Blocks inside `recognize` until released, like a slow Google call."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def recognize(self, audio_bytes, sample_rate_hertz=16000):
+        self.started.set()
+        self.release.wait(10)
+        return super().recognize(audio_bytes, sample_rate_hertz)
+
+def test_health_check_during_slow_recognize(client, fake_recognizer):
+    recognizer = SlowRecognizer()
+    app.dependency_overrides[get_recognizer] = lambda: recognizer
+    responses = {}
+
+    def transcribe():
+        with open(TEST_WAV, "rb") as f:
+            responses["transcribe"] = client.post("/speech/transcribe", data=CALL, files={"file": ("test.wav", f, "audio/wav")})
+
+    with client:  # One event loop shared by both requests
+        thread = threading.Thread(target=transcribe)
+        thread.start()
+        try:
+            assert recognizer.started.wait(5)
+            res = client.get("/")
+            assert res.status_code == 200
+            assert not recognizer.release.is_set()  # Answered while recognize was still in flight
+        finally:
+            recognizer.release.set()
+            thread.join(10)
+
+    assert responses["transcribe"].status_code == 201
+
+def test_transcribe_rejects_malformed_audio(client, fake_recognizer):
+    for endpoint in ("/speech/transcribe", "/speech/transcribe?mode=job", "/speech/transcribe/stream"):
+        res = client.post(endpoint, data=CALL, files={"file": ("notes.txt", b"not a wav file" * 100, "text/plain")})
+        assert res.status_code == 400
+    assert fake_recognizer.received == 0  # Rejected before reaching the recognizer
+
+def test_transcribe_same_audio_twice(client, fake_recognizer):
+    responses = []
+    for _ in range(2):  # A retried upload hits the stored result, not the call_id constraint
+        with open(TEST_WAV, "rb") as f:
+            responses.append(client.post("/speech/transcribe", data=CALL, files={"file": ("test.wav", f, "audio/wav")}))
+
+    assert [res.status_code for res in responses] == [201, 201]
+    assert responses[0].json() == responses[1].json()
+    assert len(fake_recognizer.calls) == len(detect_speech(prepare_audio(TEST_WAV.read_bytes(), 16000).samples, 16000))
+
+def test_transcribe_stores_segments(client, session, fake_recognizer):
+    with open(TEST_WAV, "rb") as f:
+        res = client.post("/speech/transcribe", data=CALL, files={"file": ("test.wav", f, "audio/wav")})
+
+    assert res.status_code == 201
+    transcriptions = res.json()["transcriptions"]
+    log = session.query(models.CallSentimentLog).one()
+    segments = session.query(models.CallSegment).order_by(models.CallSegment.segment_index).all()
+    assert log.average_score == 0.5
+    assert [(s.call_id, s.text, s.translated_text, s.score, s.sentiment) for s in segments] == [
+        (log.call_id, t["transcription"], f"en: {t['transcription']}", 0.5, "positive") for t in transcriptions
+    ]
+    assert [(s.start_seconds, s.end_seconds) for s in segments] == [(t["start"], t["end"]) for t in transcriptions]
+    assert 0 <= segments[0].start_seconds < segments[-1].end_seconds <= 21
+
+def test_segments_copy_round_trips_text(session, run_with_async_db):
+    overall = schemas.OverallSentiment(overall_sentiment="neutral", average_score=0.0)
+    lines = ['kata "halo", lalu\nbaris baru', "", "\\N", "tanpa terjemahan"]
+    transcriptions = [
+        schemas.SpeechTranscription(transcription=text, sentiment=schemas.SentimentAnalysis(sentiment="neutral", score=0.0),
+                                    translated_text=text or None)
+        for text in lines
+    ]
+    run_with_async_db(lambda db: speech.save_transcription_to_db(db, "SF1256", "call-copy", overall, transcriptions))
+
+    stored = session.query(models.CallSegment).order_by(models.CallSegment.segment_index).all()
+    assert [(s.text, s.translated_text, s.start_seconds) for s in stored] == [(t, t or None, None) for t in lines]
+
+def test_same_call_logged_once(client, session, fake_recognizer):
+    audio = TEST_WAV.read_bytes()
+    # e.g. the CRM re-sends a call with a re-encoded recording, then retries both
+    responses = [client.post("/speech/transcribe", data=CALL, files={"file": ("test.wav", audio + bytes(n), "audio/wav")})
+                 for n in (0, 1, 1, 0)]
+    stream = client.post("/speech/transcribe/stream", data=CALL, files={"file": ("test.wav", audio, "audio/wav")})
+
+    # Only the first recording is logged, never a response describing the other one
+    assert [res.status_code for res in responses] == [201, 409, 409, 201]
+    assert responses[3].json() == responses[0].json()
+    assert responses[1].json()["detail"] == f"call_id {CALL['call_id']} is already logged"
+    assert json.loads(stream.text.splitlines()[-1]) == {"event": "error", "detail": responses[1].json()["detail"]}
+    log, = session.query(models.CallSentimentLog)
+    assert (log.related_to_id, log.call_id) == (CALL["related_to_id"], CALL["call_id"])
+    assert session.query(models.CallSegment).count() == len(responses[0].json()["transcriptions"])
+    assert session.query(models.TranscriptionResult).count() == 1  # Nothing kept for the rejected audio
+
+    # Audio stored for another call is no way around the check either
+    other = {**CALL, "call_id": "other-call"}
+    statuses = [client.post("/speech/transcribe", data=other, files={"file": ("test.wav", audio + bytes(n), "audio/wav")})
+                .status_code for n in (1, 0)]
+    assert statuses == [201, 409]
+
+def test_save_same_call_concurrently(session, run_with_async_db):
+    # Every thread has its own loop and connection, as concurrent requests do
+    results, errors = [], []
+    start = threading.Barrier(8)
+
+    def save(n):
+        sentiment = schemas.SentimentAnalysis(sentiment="positive", score=0.5)
+        transcriptions = [schemas.SpeechTranscription(transcription=f"baris {n}", sentiment=sentiment)] * (n + 1)
+
+        async def save_ten_times(db):
+            await db.connection()
+            start.wait()
+            for _ in range(10):
+                results.append(await speech.save_transcription_to_db(
+                    db, "SF1256", "call-hammered", speech.calculate_overall_sentiment([sentiment]), transcriptions
+                ))
+        try:
+            run_with_async_db(save_ten_times)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    assert errors == []
+    assert len(results) == 80
+    assert sum(saved.inserted for saved in results) == 1
+    assert len({saved.id for saved in results}) == 1
+    log, = session.query(models.CallSentimentLog)
+    segments = session.query(models.CallSegment).all()
+    assert len({s.text for s in segments}) == 1  # All from the one insert that won
+    assert len(segments) == int(segments[0].text.split()[1]) + 1
+    daily, = session.query(models.CallSentimentDaily)
+    assert daily.positive_count == 1
+
+def test_concurrent_identical_uploads_run_once(client, fake_recognizer):
+    recognizer = SlowRecognizer()
+    app.dependency_overrides[get_recognizer] = lambda: recognizer
+    coalesced = speech.transcriptions_in_flight.coalesced
+    responses = []
+
+    def transcribe():
+        with open(TEST_WAV, "rb") as f:
+            responses.append(client.post("/speech/transcribe", data=CALL, files={"file": ("test.wav", f, "audio/wav")}))
+
+    with client:
+        threads = [threading.Thread(target=transcribe) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        try:
+            assert recognizer.started.wait(5)
+            deadline = time.monotonic() + 5
+            while speech.transcriptions_in_flight.coalesced < coalesced + 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            recognizer.release.set()
+            for thread in threads:
+                thread.join(10)
+
+    assert [res.status_code for res in responses] == [201] * 3
+    assert speech.transcriptions_in_flight.coalesced == coalesced + 2
+    assert len(recognizer.calls) == len(detect_speech(prepare_audio(TEST_WAV.read_bytes(), 16000).samples, 16000))
+
+def test_same_audio_under_other_calls_runs_once(client, session, fake_recognizer):
+    recognizer = SlowRecognizer()
+    app.dependency_overrides[get_recognizer] = lambda: recognizer
+    coalesced = speech.transcriptions_in_flight.coalesced
+    responses = []
+
+    def transcribe(n):
+        with open(TEST_WAV, "rb") as f:
+            responses.append(client.post("/speech/transcribe", data={**CALL, "call_id": f"call-{n}"},
+                                         files={"file": ("test.wav", f, "audio/wav")}))
+
+    with client:
+        threads = [threading.Thread(target=transcribe, args=(n,)) for n in range(3)]
+        for thread in threads:
+            thread.start()
+        try:
+            assert recognizer.started.wait(5)
+            deadline = time.monotonic() + 5
+            while speech.transcriptions_in_flight.coalesced < coalesced + 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            recognizer.release.set()
+            for thread in threads:
+                thread.join(10)
+
+    assert [res.status_code for res in responses] == [201] * 3
+    assert len(recognizer.calls) == len(detect_speech(prepare_audio(TEST_WAV.read_bytes(), 16000).samples, 16000))
+    assert sorted(log.call_id for log in session.query(models.CallSentimentLog)) == ["call-0", "call-1", "call-2"]
+
+def test_logged_call_with_other_audio_is_not_transcribed(client, fake_recognizer):
+    def transcribe(audio):
+        return client.post("/speech/transcribe", data=CALL, files={"file": ("test.wav", audio, "audio/wav")})
+
+    audio = TEST_WAV.read_bytes()
+    assert transcribe(audio).status_code == 201
+    calls = len(fake_recognizer.calls)
+
+    assert transcribe(audio + b"\0\0").status_code == 409
+    assert len(fake_recognizer.calls) == calls
+
+def test_coalesced_upload_survives_first_client_going_away(session, fake_recognizer, monkeypatch):
+    recognizer = SlowRecognizer()
+    app.dependency_overrides[get_recognizer] = lambda: recognizer
+    mapped = []
+    monkeypatch.setattr(speech, "map_upload", lambda *args: mapped.append(map_upload(*args)) or mapped[-1])
+    coalesced = speech.transcriptions_in_flight.coalesced
+    audio = TEST_WAV.read_bytes()
+
+    async def main():
+        async with httpx.AsyncClient(app=app, base_url="http://test", timeout=None) as client:
+            post = lambda: client.post("/speech/transcribe", data=CALL, files={"file": ("test.wav", audio, "audio/wav")})
+            first = asyncio.create_task(post())
+            assert await asyncio.to_thread(recognizer.started.wait, 5)
+            second = asyncio.create_task(post())
+            while speech.transcriptions_in_flight.coalesced == coalesced:
+                await asyncio.sleep(0.01)
+
+            first.cancel()  # Its upload is closed and its call not logged, the run goes on
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            assert mapped[0].data.closed  # Nothing but the request itself held its mapping
+            recognizer.release.set()
+            return await second
+
+    res = asyncio.run(main())
+    assert res.status_code == 201
+    assert session.query(models.CallSentimentLog).one().call_id == CALL["call_id"]
+    assert session.query(models.CallSegment).count() == len(res.json()["transcriptions"]) > 0
+
+def test_speech_clients_reused_across_requests(client, session, fake_recognizer, monkeypatch):
+    app.dependency_overrides.pop(get_recognizer)  # Use the real Google recognizer, on fake clients
+    monkeypatch.setattr(speech.settings, "speech_client_pool_size", 1)
+    audio = TEST_WAV.read_bytes()
+
+    with client:
+        clients = app.state.speech_clients
+        assert FakeChannel.opened == 1  # Connected at startup, before any request
+        for n in range(5):
+            # Distinct audio each time (trailing bytes after the data chunk are ignored)
+            res = client.post("/speech/transcribe", data={**CALL, "call_id": f"call-{n}"},
+                              files={"file": ("test.wav", audio + bytes(n), "audio/wav")})
+            assert res.status_code == 201
+            assert res.json()["transcriptions"][0]["transcription"] == "halo selamat sore"
+        client_in_use = clients.acquire()
+        assert client.get("/metrics").json()["speech_clients"]["created"] == 1
+
+    app.dependency_overrides[get_recognizer] = lambda: fake_recognizer
+    assert FakeChannel.opened == 1
+    regions = detect_speech(prepare_audio(audio, 16000).samples, 16000)
+    assert client_in_use.requests == 5 * len(regions)  # Every speech region of every request went through it
+    assert client_in_use.channel.closed  # Closed by the lifespan on shutdown
+
+def batch_request(files, calls):
+    return {"files": files, "data": {"metadata": json.dumps(calls)}}
+
+def test_transcribe_batch(client, session, async_sessions, fake_recognizer):
+    audio = TEST_WAV.read_bytes()
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("calls/d.wav", audio + bytes(2))
+        z.writestr("calls/unknown.wav", audio + bytes(3))
+    files = [
+        ("files", ("a.wav", audio, "audio/wav")),
+        ("files", ("b.wav", audio + bytes(1), "audio/wav")),
+        ("files", ("c.wav", audio, "audio/wav")),  # Same recording as a.wav, another call
+        ("files", ("notes.txt", b"not a wav file" * 100, "text/plain")),
+        ("files", ("calls.zip", archive.getvalue(), "application/zip")),
+    ]
+    calls = {name: {"related_to_id": "SF1256", "call_id": f"call-{name}"}
+             for name in ("a.wav", "b.wav", "c.wav", "notes.txt", "calls/d.wav")}
+
+    log_inserts = []
+    def count_inserts(conn, cursor, statement, *args):
+        if statement.startswith("INSERT INTO call_sentiment_logs"):
+            log_inserts.append(statement)
+    engine = async_sessions.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", count_inserts)
+    try:
+        res = client.post("/speech/transcribe/batch", **batch_request(files, calls))
+    finally:
+        event.remove(engine, "before_cursor_execute", count_inserts)
+
+    assert res.status_code == 200
+    body = schemas.BatchTranscriptionResponse(**res.json())
+    assert [r.filename for r in body.results] == ["a.wav", "b.wav", "c.wav", "notes.txt", "calls/d.wav", "calls/unknown.wav"]
+    assert [r.status for r in body.results] == ["completed"] * 3 + ["failed", "completed", "failed"]
+    assert (body.completed, body.failed) == (4, 2)
+    assert "WAV" in body.results[3].error
+    assert body.results[5].error == "No metadata for this file"
+
+    assert len(log_inserts) == 1  # Every call logged in one statement
+    logged = {log.call_id for log in session.query(models.CallSentimentLog)}
+    assert logged == {"call-a.wav", "call-b.wav", "call-c.wav", "call-calls/d.wav"}
+    assert session.query(models.CallSegment).count() == sum(len(r.result.transcriptions) for r in body.results if r.result)
+    daily, = session.query(models.CallSentimentDaily)
+    assert (daily.related_to_id, daily.positive_count, daily.scored_count) == ("SF1256", 4, 4)
+    regions = detect_speech(prepare_audio(audio, 16000).samples, 16000)
+    assert len(fake_recognizer.calls) == 3 * len(regions)  # a.wav and c.wav transcribed once
+
+class OldSpooledTemporaryFile(tempfile.SpooledTemporaryFile):
+    """`SpooledTemporaryFile` as Python 3.9 has it, without `seekable()`."""
+    def __getattribute__(self, name):
+        if name == "seekable":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+def test_batch_zip_on_spool_without_seekable():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.wav", b"RIFF")
+    spool = OldSpooledTemporaryFile(max_size=1 << 20)
+    spool.write(archive.getvalue())
+    spool.seek(0)
+
+    items = speech.collect_batch_items([UploadFile(spool, filename="calls.zip")])
+    assert [(item.filename, item.file.read()) for item in items] == [("a.wav", b"RIFF")]
+    items[0].file.close()
+
+def test_transcribe_batch_retry(client, session, fake_recognizer):
+    audio = TEST_WAV.read_bytes()
+    calls = {"a.wav": {"related_to_id": "SF1256", "call_id": "call-a"}}
+    first = client.post("/speech/transcribe/batch", **batch_request([("files", ("a.wav", audio, "audio/wav"))], calls))
+    transcribed = len(fake_recognizer.calls)
+
+    # The CRM retries the batch, with a new recording that reuses a logged call_id
+    calls["b.wav"] = {"related_to_id": "SF1256", "call_id": "call-a"}
+    calls["c.wav"] = {"related_to_id": "SF1256", "call_id": "call-c"}
+    files = [("files", ("a.wav", audio, "audio/wav")), ("files", ("c.wav", audio + bytes(1), "audio/wav"))]
+    retry = client.post("/speech/transcribe/batch", **batch_request(files, calls))
+    duplicate = client.post("/speech/transcribe/batch",
+                            **batch_request([("files", ("b.wav", audio + bytes(2), "audio/wav"))], calls))
+
+    assert [r["status"] for r in first.json()["results"]] == ["completed"]
+    assert [r["status"] for r in retry.json()["results"]] == ["completed", "completed"]
+    assert retry.json()["results"][0]["result"] == first.json()["results"][0]["result"]
+    assert duplicate.json()["results"][0]["error"] == "call_id call-a is already logged"
+    assert session.query(models.CallSentimentLog).count() == 2
+    assert len(fake_recognizer.calls) == 2 * transcribed  # a.wav once, then c.wav; b.wav is refused first
+
+def test_transcribe_batch_rejects_invalid_metadata(client, fake_recognizer):
+    res = client.post("/speech/transcribe/batch",
+                      files=[("files", ("a.wav", TEST_WAV.read_bytes(), "audio/wav"))], data={"metadata": "{\"a.wav\": 1}"})
+    assert res.status_code == 422
+    assert fake_recognizer.calls == []
+
+def test_list_call_logs_keyset_pages(client, session, fake_recognizer):
+    start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    session.add_all([
+        models.CallSentimentLog(related_to_id=f"SF{n % 2}", call_id=f"call-{n}", overall_sentiment=("positive", "negative", "neutral")[n % 3],
+                                created_at=start + timedelta(hours=n // 3))  # Three calls per timestamp
+        for n in range(30)
+    ])
+    session.commit()
+    expected = sorted(session.query(models.CallSentimentLog).filter_by(related_to_id="SF0"),
+                      key=lambda log: (log.created_at, log.id), reverse=True)
+
+    pages, cursor = [], None
+    while True:
+        res = client.get("/speech/logs", params={"related_to_id": "SF0", "limit": 4, **({"cursor": cursor} if cursor else {})})
+        assert res.status_code == 200
+        page = schemas.CallSentimentLogPage(**res.json())
+        pages.append([log.call_id for log in page.items])
+        if (cursor := page.next_cursor) is None:
+            break
+
+    assert [len(page) for page in pages] == [4, 4, 4, 3]
+    assert [call_id for page in pages for call_id in page] == [log.call_id for log in expected]
+
+    res = client.get("/speech/logs", params={"sentiment": "negative", "created_after": (start + timedelta(hours=3)).isoformat(),
+                                             "created_before": (start + timedelta(hours=6)).isoformat()})
+    assert [log["call_id"] for log in res.json()["items"]] == ["call-16", "call-13", "call-10"]
+    assert res.json()["next_cursor"] is None
+
+    assert client.get("/speech/logs", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/speech/logs", params={"sentiment": "angry"}).status_code == 422
@@ -0,0 +1,100 @@
+import asyncio
+
+from app.translation import TranslationCache, translate_segments
+
+
+class FakeTranslation:
+    def __init__(self, text):
+        self.text = text
+
+"""
+Upper-cases its input, one round trip per call; any line containing "rusak"
+makes the whole request fail, like a rejected payload.
+"""
+class FakeTranslator:
+    def __init__(self):
+        self.requests = []
+
+    def translate(self, text, src, dest):
+        self.requests.append(text)
+        if "rusak" in text:
+            raise ValueError("translation failed")
+        return FakeTranslation(text.upper())
+
+def test_translate_segments_batches_and_deduplicates():
+    translator = FakeTranslator()
+    segments = ["halo selamat sore", "terima kasih", "halo selamat sore", "terima kasih"]
+
+    translations = asyncio.run(translate_segments(translator, segments))
+
+    assert translations == ["HALO SELAMAT SORE", "TERIMA KASIH", "HALO SELAMAT SORE", "TERIMA KASIH"]
+    assert translator.requests == ["halo selamat sore\nterima kasih"]
+
+def test_translate_segments_falls_back_per_segment():
+    translator = FakeTranslator()
+
+    translations = asyncio.run(translate_segments(translator, ["halo", "mesin rusak", "terima kasih"]))
+
+    assert translations == ["HALO", None, "TERIMA KASIH"]
+    assert len(translator.requests) == 4  # One failed batch, then one request per segment
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+def test_translation_cache_skips_repeated_phrases():
+    translator = FakeTranslator()
+    cache = TranslationCache(maxsize=100, ttl=60)
+
+    asyncio.run(translate_segments(translator, ["Halo  selamat sore", "terima kasih"], cache=cache))
+    translations = asyncio.run(translate_segments(translator, ["halo selamat sore", "sampai jumpa"], cache=cache))
+
+    assert translations == ["HALO SELAMAT SORE", "SAMPAI JUMPA"]
+    assert translator.requests == ["Halo selamat sore\nterima kasih", "sampai jumpa"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+def test_translation_cache_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = TranslationCache(maxsize=2, ttl=60, timer=clock)
+
+    cache.put_many("id", "en", {"satu": "one", "dua": "two"})
+    cache.get_many("id", "en", ["satu"])  # "dua" is now the least recently used
+    cache.put_many("id", "en", {"tiga": "three"})
+    assert cache.get_many("id", "en", ["satu", "dua", "tiga"]) == {"satu": "one", "tiga": "three"}
+    assert cache.stats()["evictions"] == 1
+
+    clock.now += 61
+    assert cache.get_many("id", "en", ["satu", "tiga"]) == {}
+
+def test_translation_cache_persists_to_disk(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "translations.sqlite3")
+
+    cache = TranslationCache(maxsize=10, ttl=60, path=path, timer=clock)
+    cache.put_many("id", "en", {"terima kasih": "thank you"})
+    cache.close()
+
+    restarted = TranslationCache(maxsize=10, ttl=60, path=path, timer=clock)
+    assert restarted.get_many("id", "en", ["Terima Kasih"]) == {"Terima Kasih": "thank you"}
+    assert restarted.stats()["disk_hits"] == 1
+
+    clock.now += 61
+    expired = TranslationCache(maxsize=10, ttl=60, path=path, timer=clock)
+    assert expired.get_many("id", "en", ["terima kasih"]) == {}
+
+def test_translation_cache_promotes_disk_hits_for_their_remaining_ttl(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "translations.sqlite3")
+    TranslationCache(maxsize=10, ttl=60, path=path, timer=clock).put_many("id", "en", {"terima kasih": "thank you"})
+
+    clock.now += 50
+    restarted = TranslationCache(maxsize=10, ttl=60, path=path, timer=clock)
+    assert restarted.get_many("id", "en", ["terima kasih"]) == {"terima kasih": "thank you"}
+
+    clock.now += 11  # 61s after the translation, not after the promotion
+    assert restarted.get_many("id", "en", ["terima kasih"]) == {}
+    assert restarted.stats()["expirations"] == 1
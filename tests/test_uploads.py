@@ -0,0 +1,80 @@
+import hashlib
+import mmap
+import tempfile
+
+import numpy as np
+from fastapi.testclient import TestClient
+from app import oauth2
+from app.audio import prepare_audio
+from app.main import app
+from app.recognizers import get_recognizer
+from app.uploads import MaxUploadSizeMiddleware, map_upload
+from tests.test_audio import make_wav, tone
+from tests.test_speech import TEST_WAV, FakeRecognizer
+
+
+def test_map_upload_rolls_spooled_file_to_disk():
+    data = TEST_WAV.read_bytes()
+    with tempfile.SpooledTemporaryFile(max_size=len(data) * 2) as spooled:
+        spooled.write(data)
+
+        with map_upload(spooled) as upload:
+            assert spooled._rolled
+            assert isinstance(upload.data, mmap.mmap)
+            assert upload.size == len(data)
+            assert upload.sha256 == hashlib.sha256(data).hexdigest()
+            assert upload.data[:] == data
+
+
+def test_prepare_audio_from_mapped_file_matches_in_memory():
+    samples = np.stack([tone(440, 44100, 60), tone(660, 44100, 60)], axis=1).astype(np.int16)
+    wav = make_wav(samples, 44100)
+
+    with tempfile.TemporaryFile() as f:
+        f.write(wav)
+        with map_upload(f) as upload:
+            mapped = prepare_audio(upload.data, 16000)
+            assert mapped.source is not None  # Converted into a mapped temporary file
+            converted = mapped.data.tobytes()  # Released pages are read back from the files
+
+    assert converted == prepare_audio(wav, 16000).data.tobytes()
+
+
+def upload_app(max_bytes: int):
+    recognizer = FakeRecognizer()
+    app.dependency_overrides[get_recognizer] = lambda: recognizer
+    app.dependency_overrides[oauth2.get_current_user] = lambda: 1
+    return recognizer, TestClient(MaxUploadSizeMiddleware(app, max_bytes=max_bytes, prefix="/speech"))
+
+
+def test_upload_over_limit_rejected_from_content_length(client):
+    recognizer, limited = upload_app(max_bytes=64 * 1024)
+    try:
+        with open(TEST_WAV, "rb") as f:
+            res = limited.post("/speech/transcribe", files={"file": ("test.wav", f, "audio/wav")})
+    finally:
+        app.dependency_overrides.pop(get_recognizer)
+        app.dependency_overrides.pop(oauth2.get_current_user)
+
+    assert res.status_code == 413
+    assert recognizer.calls == []
+
+
+def test_upload_over_limit_rejected_while_streaming(client):
+    recognizer, limited = upload_app(max_bytes=64 * 1024)
+    body = (b"--boundary\r\nContent-Disposition: form-data; name=\"file\"; filename=\"test.wav\"\r\n"
+            b"Content-Type: audio/wav\r\n\r\n" + TEST_WAV.read_bytes() + b"\r\n--boundary--\r\n")
+
+    def chunks():  # No Content-Length: the body is sent with chunked transfer encoding
+        for start in range(0, len(body), 16 * 1024):
+            yield body[start:start + 16 * 1024]
+
+    try:
+        res = limited.post("/speech/transcribe", content=chunks(),
+                           headers={"Content-Type": "multipart/form-data; boundary=boundary"})
+    finally:
+        app.dependency_overrides.pop(get_recognizer)
+        app.dependency_overrides.pop(oauth2.get_current_user)
+
+    assert res.status_code == 413
+    assert recognizer.calls == []
@@ -1,6 +1,7 @@
+import json
 import pytest
 from jose import jwt
-from app import schemas
+from app import models, schemas, utils
 from app.config import settings
 
 def test_create_user(client):
@@ -19,4 +20,65 @@ def test_login_user(test_user, client):
     id = payload.get("user_id")
     assert id == test_user['id']
     assert login_res.token_type == "bearer"
-    assert res.status_code == 200
\ No newline at end of file
+    assert res.status_code == 200
+
+def test_login_rehashes_outdated_password(client, session):
+    cheap_hash = utils.pwd_context.hash("password123", rounds=4)
+    session.add(models.User(email="old-hash@gmail.com", password=cheap_hash))
+    session.commit()
+
+    res = client.post("/login", data={"username": "old-hash@gmail.com", "password": "password123"})
+    assert res.status_code == 200
+
+    user = session.query(models.User).filter(models.User.email == "old-hash@gmail.com").one()
+    assert user.password != cheap_hash
+    assert not utils.pwd_context.needs_update(user.password)
+    assert utils.verify("password123", user.password)
+
+def test_login_wrong_password(client, session):
+    session.add(models.User(email="wrong@gmail.com", password=utils.hash("password123")))
+    session.commit()
+
+    res = client.post("/login", data={"username": "wrong@gmail.com", "password": "nope"})
+    assert res.status_code == 403
+
+def test_bulk_create_reports_conflicts(client, session):
+    session.add(models.User(email="taken@gmail.com", password=utils.hash("password123")))
+    session.commit()
+    records = [{"email": email, "password": "password123"}
+               for email in ("agent1@gmail.com", "taken@gmail.com", "agent2@gmail.com", "agent1@gmail.com")]
+
+    res = client.post("/users/bulk", json=records)
+    assert res.status_code == 200
+    body = schemas.BulkUserResponse(**res.json())
+    assert (body.created, body.conflicts) == (2, 2)
+    assert [r.status for r in body.results] == ["created", "conflict", "created", "conflict"]
+
+    created = session.query(models.User).filter(models.User.id == body.results[0].id).one()
+    assert created.email == "agent1@gmail.com"
+    assert utils.verify("password123", created.password)
+
+def test_bulk_create_ndjson(client, session):
+    body = b'{"email": "line1@gmail.com", "password": "a"}\n\n{"email": "line2@gmail.com", "password": "b"}'
+    res = client.post("/users/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert res.status_code == 200
+    assert [r["email"] for r in res.json()["results"]] == ["line1@gmail.com", "line2@gmail.com"]
+
+def test_bulk_create_rejects_invalid_record(client, session):
+    body = b'{"email": "line1@gmail.com", "password": "a"}\n{"email": "not-an-email", "password": "b"}\n'
+    res = client.post("/users/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert res.status_code == 422
+    assert res.json()["detail"][0]["loc"] == ["line", 2, "email"]
+    assert session.query(models.User).count() == 0
+
+def test_bulk_create_stops_at_the_cap(client, session, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_users_max", 2)
+    # The record past the cap is invalid, only counting it must not reach its validation
+    records = [{"email": f"agent{n}@gmail.com", "password": "a"} for n in range(2)] + [{"email": "not-an-email"}]
+
+    res = client.post("/users/bulk", json=records)
+    assert res.status_code == 413
+    body = b"\n".join(json.dumps(record).encode() for record in records)
+    res = client.post("/users/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert res.status_code == 413
+    assert session.query(models.User).count() == 0
@@ -0,0 +1,81 @@
+import asyncio
+import random
+import time
+
+import numpy as np
+from app.audio import PcmAudio
+from app.recognizers import SpeechRecognizer
+from app.routers import speech
+from app.vad import detect_speech
+
+RATE = 16000
+
+
+def synthetic_call(layout, seed=0):
+    """Concatenate (seconds, is_speech) parts: modulated tones over a faint noise floor."""
+    rng = np.random.default_rng(seed)
+    parts = []
+    for seconds, is_speech in layout:
+        t = np.arange(int(seconds * RATE)) / RATE
+        part = rng.normal(0, 30, len(t))
+        if is_speech:
+            part += np.sin(2 * np.pi * 220 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t)) * 8000
+        parts.append(part)
+    return np.concatenate(parts).astype(np.int16)
+
+
+def seconds(regions):
+    return [(round(r.start / RATE, 1), round(r.end / RATE, 1)) for r in regions]
+
+
+def test_detect_speech_drops_silence_and_keeps_short_pauses():
+    samples = synthetic_call([(2, False), (3, True), (0.3, False), (1, True), (4, False), (2, True), (1, False)])
+
+    # The 0.3 s pause stays inside the first region, every region is padded by 0.2 s
+    assert seconds(detect_speech(samples, RATE)) == [(1.8, 6.5), (10.1, 12.5)]
+
+
+def test_detect_speech_caps_region_length():
+    samples = synthetic_call([(1, False), (130, True), (1, False)])
+
+    regions = detect_speech(samples, RATE, max_region_seconds=50)
+
+    assert len(regions) >= 3
+    assert all(r.seconds(RATE) <= 50 for r in regions)
+    assert all(a.end == b.start for a, b in zip(regions, regions[1:]))  # Split without losing audio
+
+
+def test_detect_speech_on_silence():
+    assert detect_speech(synthetic_call([(5, False)]), RATE) == []
+    assert detect_speech(np.zeros(10, np.int16), RATE) == []
+
+
+class RegionRecognizer(SpeechRecognizer):
+    """Answers with the region's position in the call, after a random delay."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.sent = 0
+
+    def recognize(self, audio_bytes, sample_rate_hertz=16000):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.sent += len(audio_bytes)
+        time.sleep(random.uniform(0.01, 0.05))
+        self.active -= 1
+        return [f"{len(audio_bytes) // 2 / sample_rate_hertz:.1f}s"]
+
+
+def test_regions_recognized_concurrently_in_time_order(monkeypatch):
+    monkeypatch.setattr(speech.settings, "recognition_fanout", 3)
+    layout = [(1, False)] + [(length, part) for n in range(1, 9) for length, part in ((n * 0.5, True), (1, False))]
+    samples = synthetic_call(layout)
+    recognizer = RegionRecognizer()
+
+    lines = asyncio.run(speech.recognize_speech(recognizer, PcmAudio(memoryview(samples).cast("B"), RATE)))
+
+    assert [line.text for line in lines] == [f"{n * 0.5 + 0.4:.1f}s" for n in range(1, 9)]  # Speech plus padding, in call order
+    assert all(a.end < b.start for a, b in zip(lines, lines[1:]))  # Offsets of each line's region
+    assert 1 < recognizer.max_active <= 3
+    assert recognizer.sent < samples.nbytes